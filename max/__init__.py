@@ -1,41 +1,91 @@
-"""Import max modules."""
+"""Import max modules.
+
+The classes of max are resolved lazily through the module's `__getattr__`, so \
+`import max` stays cheap for short-lived scripts: a submodule is only imported the \
+first time one of its names is used.
+"""
 # pylint: disable=unused-import, unused-argument, invalid-name, global-statement/
 # pylint: disable=redefined-outer-name
-from typing import Optional, Self
+import warnings
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from rich.align import AlignMethod
-from rich.cells import cell_len, set_cell_size
-from rich.console import JustifyMethod, OverflowMethod
-from rich.text import Text
+if TYPE_CHECKING:  # pragma: no cover
+    from rich.align import AlignMethod
+    from rich.cells import cell_len, set_cell_size
+    from rich.console import JustifyMethod, OverflowMethod
+    from rich.text import Text
 
-from max.console import MaxConsole
-from max.gradient import Gradient
-from max.named_color import NamedColor
+    from max._engine import style_cache_info
+    from max._render_cache import Cacheable
+    from max.color_index import ColorIndex
+    from max.console import MaxConsole
+    from max.gradient import Gradient
+    from max.named_color import NamedColor
+    from max.palette import Palette
+    from max.progress import MaxProgress
+    from max.rule import GradientRule
 
 DEFAULT_JUSTIFY: "JustifyMethod" = "default"
 DEFAULT_OVERFLOW: "OverflowMethod" = "fold"
 
+LAZY_ATTRIBUTES: Dict[str, str] = {
+    "Cacheable": "max._render_cache",
+    "ColorIndex": "max.color_index",
+    "Gradient": "max.gradient",
+    "GradientRule": "max.rule",
+    "MaxConsole": "max.console",
+    "MaxProgress": "max.progress",
+    "NamedColor": "max.named_color",
+    "Palette": "max.palette",
+    "style_cache_info": "max._engine",
+    "AlignMethod": "rich.align",
+    "cell_len": "rich.cells",
+    "set_cell_size": "rich.cells",
+    "JustifyMethod": "rich.console",
+    "OverflowMethod": "rich.console",
+    "Text": "rich.text",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the module that defines `name` the first time it is used."""
+    try:
+        module_name = LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = globals()[name] = getattr(import_module(module_name), name)
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *LAZY_ATTRIBUTES])
+
 
 def __call__(self, *args, **kwargs):
+    from max import MaxConsole  # pylint: disable=import-outside-toplevel
+
     return MaxConsole(*args, **kwargs)
 
 
-def gradient(  # pylint: disable=too-many-arguments
+def make_gradient(  # pylint: disable=too-many-arguments
     self,
-    text: str | Text,
-    start: Optional[NamedColor | str | int] = None,
-    end: Optional[NamedColor | str | int] = None,
-    justify: JustifyMethod = DEFAULT_JUSTIFY,
+    text: "str | Text",
+    start: Optional["NamedColor | str | int"] = None,
+    end: Optional["NamedColor | str | int"] = None,
+    justify: "JustifyMethod" = DEFAULT_JUSTIFY,
     invert: bool = False,
     length: int = 3,
-    console: MaxConsole = MaxConsole(),
-    overflow: OverflowMethod = DEFAULT_OVERFLOW,
+    console: Optional["MaxConsole"] = None,
+    overflow: "OverflowMethod" = DEFAULT_OVERFLOW,
     title: str = "Gradient",
     bold: bool = False,
     rainbow: bool = False,
     verbose: bool = False,
-) -> Text:
-    """Create gradient text.
+    palette: Optional["Palette | List[Any]"] = None,
+) -> "Text":
+    """Create gradient text. It is not named `gradient`, which importing the \
+        `max.gradient` submodule binds to the module.
 
     Args:
         text (str|Text): The text to apply the gradient to.
@@ -47,19 +97,26 @@ def gradient(  # pylint: disable=too-many-arguments
             Defaults to DEFAULT_JUSTIFY.
         invert (bool, optional): Invert the gradient. Defaults to False.
         length (int, optional): The length of the gradient. Defaults to 3.
-        console (MaxConsole, optional): The console to use. Defaults to \
-            MaxConsole().
+        console (Optional[MaxConsole], optional): The console to use. Defaults \
+            to the global console of `get_console`.
         overflow (OverflowMethod, optional): The overflow method. Defaults \
             to DEFAULT_OVERFLOW.
         title (str, optional): The title of the gradient. Defaults to \
             "Gradient".
-        verbose (bool, optional): Print verbose output. Defaults to False."""
+        verbose (bool, optional): Print verbose output. Defaults to False.
+        palette (Optional[Palette | List[Any]], optional): The palette, or the \
+            colors of the palette, of the gradient. Defaults to the NamedColors."""
+    # pylint: disable=import-outside-toplevel
+    from max import Gradient, Text
+    from max.palette import get_palette
+
+    palette = get_palette(palette)
     if isinstance(text, Text):
         text = str(text)
     if isinstance(start, int):
-        start = NamedColor.colors[start]
+        start = range(len(palette))[start]
     if isinstance(end, int):
-        end = NamedColor.colors[end]
+        end = range(len(palette))[end]
 
     return Gradient(
         text=text,
@@ -68,25 +125,40 @@ def gradient(  # pylint: disable=too-many-arguments
         justify=justify,
         invert=invert,
         length=length,
-        console=console,
+        console=console or get_console(),
         overflow=overflow,
         title=title,
         bold=bold,
         rainbow=rainbow,
         verbose=verbose,
+        palette=palette,
     )
 
 
+def gradient(*args: Any, **kwargs: Any) -> "Text":
+    """Create gradient text. Deprecated alias of `make_gradient`.
+
+    Importing the `max.gradient` submodule binds the module to this name, and the \
+        module is callable as this alias as well."""
+    warnings.warn(
+        "max.gradient() is deprecated, use max.make_gradient() instead.",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    return make_gradient(*args, **kwargs)
+
+
 def gradient_rule(
     self,
-    start: Optional[NamedColor | str | int] = None,
-    end: Optional[NamedColor | str | int] = None,
+    start: Optional["NamedColor | str | int"] = None,
+    end: Optional["NamedColor | str | int"] = None,
     invert: bool = False,
     length: int = 3,
-    console: MaxConsole = MaxConsole(),
+    console: Optional["MaxConsole"] = None,
     title: str = "Gradient",
     verbose: bool = False,
-) -> Text:
+    palette: Optional["Palette | List[Any]"] = None,
+) -> "Text":
     """Create gradient rule.
 
     Args:
@@ -96,12 +168,14 @@ def gradient_rule(
             gradient. Defaults to None.
         invert (bool, optional): Invert the gradient. Defaults to False.
         length (int, optional): The length of the gradient. Defaults to 3.
-        console (MaxConsole, optional): The console to use. Defaults to \
-            MaxConsole().
+        console (Optional[MaxConsole], optional): The console to use. Defaults \
+            to the global console of `get_console`.
         title (str, optional): The title of the gradient. Defaults to \
             "Gradient".
-        verbose (bool, optional): Print verbose output. Defaults to False."""
-    return self.gradient(
+        verbose (bool, optional): Print verbose output. Defaults to False.
+        palette (Optional[Palette | List[Any]], optional): The palette, or the \
+            colors of the palette, of the gradient. Defaults to the NamedColors."""
+    return self.make_gradient(
         text="",
         start=start,
         end=end,
@@ -112,17 +186,24 @@ def gradient_rule(
         overflow="fold",
         title=title,
         verbose=verbose,
+        palette=palette,
     )
 
 
-def get_console() -> MaxConsole:
-    """Get a global :class:`~max.MaxConsole` instance. This function is used when Max requires/
-        a console and hasn't been explicitly given one.
+def get_console(**kwargs: Any) -> "MaxConsole":
+    """Get a shared :class:`~max.MaxConsole` instance from the console registry. \
+        This function is used when Max requires a console and hasn't been \
+        explicitly given one.
+
+    Args:
+        **kwargs: The file, stderr, width, color_system and record of the console, \
+            as taken by `max.console.get_console`.
 
     Returns:
         MaxConsole: a MaxConsole instance.
     """
-    global _console  # pylint: disable=global-variable-undefined
-    if _console is None:
-        _console = MaxConsole()
-    return _console
+    from max.console import (  # pylint: disable=import-outside-toplevel
+        get_console as registered_console,
+    )
+
+    return registered_console(**kwargs)
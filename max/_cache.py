@@ -0,0 +1,171 @@
+"""A bounded least-recently-used cache shared by max's render caches."""
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, NamedTuple, Optional, TypeVar
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of an LRUCache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+    maxbytes: Optional[int] = None
+    currbytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of lookups that were hits, from 0 to 1."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache(Generic[KeyType, ValueType]):
+    """A thread-safe mapping that evicts its least recently used entries once it \
+        holds more than `maxsize` of them, or more than `maxbytes` of them as \
+        measured by `sizeof`.
+
+    Args:
+        maxsize (int, optional): The maximum number of entries. Defaults to 128.
+        maxbytes (Optional[int], optional): The maximum total size of the entries, \
+            or None for no byte budget. Defaults to None.
+        sizeof (Optional[Callable[[ValueType], int]], optional): Estimates the size \
+            of a value in bytes. Required with `maxbytes`. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        maxbytes: Optional[int] = None,
+        sizeof: Optional[Callable[[ValueType], int]] = None,
+    ) -> None:
+        if maxbytes is not None and sizeof is None:
+            raise ValueError("A byte budget requires a sizeof function.")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.currbytes = 0
+        self.sizeof = sizeof
+        self._entries: OrderedDict = OrderedDict()
+        self._sizes: Dict[KeyType, int] = {}
+        self._lock = threading.Lock()
+        self.resize(maxsize, maxbytes)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: KeyType) -> bool:
+        return key in self._entries
+
+    def get(
+        self, key: KeyType, default: Optional[ValueType] = None
+    ) -> Optional[ValueType]:
+        """Return the value of `key`, or `default` if it is not cached."""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: KeyType, value: ValueType) -> None:
+        """Cache `value` under `key`, evicting the oldest entries if needed. Values \
+            larger than the whole byte budget are not cached."""
+        size = 0 if self.sizeof is None else self.sizeof(value)
+        if self.maxbytes is not None and size > self.maxbytes:
+            return
+        with self._lock:
+            self.currbytes += size - self._sizes.get(key, 0)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def resize(self, maxsize: int, maxbytes: Optional[int] = None) -> None:
+        """Change the bounds of the cache, evicting entries to fit within them."""
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, not {maxsize}")
+        if maxbytes is not None and self.sizeof is None:
+            raise ValueError("A byte budget requires a sizeof function.")
+        with self._lock:
+            self.maxsize = maxsize
+            self.maxbytes = maxbytes
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop the least recently used entries until the cache is within bounds."""
+        while len(self._entries) > self.maxsize or (
+            self.maxbytes is not None and self.currbytes > self.maxbytes
+        ):
+            key, _ = self._entries.popitem(last=False)
+            self.currbytes -= self._sizes.pop(key)
+            self.evictions += 1
+
+    def get_or_create(
+        self, key: KeyType, factory: Callable[[], ValueType]
+    ) -> ValueType:
+        """Return the value of `key`, calling `factory` to create it on a miss."""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                pass
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+        value = factory()
+        self.set(key, value)
+        return value
+
+    def discard_where(self, predicate: Callable[[KeyType], bool]) -> int:
+        """Remove the entries whose key matches `predicate`, without counting them \
+            as evictions, and return how many were removed."""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+                self.currbytes -= self._sizes.pop(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Remove every entry and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.hits = self.misses = self.evictions = self.currbytes = 0
+
+    def info(self) -> CacheInfo:
+        """Return the hit, miss and eviction counts of the cache."""
+        return CacheInfo(
+            self.hits,
+            self.misses,
+            self.evictions,
+            self.maxsize,
+            len(self._entries),
+            self.maxbytes,
+            self.currbytes,
+        )
+
+
+CACHES: Dict[str, LRUCache] = {}
+
+
+def register_cache(name: str, cache: LRUCache) -> LRUCache:
+    """Register `cache` under `name` so `MaxConsole.cache_stats` reports it."""
+    CACHES[name] = cache
+    return cache
+
+
+def cache_stats() -> Dict[str, CacheInfo]:
+    """Return the statistics of every registered cache by name."""
+    return {name: cache.info() for name, cache in CACHES.items()}
@@ -0,0 +1,455 @@
+"""Quantize colors the way a terminal with a given color system displays them, \
+and map arbitrary colors onto the nearest color of a palette."""
+import os
+import threading
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from rich.color import STANDARD_PALETTE, Color, ColorSystem
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+RGB = Tuple[int, int, int]
+Palette = Tuple[RGB, ...]
+RGBSequence = Any
+SYSTEMS: Dict[str, ColorSystem] = {
+    "standard": ColorSystem.STANDARD,
+    "256": ColorSystem.EIGHT_BIT,
+    "windows": ColorSystem.WINDOWS,
+}
+DOWNSAMPLED: Tuple[str, ...] = ("256", "standard")
+DOWNSAMPLE_CACHE: Optional[Path] = (
+    Path(os.environ["MAX_COLOR_CACHE"]) if os.environ.get("MAX_COLOR_CACHE") else None
+)
+NEAREST_BITS: int = 5
+_nearest_tables: Dict[Palette, bytes] = {}
+_nearest_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4096)
+def downgrade(rgb: RGB, system: ColorSystem) -> int:
+    """Return the number of the terminal color `rgb` is displayed as on `system`."""
+    return Color.from_rgb(*rgb).downgrade(system).number
+
+
+def quantize(rgb: RGB, color_system: Optional[str]) -> Hashable:
+    """Return a key that is equal for two colors only when a terminal using \
+        `color_system` displays them identically.
+
+    Args:
+        rgb (Tuple[int, int, int]): The color to quantize.
+        color_system (Optional[str]): The color system of the console, as reported \
+            by `Console.color_system`. None for a console that prints no color.
+
+    Returns:
+        Hashable: The quantized color.
+    """
+    if color_system is None:
+        return None
+    system = SYSTEMS.get(color_system)
+    if system is None:
+        return rgb
+    return downgrade(rgb, system)
+
+
+def build_downsample_page(red: int, color_system: str) -> bytes:
+    """Compute the terminal color of every color with a given red channel.
+
+    The arithmetic of rich's `Color.downgrade` is repeated on arrays, operation \
+        for operation, so every entry equals what rich computes for that color.
+
+    Args:
+        red (int): The red channel shared by the colors of the page.
+        color_system (str): "256" or "standard".
+
+    Returns:
+        bytes: The color number of each (green, blue) pair, green major.
+    """
+    if np is None:
+        system = SYSTEMS[color_system]
+        return bytes(
+            downgrade((red, green, blue), system)
+            for green in range(256)
+            for blue in range(256)
+        )
+    green = np.repeat(np.arange(256, dtype=np.int64), 256)
+    blue = np.tile(np.arange(256, dtype=np.int64), 256)
+    reds = np.full(65536, red, dtype=np.int64)
+    if color_system == "standard":
+        distances = []
+        for red2, green2, blue2 in STANDARD_PALETTE._colors:  # pylint: disable=W0212
+            red_mean = (reds + red2) // 2
+            red_diff, green_diff, blue_diff = reds - red2, green - green2, blue - blue2
+            distances.append(
+                (((512 + red_mean) * red_diff * red_diff) >> 8)
+                + 4 * green_diff * green_diff
+                + (((767 - red_mean) * blue_diff * blue_diff) >> 8)
+            )
+        return np.argmin(np.stack(distances), axis=0).astype(np.uint8).tobytes()
+
+    normalized = [channel / 255.0 for channel in (reds, green, blue)]
+    maxc = np.maximum(np.maximum(normalized[0], normalized[1]), normalized[2])
+    minc = np.minimum(np.minimum(normalized[0], normalized[1]), normalized[2])
+    sumc = maxc + minc
+    rangec = maxc - minc
+    lightness = sumc / 2.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        saturation = np.where(
+            lightness <= 0.5, rangec / sumc, rangec / (2.0 - maxc - minc)
+        )
+    saturation[minc == maxc] = 0.0
+    gray = np.rint(lightness * 25.0)
+    grays = np.where(gray == 0, 16, np.where(gray == 25, 231, 231 + gray))
+    six = [
+        np.rint(np.where(channel < 95, channel / 95, 1 + (channel - 95) / 40))
+        for channel in (reds, green, blue)
+    ]
+    cube = 16 + 36 * six[0] + 6 * six[1] + six[2]
+    return np.where(saturation < 0.15, grays, cube).astype(np.uint8).tobytes()
+
+
+class DownsampleTable:
+    """The terminal color of each of the 2 ** 24 truecolor colors on a color system.
+
+    The table is built lazily a page of 65,536 colors at a time, so converting a \
+        gradient only computes the pages of the red channels it uses. When a cache \
+        directory is configured, the whole table is built once and persisted there, \
+        and later processes load it instead. Without numpy, each built page is kept \
+        as its own bytes, so memory only holds the pages that were built.
+
+    Args:
+        color_system (str): "256" or "standard".
+    """
+
+    def __init__(self, color_system: str) -> None:
+        self.color_system = color_system
+        # Zeroed numpy memory is only committed as pages are built.
+        self.table = np.zeros(1 << 24, np.uint8) if np is not None else None
+        self.pages: List[bytes] = [b""] * 256
+        self.built = bytearray(256)
+        self.lock = threading.Lock()
+
+    def page(self, red: int) -> None:
+        """Build the page of colors with the red channel `red`, if it is not built."""
+        if not self.built[red]:
+            with self.lock:
+                if not self.built[red]:
+                    page = build_downsample_page(red, self.color_system)
+                    if self.table is None:
+                        self.pages[red] = page
+                    else:
+                        start = red << 16
+                        self.table[start : start + 65536] = np.frombuffer(
+                            page, dtype=np.uint8
+                        )
+                    self.built[red] = 1
+
+    def build(self) -> "DownsampleTable":
+        """Build every page of the table."""
+        for red in range(256):
+            self.page(red)
+        return self
+
+    def path(self, directory: Path) -> Path:
+        """The file the table is persisted to in `directory`."""
+        from importlib.metadata import version  # pylint: disable=C0415
+
+        return directory / f"downsample-{self.color_system}-rich-{version('rich')}.bin"
+
+    def save(self, directory: Path) -> Path:
+        """Build the whole table and write it to `directory`."""
+        path = self.path(directory)
+        self.build()
+        directory.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        if self.table is None:
+            temporary.write_bytes(b"".join(self.pages))
+        else:
+            temporary.write_bytes(memoryview(self.table))
+        os.replace(temporary, path)
+        return path
+
+    def load(self, directory: Path) -> bool:
+        """Read the table from `directory`, returning whether it was there."""
+        try:
+            data = self.path(directory).read_bytes()
+        except OSError:
+            return False
+        if len(data) != 1 << 24:
+            return False
+        with self.lock:
+            if self.table is None:
+                self.pages = [data[red << 16 : (red + 1) << 16] for red in range(256)]
+            else:
+                self.table[:] = np.frombuffer(data, np.uint8)
+            self.built[:] = b"\x01" * 256
+        return True
+
+    def __getitem__(self, rgb: RGB) -> int:
+        red, green, blue = rgb
+        if self.table is None:
+            if not self.built[red]:
+                return downgrade(rgb, SYSTEMS[self.color_system])
+            return self.pages[red][green << 8 | blue]
+        if not self.built[red]:
+            self.page(red)
+        return int(self.table[red << 16 | green << 8 | blue])
+
+    def lookup(self, keys: Any, reds: Iterable[int]) -> Any:
+        """Return the entries of a numpy array of packed colors, building the \
+            pages of `reds` first."""
+        for red in reds:
+            self.page(red)
+        return self.table[keys]
+
+
+_downsample_tables: Dict[str, DownsampleTable] = {}
+_downsample_lock = threading.Lock()
+
+
+def downsample_table(color_system: str) -> DownsampleTable:
+    """Return the process-wide table of `color_system`, loading it from \
+        `DOWNSAMPLE_CACHE` or persisting it there when a cache is configured."""
+    table = _downsample_tables.get(color_system)
+    if table is None:
+        with _downsample_lock:
+            table = _downsample_tables.get(color_system)
+            if table is None:
+                if color_system not in DOWNSAMPLED:
+                    raise ValueError(f"Cannot downsample to {color_system!r}.")
+                table = DownsampleTable(color_system)
+                if DOWNSAMPLE_CACHE is not None and not table.load(DOWNSAMPLE_CACHE):
+                    try:
+                        table.save(DOWNSAMPLE_CACHE)
+                    except OSError:
+                        pass
+                _downsample_tables[color_system] = table
+    return table
+
+
+def configure_downsampling(cache: Optional[str | Path]) -> None:
+    """Set the directory the downsample tables are persisted to, or None to \
+        build them in memory only, and drop the tables built so far."""
+    global DOWNSAMPLE_CACHE  # pylint: disable=global-statement
+    with _downsample_lock:
+        DOWNSAMPLE_CACHE = None if cache is None else Path(cache)
+        _downsample_tables.clear()
+
+
+def downsample(rgb: RGB, color_system: str) -> int:
+    """Return the number of the terminal color `rgb` is displayed as on \
+        `color_system`, "256" or "standard", from its downsample table."""
+    return downsample_table(color_system)[rgb]
+
+
+def downsample_channels(channels: Any, color_system: str) -> List[int]:
+    """Return the terminal color of each color of three channels, or -1 for \
+        colors whose channels have left the 0-255 range.
+
+    Args:
+        channels (Any): The red, green and blue channels, as numpy arrays or \
+            sequences of ints.
+        color_system (str): "256" or "standard".
+
+    Returns:
+        List[int]: The color number of each color.
+    """
+    table = downsample_table(color_system)
+    if np is not None and isinstance(channels[0], np.ndarray):
+        red, green, blue = channels
+        valid = (red >= 0) & (red <= 255) & (green >= 0) & (green <= 255)
+        valid &= (blue >= 0) & (blue <= 255)
+        keys = np.where(valid, red << 16 | green << 8 | blue, 0)
+        numbers = table.lookup(keys, np.unique(red[valid]).tolist())
+        return np.where(valid, numbers.astype(np.int16), -1).tolist()
+    return [
+        table[rgb] if all(0 <= channel <= 255 for channel in rgb) else -1
+        for rgb in zip(*channels)
+    ]
+
+
+def build_nearest_table(palette: Palette) -> bytes:
+    """Find the nearest color of `palette` to the center of every cell of an RGB \
+        cube quantized to `NEAREST_BITS` bits per channel.
+
+    Distances use the "redmean" approximation of perceived color difference.
+
+    Args:
+        palette (Tuple[Tuple[int, int, int], ...]): The colors to choose from, at \
+            most 256 of them.
+
+    Returns:
+        bytes: The palette index of each cell, indexed by `cell`.
+    """
+    shift = 8 - NEAREST_BITS
+    centers = [(step << shift) + (1 << shift >> 1) for step in range(1 << NEAREST_BITS)]
+    if np is not None:
+        axis = np.array(centers, dtype=np.float64)
+        red, green, blue = (
+            channel.reshape(-1, 1)
+            for channel in np.meshgrid(axis, axis, axis, indexing="ij")
+        )
+        colors = np.array(palette, dtype=np.float64)
+        mean = (red + colors[:, 0]) / 2
+        distances = (
+            (2 + mean / 256) * (red - colors[:, 0]) ** 2
+            + 4 * (green - colors[:, 1]) ** 2
+            + (2 + (255 - mean) / 256) * (blue - colors[:, 2]) ** 2
+        )
+        return distances.argmin(axis=1).astype(np.uint8).tobytes()
+
+    def distance(rgb: RGB, color: RGB) -> float:
+        mean = (rgb[0] + color[0]) / 2
+        return (
+            (2 + mean / 256) * (rgb[0] - color[0]) ** 2
+            + 4 * (rgb[1] - color[1]) ** 2
+            + (2 + (255 - mean) / 256) * (rgb[2] - color[2]) ** 2
+        )
+
+    indexes = range(len(palette))
+    return bytes(
+        min(indexes, key=lambda index: distance((red, green, blue), palette[index]))
+        for red in centers
+        for green in centers
+        for blue in centers
+    )
+
+
+def nearest_table(palette: Palette) -> bytes:
+    """Return the nearest-color table of `palette`, built once per process."""
+    table = _nearest_tables.get(palette)
+    if table is None:
+        with _nearest_lock:
+            table = _nearest_tables.get(palette)
+            if table is None:
+                table = _nearest_tables[palette] = build_nearest_table(palette)
+    return table
+
+
+def cell(rgb: RGB) -> int:
+    """Return the index of the cell of the quantized RGB cube containing `rgb`."""
+    shift = 8 - NEAREST_BITS
+    red, green, blue = rgb
+    return (
+        (red >> shift) << (2 * NEAREST_BITS)
+        | (green >> shift) << NEAREST_BITS
+        | blue >> shift
+    )
+
+
+def nearest(rgb: RGB, palette: Palette) -> int:
+    """Return the index of the color of `palette` nearest to the center of the \
+        cell of `rgb`, which is the nearest to `rgb` itself unless `rgb` is close to \
+        midway between two colors."""
+    return nearest_table(palette)[cell(rgb)]
+
+
+def nearest_many(colors: Any, palette: Palette) -> Sequence[int]:
+    """Return the index of the nearest color of `palette` to each of `colors`.
+
+    Args:
+        colors (Any): An iterable of RGB tuples, or a numpy array of shape \
+            (n, 3), which is mapped without a Python loop.
+        palette (Tuple[Tuple[int, int, int], ...]): The colors to choose from.
+
+    Returns:
+        Sequence[int]: The palette index of each color.
+    """
+    table = nearest_table(palette)
+    if np is not None and isinstance(colors, np.ndarray):
+        shift = 8 - NEAREST_BITS
+        channels = colors.astype(np.intp, copy=False) >> shift
+        cells = (
+            channels[:, 0] << (2 * NEAREST_BITS)
+            | channels[:, 1] << NEAREST_BITS
+            | channels[:, 2]
+        )
+        return np.frombuffer(table, dtype=np.uint8)[cells]
+    return [table[cell(rgb)] for rgb in colors]
+
+
+def pack_rgb(colors: RGBSequence) -> bytes:
+    """Pack colors into three bytes per color.
+
+    Args:
+        colors (RGBSequence): An iterable of RGB tuples, packed `bytes`, \
+            `bytearray` or `array('B')`, or a numpy array of shape (n, 3).
+
+    Returns:
+        bytes: The red, green and blue byte of each color in turn.
+    """
+    if isinstance(colors, (bytes, bytearray)):
+        packed = bytes(colors)
+    elif isinstance(colors, (array, memoryview)):
+        # Other item types are converted value by value, so one out of range
+        # raises rather than being read as the bytes of the machine buffer.
+        typecode = colors.typecode if isinstance(colors, array) else colors.format
+        if typecode == "B":
+            packed = bytes(colors)
+        else:
+            packed = bytes(list(colors))
+    elif np is not None and isinstance(colors, np.ndarray):
+        if colors.size and ((colors < 0) | (colors > 255)).any():
+            raise ValueError("Color channels must be in range(0, 256).")
+        packed = colors.astype(np.uint8, copy=False).tobytes()
+    else:
+        packed = bytes(channel for rgb in colors for channel in rgb)
+    if len(packed) % 3:
+        raise ValueError("Packed colors must have three bytes per color.")
+    return packed
+
+
+def unpack_rgb(packed: bytes) -> List[RGB]:
+    """Unpack three bytes per color into RGB tuples."""
+    channels = iter(packed)
+    return list(zip(channels, channels, channels))
+
+
+def hex_to_rgb_many(hex_colors: Iterable[str]) -> List[RGB]:
+    """Convert hex codes, with or without a leading `#`, into RGB tuples."""
+    digits = [hex_color.replace("#", "") for hex_color in hex_colors]
+    if any(len(hex_color) != 6 for hex_color in digits):
+        raise ValueError("Hex colors must have six digits.")
+    return unpack_rgb(bytes.fromhex("".join(digits)))
+
+
+def rgb_to_hex_many(colors: RGBSequence) -> List[str]:
+    """Convert colors into six uppercase hex digits each, without a `#`."""
+    digits = pack_rgb(colors).hex().upper()
+    return [digits[index : index + 6] for index in range(0, len(digits), 6)]
+
+
+def downgrade_many(colors: RGBSequence, color_system: str) -> bytes:
+    """Return the number of the terminal color each of `colors` is displayed as.
+
+    Colors are looked up in the downsample table of the color system, which \
+        matches `downgrade` exactly. Without numpy, each distinct color is \
+        converted once with `downgrade` instead.
+
+    Args:
+        colors (RGBSequence): The colors, in any form accepted by `pack_rgb`.
+        color_system (str): "256" or "standard".
+
+    Returns:
+        bytes: The color number of each color.
+    """
+    packed = pack_rgb(colors)
+    if np is not None:
+        channels = np.frombuffer(packed, dtype=np.uint8).reshape(-1, 3)
+        reds = channels[:, 0].astype(np.uint32)
+        keys = reds << 16 | channels[:, 1].astype(np.uint32) << 8 | channels[:, 2]
+        table = downsample_table(color_system)
+        return table.lookup(keys, np.unique(reds).tolist()).tobytes()
+    system = SYSTEMS[color_system]
+    numbers: Dict[RGB, int] = {}
+    return bytes(
+        numbers[rgb]
+        if rgb in numbers
+        else numbers.setdefault(rgb, downgrade(rgb, system))
+        for rgb in unpack_rgb(packed)
+    )
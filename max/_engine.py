@@ -0,0 +1,319 @@
+"""A batched color engine used to compute the per-character colors of a gradient."""
+from array import array
+import threading
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from rich.color import Color
+from rich.style import Style
+from rich.text import Span
+
+from max._cache import CacheInfo, LRUCache, register_cache
+from max._color_system import (
+    DOWNSAMPLED,
+    RGB,
+    Palette,
+    downsample_channels,
+    quantize,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+Channels = Tuple[Sequence[int], Sequence[int], Sequence[int]]
+STYLE_CACHE: LRUCache = register_cache("style", LRUCache(maxsize=4096))
+TABLE_RESOLUTION: int = 1024
+
+
+def blend(start: RGB, end: RGB, count: int, size: int, first: int = 0) -> Channels:
+    """Compute the colors of `count` characters blending from `start` towards `end`.
+
+    The blend of each character is `index / size`, so characters past `size` keep \
+        extrapolating beyond `end`, exactly as the per-character renderer did.
+
+    Args:
+        start (Tuple[int, int, int]): The RGB color at index zero.
+        end (Tuple[int, int, int]): The RGB color the blend is heading towards.
+        count (int): The number of characters to compute colors for.
+        size (int): The number of characters it takes to reach `end`.
+        first (int, optional): The index of the first character, for blending a \
+            slice of a longer run. Defaults to 0.
+
+    Returns:
+        Tuple[Sequence[int], Sequence[int], Sequence[int]]: The red, green and \
+            blue channel of every character.
+    """
+    if count and not size:
+        raise ZeroDivisionError("The gradient size must be greater than zero.")
+    red1, green1, blue1 = start
+    red2, green2, blue2 = end
+    if np is not None:
+        blends = np.arange(first, first + count, dtype=np.float64) / size
+        return (
+            (red1 + (red2 - red1) * blends).astype(np.int64),
+            (green1 + (green2 - green1) * blends).astype(np.int64),
+            (blue1 + (blue2 - blue1) * blends).astype(np.int64),
+        )
+    blends = [index / size for index in range(first, first + count)]
+    return (
+        array("l", [int(red1 + (red2 - red1) * value) for value in blends]),
+        array("l", [int(green1 + (green2 - green1) * value) for value in blends]),
+        array("l", [int(blue1 + (blue2 - blue1) * value) for value in blends]),
+    )
+
+
+class GradientTable(NamedTuple):
+    """The precomputed colors of a blend from one palette color to another."""
+
+    start: RGB
+    end: RGB
+    resolution: int
+    channels: Channels
+
+
+Tables = Tuple[Tuple[GradientTable, ...], ...]
+_tables: Dict[Tuple[RGB, RGB, int], GradientTable] = {}
+_tables_lock = threading.Lock()
+
+
+def build_table(start: RGB, end: RGB, resolution: int) -> GradientTable:
+    """Precompute `resolution + 1` evenly spaced colors from `start` to `end`."""
+    red, green, blue = blend(start, end, resolution + 1, resolution)
+    if np is not None:
+        channels = tuple(channel.astype(np.uint8) for channel in (red, green, blue))
+    else:
+        channels = tuple(array("B", channel) for channel in (red, green, blue))
+    return GradientTable(start, end, resolution, channels)
+
+
+def interpolation_table(
+    start: RGB, end: RGB, resolution: Optional[int] = None
+) -> GradientTable:
+    """Return the table of the blend from `start` to `end`.
+
+    Each table is built once per process and resolution, the first time a gradient \
+        needs it, and is shared by every palette holding both colors.
+
+    Args:
+        start (Tuple[int, int, int]): The RGB color the blend starts from.
+        end (Tuple[int, int, int]): The RGB color the blend ends at.
+        resolution (Optional[int], optional): The number of steps in the table. \
+            Defaults to `TABLE_RESOLUTION`.
+
+    Returns:
+        GradientTable: The precomputed blend.
+    """
+    key = (start, end, resolution or TABLE_RESOLUTION)
+    table = _tables.get(key)
+    if table is None:
+        with _tables_lock:
+            table = _tables.get(key)
+            if table is None:
+                table = _tables[key] = build_table(*key)
+    return table
+
+
+def interpolation_tables(palette: Palette, resolution: Optional[int] = None) -> Tables:
+    """Return the tables of every (start, end) pair of colors in a palette.
+
+    As the pairs are ordered, inverted gradients share them: `tables[start][end]` \
+        blends from `start` to `end` in either direction around the palette. Large \
+        palettes are better served by `interpolation_table`, which only builds the \
+        pairs that are used.
+
+    Args:
+        palette (Tuple[Tuple[int, int, int], ...]): The RGB colors of the palette.
+        resolution (Optional[int], optional): The number of steps in each table. \
+            Defaults to `TABLE_RESOLUTION`.
+
+    Returns:
+        Tables: The tables indexed by start and end index in the palette.
+    """
+    return tuple(
+        tuple(interpolation_table(start, end, resolution) for end in palette)
+        for start in palette
+    )
+
+
+def configure_tables(resolution: int) -> None:
+    """Change the default resolution of the interpolation tables and drop the \
+        tables built so far."""
+    global TABLE_RESOLUTION  # pylint: disable=global-statement
+    if resolution < 1:
+        raise ValueError(f"resolution must be at least 1, not {resolution}")
+    with _tables_lock:
+        TABLE_RESOLUTION = resolution
+        _tables.clear()
+
+
+def lookup(table: GradientTable, count: int, size: int, first: int = 0) -> Channels:
+    """Compute the colors of `count` characters from an interpolation table.
+
+    Each character's step in the table is found by integer scaling of its index. \
+        Characters past `size`, which only occur in the last stop of a gradient, \
+        are extrapolated with `blend` as the table ends at `end`.
+
+    Args:
+        table (GradientTable): The table of the blend.
+        count (int): The number of characters to compute colors for.
+        size (int): The number of characters it takes to reach the end of the table.
+        first (int, optional): The index of the first character. Defaults to 0.
+
+    Returns:
+        Tuple[Sequence[int], Sequence[int], Sequence[int]]: The red, green and \
+            blue channel of every character.
+    """
+    if count and not size:
+        raise ZeroDivisionError("The gradient size must be greater than zero.")
+    resolution = table.resolution
+    if np is not None:
+        steps = np.arange(first, first + count, dtype=np.int64) * resolution // size
+        if count and steps[-1] > resolution:
+            inside = steps <= resolution
+            channels = blend(table.start, table.end, count, size, first)
+            for channel, values in zip(channels, table.channels):
+                channel[inside] = values[steps[inside]]
+            return channels
+        return tuple(values[steps].astype(np.int64) for values in table.channels)
+    steps = [index * resolution // size for index in range(first, first + count)]
+    if count and steps[-1] > resolution:
+        channels = blend(table.start, table.end, count, size, first)
+        return tuple(
+            array(
+                "l",
+                [
+                    values[step] if step <= resolution else exact
+                    for step, exact in zip(steps, channel)
+                ],
+            )
+            for values, channel in zip(table.channels, channels)
+        )
+    return tuple(
+        array("l", [values[step] for step in steps]) for values in table.channels
+    )
+
+
+def get_style(
+    rgb: RGB | int,
+    bold: bool = False,
+    italic: bool = False,
+    underline: bool = False,
+    color_box: bool = False,
+    bgcolor: Optional[RGB] = None,
+) -> Style:
+    """Return the interned Style of a color.
+
+    Every call with the same arguments returns the same Style object, so rich never \
+        has to parse a style string for a gradient and rendered gradients share their \
+        styles.
+
+    Args:
+        rgb (Tuple[int, int, int] | int): The foreground color, or the number of \
+            the 256-color terminal color to use.
+        bold (bool, optional): Whether the style is bold. Defaults to False.
+        italic (bool, optional): Whether the style is italic. Defaults to False.
+        underline (bool, optional): Whether the style is underlined. Defaults to False.
+        color_box (bool, optional): Whether to use `rgb` as the background color as \
+            well. The other attributes are ignored for color boxes. Defaults to False.
+        bgcolor (Optional[Tuple[int, int, int]], optional): The background color. \
+            Defaults to None.
+
+    Returns:
+        Style: The interned style.
+    """
+    if color_box:
+        key = (rgb, False, False, False, True, None)
+    else:
+        key = (rgb, bold, italic, underline, False, bgcolor)
+    style = STYLE_CACHE.get(key)
+    if style is None:
+        color = Color.from_ansi(rgb) if isinstance(rgb, int) else Color.from_rgb(*rgb)
+        if color_box:
+            style = Style(color=color, bgcolor=color)
+        else:
+            style = Style(
+                color=color,
+                bgcolor=None if bgcolor is None else Color.from_rgb(*bgcolor),
+                bold=bold or None,
+                italic=italic or None,
+                underline=underline or None,
+            )
+        STYLE_CACHE.set(key, style)
+    return style
+
+
+def style_cache_info() -> CacheInfo:
+    """Return the hit, miss and eviction counts of the interned style cache."""
+    return STYLE_CACHE.info()
+
+
+def spans(
+    channels: Channels,
+    offset: int = 0,
+    *,
+    bold: bool = False,
+    underline: bool = False,
+    italic: bool = False,
+    color_box: bool = False,
+    color_system: Optional[str] = "truecolor",
+) -> List[Span]:
+    """Build the Spans of the characters from the channels computed by `blend`.
+
+    Neighbouring characters that a terminal using `color_system` displays in the \
+        same color are coalesced into a single Span. On truecolor only exact \
+        duplicates are merged. On 256 and 16 color terminals the spans are given the \
+        terminal's own colors from the downsample tables, so rich has no truecolor \
+        to downgrade when printing them. Characters whose color has left the 0-255 \
+        range are given no span at all, as rich would discard their unparsable style \
+        when rendering anyway.
+
+    Args:
+        channels (Channels): The red, green and blue channels returned by `blend`.
+        offset (int, optional): The offset of the first character. Defaults to 0.
+        bold (bool, optional): Whether to bold the characters. Defaults to False.
+        underline (bool, optional): Whether to underline the characters. Defaults to False.
+        italic (bool, optional): Whether to italicize the characters. Defaults to False.
+        color_box (bool, optional): Whether to print the characters on an identically \
+            colored background. Defaults to False.
+        color_system (Optional[str], optional): The color system of the console the \
+            characters are printed to. Defaults to "truecolor".
+
+    Returns:
+        List[Span]: The spans of the characters.
+    """
+    result: List[Span] = []
+    append = result.append
+    run_start = position = offset
+    run_key = run_style = None
+    if color_system in DOWNSAMPLED:
+        for number in downsample_channels(channels, color_system):
+            if number >= 0:
+                if run_style is None or number != run_key:
+                    if run_style is not None:
+                        append(Span(run_start, position, run_style))
+                    run_start, run_key = position, number
+                    run_style = get_style(number, bold, italic, underline, color_box)
+            elif run_style is not None:
+                append(Span(run_start, position, run_style))
+                run_style = None
+            position += 1
+        if run_style is not None:
+            append(Span(run_start, position, run_style))
+        return result
+    for rgb in zip(*(channel.tolist() for channel in channels)):
+        red, green, blue = rgb
+        if 0 <= red <= 255 and 0 <= green <= 255 and 0 <= blue <= 255:
+            key = quantize(rgb, color_system)
+            if run_style is None or key != run_key:
+                if run_style is not None:
+                    append(Span(run_start, position, run_style))
+                run_start, run_key = position, key
+                run_style = get_style(rgb, bold, italic, underline, color_box)
+        elif run_style is not None:
+            append(Span(run_start, position, run_style))
+            run_style = None
+        position += 1
+    if run_style is not None:
+        append(Span(run_start, position, run_style))
+    return result
@@ -0,0 +1,271 @@
+"""Bounded and disk-backed recordings of a console's output, and streaming export \
+as text and HTML. SVG export is not streamed."""
+import pickle
+import shutil
+import tempfile
+from collections import deque
+from html import escape
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from rich.segment import Segment
+from rich.style import Style
+from rich.terminal_theme import DEFAULT_TERMINAL_THEME, TerminalTheme
+
+SPILL_CHUNK: int = 4096
+WRITE_CHUNK: int = 64 * 1024
+
+
+class RingRecord(deque):
+    """Recorded Segments, of which only the latest `maxlen` are kept."""
+
+    def __delitem__(self, index: Any) -> None:
+        if index == slice(None):
+            self.clear()
+        else:
+            super().__delitem__(index)
+
+
+class SpillRecord:
+    """Recorded Segments, written to a file in chunks of `chunk_size` so memory \
+        only holds the latest chunk and one copy of each distinct Style.
+
+    Args:
+        path (Optional[str | Path], optional): The file to spill to, which is \
+            overwritten. Defaults to an anonymous temporary file.
+        chunk_size (int, optional): The number of Segments held in memory before \
+            they are spilled. Defaults to 4096.
+    """
+
+    def __init__(
+        self, path: Optional[str | Path] = None, chunk_size: int = SPILL_CHUNK
+    ) -> None:
+        self.chunk_size = chunk_size
+        self._file: IO[bytes] = (
+            tempfile.TemporaryFile()  # pylint: disable=consider-using-with
+            if path is None
+            else open(path, "w+b")  # pylint: disable=consider-using-with
+        )
+        self._end = 0
+        self._spilled = 0
+        self._tail: List[Segment] = []
+        self._style_ids: Dict[Optional[Style], int] = {None: 0}
+        self._styles: List[Optional[Style]] = [None]
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._tail)
+
+    def extend(self, segments: Iterable[Segment]) -> None:
+        """Record Segments, spilling them once a chunk is full."""
+        self._tail.extend(segments)
+        if len(self._tail) >= self.chunk_size:
+            self._spill()
+
+    def _style_id(self, style: Optional[Style]) -> int:
+        style_id = self._style_ids.get(style)
+        if style_id is None:
+            style_id = self._style_ids[style] = len(self._styles)
+            self._styles.append(style)
+        return style_id
+
+    def _spill(self) -> None:
+        style_id = self._style_id
+        chunk = [
+            (text, style_id(style), control) for text, style, control in self._tail
+        ]
+        self._file.seek(self._end)
+        pickle.dump(chunk, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._end = self._file.tell()
+        self._spilled += len(chunk)
+        self._tail.clear()
+
+    def __iter__(self) -> Iterator[Segment]:
+        styles = self._styles
+        self._file.flush()
+        position = 0
+        while position < self._end:
+            self._file.seek(position)
+            chunk: List[Tuple[str, int, Any]] = pickle.load(self._file)
+            position = self._file.tell()
+            for text, style_id, control in chunk:
+                yield Segment(text, styles[style_id], control)
+        yield from list(self._tail)
+
+    def clear(self) -> None:
+        """Discard every recorded Segment."""
+        self._file.seek(0)
+        self._file.truncate()
+        self._end = self._spilled = 0
+        self._tail.clear()
+
+    def __delitem__(self, index: Any) -> None:
+        if index != slice(None):
+            raise TypeError("Only a whole spilled recording can be deleted.")
+        self.clear()
+
+    def close(self) -> None:
+        """Close the file the recording spills to."""
+        self._file.close()
+
+
+class ChunkedWriter:
+    """Join small pieces of output and write them to a file in large chunks."""
+
+    def __init__(self, file: IO[str], chunk_size: int = WRITE_CHUNK) -> None:
+        self.file = file
+        self.chunk_size = chunk_size
+        self._pieces: List[str] = []
+        self._size = 0
+
+    def write(self, text: str) -> None:
+        """Queue `text`, writing the queued pieces once a chunk is full."""
+        self._pieces.append(text)
+        self._size += len(text)
+        if self._size >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the queued pieces."""
+        self.file.write("".join(self._pieces))
+        self._pieces.clear()
+        self._size = 0
+
+
+def write_text(
+    segments: Iterable[Segment], file: IO[str], styles: bool = False
+) -> None:
+    """Write recorded Segments to a file as `Console.export_text` renders them."""
+    writer = ChunkedWriter(file)
+    write = writer.write
+    for text, style, control in segments:
+        if styles:
+            write(style.render(text) if style else text)
+        elif not control:
+            write(text)
+    writer.flush()
+
+
+def write_html(
+    segments: Iterable[Segment],
+    file: IO[str],
+    code_format: str,
+    theme: Optional[TerminalTheme] = None,
+    inline_styles: bool = False,
+) -> None:
+    """Write recorded Segments to a file as `Console.export_html` renders them.
+
+    The Segments are read once, and the tags of each distinct Style are built \
+        once. Unless `inline_styles`, Styles with the same CSS share a class, and \
+        the code is held until the stylesheet that precedes it is complete: as \
+        pieces in memory, or in a temporary file when the recording is a \
+        SpillRecord, and is then written in chunks rather than joined.
+
+    Args:
+        segments (Iterable[Segment]): The recording.
+        file (IO[str]): The file to write to.
+        code_format (str): The format of the HTML, as taken by `export_html`.
+        theme (Optional[TerminalTheme], optional): The theme of the colors. \
+            Defaults to rich's default terminal theme.
+        inline_styles (bool, optional): Whether to inline the CSS of each span. \
+            Defaults to False.
+    """
+    theme = theme or DEFAULT_TERMINAL_THEME
+    head, _, tail = code_format.partition("{code}")
+    fields = {
+        "stylesheet": "",
+        "foreground": theme.foreground_color.hex,
+        "background": theme.background_color.hex,
+    }
+    if inline_styles:
+        writer = ChunkedWriter(file)
+        writer.write(head.format(**fields))
+        write_code(segments, writer.write, theme)
+        writer.write(tail.format(**fields))
+        writer.flush()
+        return
+
+    numbers: Dict[str, int] = {}
+    if not isinstance(segments, SpillRecord):
+        code: List[str] = []
+        write_code(segments, code.append, theme, numbers)
+        fields["stylesheet"] = stylesheet(numbers)
+        writer = ChunkedWriter(file)
+        writer.write(head.format(**fields))
+        for piece in code:
+            writer.write(piece)
+        writer.write(tail.format(**fields))
+        writer.flush()
+        return
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as spilled:
+        writer = ChunkedWriter(spilled)
+        write_code(segments, writer.write, theme, numbers)
+        writer.flush()
+        fields["stylesheet"] = stylesheet(numbers)
+        file.write(head.format(**fields))
+        spilled.seek(0)
+        shutil.copyfileobj(spilled, file, WRITE_CHUNK)
+        file.write(tail.format(**fields))
+
+
+def stylesheet(numbers: Dict[str, int]) -> str:
+    """Return the stylesheet of the classes of CSS rules, by number."""
+    return "\n".join(
+        f".r{number} {{{rule}}}" for rule, number in numbers.items() if rule
+    )
+
+
+def write_code(
+    segments: Iterable[Segment],
+    write: Callable[[str], Any],
+    theme: TerminalTheme,
+    numbers: Optional[Dict[str, int]] = None,
+) -> None:
+    """Write the HTML of recorded Segments, without the document around it.
+
+    Args:
+        segments (Iterable[Segment]): The recording.
+        write (Callable[[str], Any]): Writes a piece of the HTML.
+        theme (TerminalTheme): The theme of the colors.
+        numbers (Optional[Dict[str, int]], optional): The class numbers of CSS \
+            rules, to which the rules of new Styles are added in the order they \
+            are first used, or None to inline the CSS of each span. Defaults to \
+            None.
+    """
+    tags: Dict[Style, Tuple[str, str]] = {}
+    for text, style, _ in Segment.filter_control(Segment.simplify(segments)):
+        text = escape(text)
+        if style:
+            tag = tags.get(style)
+            if tag is None:
+                tag = tags[style] = html_tags(style, theme, numbers)
+            text = f"{tag[0]}{text}{tag[1]}"
+        write(text)
+
+
+def html_tags(
+    style: Style, theme: TerminalTheme, numbers: Optional[Dict[str, int]]
+) -> Tuple[str, str]:
+    """Return the opening and closing tags of the text of a Style, as \
+        `Console.export_html` writes them."""
+    rule = style.get_html_style(theme)
+    if numbers is not None:
+        number = numbers.setdefault(rule, len(numbers) + 1)
+        if style.link:
+            return f'<a class="r{number}" href="{style.link}">', "</a>"
+        return f'<span class="r{number}">', "</span>"
+    opening, closing = "", ""
+    if style.link:
+        opening, closing = f'<a href="{style.link}">', "</a>"
+    if rule:
+        opening, closing = f'<span style="{rule}">{opening}', f"{closing}</span>"
+    return opening, closing
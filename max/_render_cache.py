@@ -0,0 +1,142 @@
+"""An opt-in cache of the Segments renderables render to, for reprinted dashboards."""
+import sys
+import weakref
+from typing import Any, Hashable, Optional, Protocol, Set, Tuple, runtime_checkable
+
+from rich.console import Console, ConsoleOptions, RenderableType, RenderResult
+from rich.measure import Measurement
+from rich.segment import Segment
+
+from max._cache import LRUCache, register_cache
+
+SEGMENT_CACHE_BYTES: int = 32 * 1024 * 1024
+SEGMENT_BYTES: int = 72
+Entry = Tuple[Optional[RenderableType], Tuple[Segment, ...]]
+
+
+@runtime_checkable
+class Cacheable(Protocol):  # pylint: disable=too-few-public-methods
+    """A renderable whose rendering is determined by its `cache_key`, such as a \
+        Gradient. Equal keys share cached Segments across instances."""
+
+    def cache_key(self, console: Optional[Console] = None) -> Hashable:
+        """Return a key that changes whenever the rendering for `console` would."""
+
+
+def entry_size(entry: Entry) -> int:
+    """Estimate the memory held by the cached Segments of a renderable in bytes."""
+    segments = entry[1]
+    return SEGMENT_BYTES * len(segments) + sum(
+        sys.getsizeof(segment.text) for segment in segments
+    )
+
+
+SEGMENT_CACHE: LRUCache = register_cache(
+    "segments",
+    LRUCache(maxsize=1024, maxbytes=SEGMENT_CACHE_BYTES, sizeof=entry_size),
+)
+# The ids of the consoles with a finalizer that evicts their cached Segments.
+_CONSOLE_IDS: Set[int] = set()
+
+
+def console_id(console: Console) -> int:
+    """Return the id that stands for `console` in the keys of the cache.
+
+    The cache holds ids rather than consoles, so it never keeps a console or its \
+        file alive. The entries of a console are evicted once it is collected, \
+        before its id can be reused.
+    """
+    identity = id(console)
+    if identity not in _CONSOLE_IDS:
+        _CONSOLE_IDS.add(identity)
+        weakref.finalize(console, forget_console, identity).atexit = False
+    return identity
+
+
+def forget_console(identity: int) -> None:
+    """Evict the cached Segments of a collected console."""
+    _CONSOLE_IDS.discard(identity)
+    SEGMENT_CACHE.discard_where(lambda key: key[0] == identity)
+
+
+class Cached:
+    """Render a renderable once per console, width and color system, and replay \
+        its Segments when it is printed again.
+
+    Renderables that follow the Cacheable protocol are keyed by their `cache_key`. \
+        Any other renderable is keyed by its identity and `version`, so a renderable \
+        that is changed in place must be given a new version to be rendered afresh.
+
+    Args:
+        renderable (RenderableType): The renderable to cache.
+        version (Hashable, optional): The version of a renderable that is not \
+            Cacheable. Defaults to None.
+    """
+
+    __slots__ = ("renderable", "version")
+
+    def __init__(self, renderable: RenderableType, version: Hashable = None) -> None:
+        self.renderable = renderable
+        self.version = version
+
+    def __repr__(self) -> str:
+        return f"Cached({self.renderable!r}, version={self.version!r})"
+
+    def key(self, console: Console, options: ConsoleOptions) -> Tuple[Any, ...]:
+        """Return the key of the renderable's Segments for a console and options."""
+        renderable = self.renderable
+        if isinstance(renderable, Cacheable):
+            identity: Tuple[Any, ...] = (
+                type(renderable),
+                renderable.cache_key(console),
+            )
+        else:
+            identity = (id(renderable), self.version)
+        return (
+            console_id(console),
+            identity,
+            console.color_system,
+            options.max_width,
+            options.min_width,
+            options.height,
+            options.justify,
+            options.overflow,
+            options.no_wrap,
+            options.highlight,
+            options.markup,
+            options.ascii_only,
+            options.legacy_windows,
+        )
+
+    def __rich_console__(
+        self, console: Console, options: ConsoleOptions
+    ) -> RenderResult:
+        renderable = self.renderable
+        key = self.key(console, options)
+        entry = SEGMENT_CACHE.get(key)
+        if entry is None:
+            # The entry of an uncacheable renderable holds it, so no other object \
+            # can take its identity while it is cached.
+            owner = None if isinstance(renderable, Cacheable) else renderable
+            entry = (owner, tuple(console.render(renderable, options)))
+            SEGMENT_CACHE.set(key, entry)
+        yield from entry[1]
+
+    def __rich_measure__(
+        self, console: Console, options: ConsoleOptions
+    ) -> Measurement:
+        return Measurement.get(console, options, self.renderable)
+
+
+def configure_segment_cache(
+    maxbytes: Optional[int] = SEGMENT_CACHE_BYTES, maxsize: int = 1024
+) -> None:
+    """Change the bounds of the cache of rendered Segments.
+
+    Args:
+        maxbytes (Optional[int], optional): The approximate memory budget of the \
+            cache in bytes, or None for no budget. Defaults to 32 MiB.
+        maxsize (int, optional): The maximum number of cached renderings. Defaults \
+            to 1024.
+    """
+    SEGMENT_CACHE.resize(maxsize, maxbytes)
@@ -0,0 +1,126 @@
+"""Write the output of worker processes to a console in the parent process."""
+import threading
+from typing import TYPE_CHECKING, Any, Iterable, NamedTuple, Optional, Tuple
+
+from rich.console import Console, ConsoleOptions
+from rich.segment import Segment
+from rich.text import Text
+
+if TYPE_CHECKING:  # pragma: no cover
+    from max.console import MaxConsole
+
+
+class SinkStats(NamedTuple):
+    """Statistics of a ConsoleSink."""
+
+    records: int
+    characters: int
+
+
+class Record:
+    """Output a worker rendered, printed as it was rendered.
+
+    Args:
+        text (str): The rendered output, with its control codes.
+    """
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def __rich_console__(
+        self, console: Console, options: ConsoleOptions
+    ) -> Iterable[Segment]:
+        if not console.record:
+            yield Segment(self.text)
+            return
+        # Decode the record so it is exported with its styles, not its codes.
+        yield from Text.from_ansi(self.text).render(console)
+
+
+def connect(
+    queue: Any, width: int, color_system: Optional[str], force_terminal: bool
+) -> None:
+    """Send the output of the MaxConsole of this process to a ConsoleSink. The \
+        initializer of the processes of a worker pool.
+
+    Only the default console, `MaxConsole()`, is attached. Output of any other \
+        console of the worker, such as that of stderr or of a file, is written by \
+        the worker as usual.
+    """
+    # pylint: disable=import-outside-toplevel
+    from max.console import MaxConsole
+
+    MaxConsole().attach_sink(queue, width, color_system, force_terminal)
+
+
+class ConsoleSink:
+    """Write the output of worker processes to a console, a whole record at a time.
+
+    Workers render their output themselves, with the width and color system of \
+        the console, and put each complete record on a multiprocessing queue. A \
+        thread of the parent process prints the records in the order they arrive, \
+        so output from different workers never interleaves within a line and is \
+        printed above a live display such as MaxProgress. Only the default console \
+        of each worker, `MaxConsole()`, is sent to the sink.
+
+    Example:
+        with console.sink() as sink, ProcessPoolExecutor(
+            initializer=sink.initializer, initargs=sink.initargs
+        ) as pool:
+            pool.map(work, jobs)
+
+    Args:
+        console (MaxConsole): The console of the parent process.
+        context (Optional[Any], optional): The multiprocessing context of the \
+            workers. Defaults to the default context.
+    """
+
+    initializer = staticmethod(connect)
+
+    def __init__(self, console: "MaxConsole", context: Optional[Any] = None) -> None:
+        # pylint: disable=import-outside-toplevel
+        import multiprocessing
+
+        self.console = console
+        self.queue = (context or multiprocessing.get_context()).Queue()
+        self.records = 0
+        self.characters = 0
+        self._thread = threading.Thread(
+            target=self._run, name="max-console-sink", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def initargs(self) -> Tuple[Any, ...]:
+        """The arguments of `initializer` for the processes of a worker pool."""
+        console = self.console
+        return (self.queue, console.width, console.color_system, console.is_terminal)
+
+    def _run(self) -> None:
+        while True:
+            text = self.queue.get()
+            if text is None:
+                return
+            self.console.print(Record(text), end="", crop=False)
+            self.records += 1
+            self.characters += len(text)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Print the records already sent and stop. Call it once the workers have \
+            exited."""
+        self.queue.put(None)
+        self._thread.join(timeout)
+        self.queue.close()
+        self.queue.join_thread()
+
+    def stats(self) -> SinkStats:
+        """Return the number of records and characters printed."""
+        return SinkStats(self.records, self.characters)
+
+    def __enter__(self) -> "ConsoleSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -3,7 +3,6 @@
 from pathlib import Path
 from typing import Dict, Mapping, Optional
 
-import toml
 from rich.style import Style, StyleType
 from rich.theme import Theme
 
@@ -246,6 +245,7 @@ if __name__ == "__main__":  # pragma: no cover
     import argparse
     import io
 
+    import toml
     from rich.console import Console
     from rich.table import Table
     from rich.text import Text
@@ -323,5 +323,5 @@ if __name__ == "__main__":  # pragma: no cover
     if html:
         print(console.export_html(inline_styles=True))
 
-with open(Path.cwd() / "static" / "max_theme.toml", "wt", encoding="ufc-8") as file:
-    toml.dump(MAX_STYLES, file)
+    with open(Path.cwd() / "static" / "max_theme.toml", "wt", encoding="utf-8") as file:
+        toml.dump(MAX_STYLES, file)
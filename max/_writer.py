@@ -0,0 +1,254 @@
+"""Background threads that write a console's rendered output: from a bounded queue, \
+and once a batch has waited long enough."""
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, List, Literal, NamedTuple, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+Policy = Literal["block", "drop-oldest", "drop-newest"]
+POLICIES: Tuple[str, ...] = ("block", "drop-oldest", "drop-newest")
+QUEUE_SIZE: int = 1024
+
+
+class WriterStats(NamedTuple):
+    """Statistics of a BackgroundWriter."""
+
+    depth: int
+    maxsize: int
+    policy: str
+    written: int
+    dropped: int
+    failed: int
+    waiting: int
+    high_water: int
+
+
+class BackgroundWriter:
+    """Write pieces of output on a daemon thread, in the order they were put.
+
+    Pieces wait in a queue of at most `maxsize`. When it is full, `policy` \
+        decides what happens to a new piece: "block" makes the producer wait its \
+        turn, "drop-oldest" discards the oldest queued piece to make room and \
+        "drop-newest" discards the new piece. Producers that wait are admitted in \
+        the order they arrived, so blocking never reorders output. Every piece \
+        waiting in the queue is pending for the thread, which writes all of them \
+        with a single call of `write`.
+
+    Args:
+        write (Callable[[str], None]): Writes and flushes a piece of output.
+        maxsize (int, optional): The capacity of the queue. Defaults to 1024.
+        policy (Policy, optional): What to do when the queue is full. Defaults \
+            to "block".
+    """
+
+    def __init__(
+        self,
+        write: Callable[[str], None],
+        maxsize: int = QUEUE_SIZE,
+        policy: Policy = "block",
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, not {policy!r}")
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, not {maxsize}")
+        self.write = write
+        self.maxsize = maxsize
+        self.policy = policy
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.high_water = 0
+        self._queue: Deque[str] = deque()
+        self._waiters: Deque[Tuple[str, threading.Event]] = deque()
+        self._writing = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="max-console-writer", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def alive(self) -> bool:
+        """Whether the writer still accepts output."""
+        return not self._closed
+
+    def put(self, text: str, block: bool = True) -> Optional[threading.Event]:
+        """Queue a piece of output.
+
+        Args:
+            text (str): The output.
+            block (bool, optional): With the "block" policy and a full queue, \
+                whether to wait for room. When False, the piece keeps its place in \
+                line and the Event that is set once it is queued is returned \
+                instead. Defaults to True.
+
+        Returns:
+            Optional[threading.Event]: The Event to wait for, or None when the \
+                piece was queued or dropped.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The background writer has been stopped.")
+            if len(self._queue) < self.maxsize and not self._waiters:
+                self._append(text)
+                return None
+            if self.policy == "drop-newest":
+                self.dropped += 1
+                return None
+            if self.policy == "drop-oldest":
+                self._queue.popleft()
+                self.dropped += 1
+                self._append(text)
+                return None
+            admitted = threading.Event()
+            self._waiters.append((text, admitted))
+        if block:
+            admitted.wait()
+            return None
+        return admitted
+
+    def _append(self, text: str) -> None:
+        self._queue.append(text)
+        self.high_water = max(self.high_water, len(self._queue))
+        self._condition.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    self._condition.notify_all()
+                    return
+                pieces = list(self._queue)
+                self._queue.clear()
+                while self._waiters and len(self._queue) < self.maxsize:
+                    text, admitted = self._waiters.popleft()
+                    self._append(text)
+                    admitted.set()
+                self._writing = True
+            try:
+                self.write("".join(pieces))
+            except BaseException:  # pylint: disable=broad-except
+                # A failed write loses its pieces but must not stop the thread, \
+                # even when a broken pipe makes the console raise SystemExit.
+                failed = len(pieces)
+            else:
+                failed = 0
+            with self._condition:
+                self.written += len(pieces) - failed
+                self.failed += failed
+                self._writing = False
+                self._condition.notify_all()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far has been written.
+
+        Returns:
+            bool: Whether the queue was drained before `timeout` seconds passed.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not (self._queue or self._waiters or self._writing)
+                or not self._thread.is_alive(),
+                timeout,
+            )
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting output, write everything pending and end the thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self) -> WriterStats:
+        """Return the depth, capacity, policy and counts of the writer."""
+        with self._condition:
+            return WriterStats(
+                depth=len(self._queue),
+                maxsize=self.maxsize,
+                policy=self.policy,
+                written=self.written,
+                dropped=self.dropped,
+                failed=self.failed,
+                waiting=len(self._waiters),
+                high_water=self.high_water,
+            )
+
+
+class BatchFlusher:
+    """Flush the batches of any number of consoles from a single daemon thread, \
+        each once its deadline on the monotonic clock has passed.
+
+    The thread is started by the first `schedule` and sleeps until the earliest \
+        deadline. Consoles are held weakly, so a scheduled flush never keeps one \
+        alive.
+
+    Args:
+        flush (Callable[[Any], None]): Writes the batch of a console.
+    """
+
+    def __init__(self, flush: Callable[[Any], None]) -> None:
+        self.flush = flush
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        # A forked child has none of the parent's threads, and its lock may have
+        # been held by one of them.
+        self._condition = threading.Condition()
+        self._deadlines: "WeakKeyDictionary[Any, float]" = WeakKeyDictionary()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, console: Any, delay: float) -> None:
+        """Flush the batch of `console` in `delay` seconds, unless it already has \
+            an earlier deadline."""
+        deadline = time.monotonic() + delay
+        with self._condition:
+            if self._deadlines.get(console, deadline) < deadline:
+                return
+            self._deadlines[console] = deadline
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="max-console-flusher", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def cancel(self, console: Any) -> None:
+        """Forget the deadline of `console`, whose batch has been written."""
+        with self._condition:
+            self._deadlines.pop(console, None)
+
+    def _due(self) -> Tuple[List[Any], Optional[float]]:
+        """Take the consoles whose deadline has passed, and return them with the \
+            seconds until the next deadline."""
+        now = time.monotonic()
+        due = []
+        timeout = None
+        for console, deadline in list(self._deadlines.items()):
+            if deadline <= now:
+                due.append(console)
+                del self._deadlines[console]
+            elif timeout is None or deadline - now < timeout:
+                timeout = deadline - now
+        return due, timeout
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                due, timeout = self._due()
+                if not due:
+                    self._condition.wait(timeout)
+                    continue
+            for console in due:
+                try:
+                    self.flush(console)
+                except BaseException:  # pylint: disable=broad-except
+                    # A failed flush must not stop the flushes of other consoles.
+                    pass
+            # The thread must not hold a console while it waits.
+            del console, due
@@ -0,0 +1,693 @@
+"""Benchmarks of max's hot paths. Run with `python -m max.bench`.
+
+Results may be saved as JSON with `--json` and compared against a previous run \
+with `--baseline`, which exits with status 1 when a benchmark got slower than its \
+threshold.
+"""
+import argparse
+import json
+import os
+import gc
+import io
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from rich.console import Console
+from rich.highlighter import ReprHighlighter
+from rich.markup import escape
+from rich.panel import Panel
+from rich.table import Table
+
+from max._highlighter import HIGHLIGHT_MEMO, CompiledReprHighlighter
+from max._color_system import DOWNSAMPLED
+from max.console import MaxConsole
+from max.gradient import Gradient
+from max.named_color import NamedColor
+from max.palette import Palette
+from max.progress import MaxProgress
+from max.rule import GradientRule
+
+LOREM = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua. "
+)
+GRADIENT_SIZES: Sequence[int] = (1_000, 100_000, 1_000_000)
+GRADIENT_STOPS: Sequence[int] = (2, 5, 10)
+RULE_WIDTHS: Sequence[int] = (40, 80, 200)
+PALETTE_SIZES: Sequence[int] = (4, 16, 64)
+DEFAULT_THRESHOLD: float = 0.10
+IMPORT_BUDGETS: Dict[str, float] = {
+    "import max": 0.05,
+    "from max import Gradient": 0.25,
+}
+DEV_ONLY_MODULES: Sequence[str] = (
+    "cheap_repr",
+    "lorem_text",
+    "rich._inspect",
+    "rich.layout",
+    "snoop",
+    "toml",
+)
+
+Result = Dict[str, Any]
+
+
+class BenchOptions:
+    """The settings shared by every benchmark.
+
+    Args:
+        repeat (int, optional): The number of timed runs of each case; the fastest \
+            is kept. Defaults to 3.
+        quick (bool, optional): Use smaller inputs and fewer operations per run. \
+            Defaults to False.
+    """
+
+    def __init__(self, repeat: int = 3, quick: bool = False) -> None:
+        self.repeat = repeat
+        self.quick = quick
+
+    def scale(self, number: int) -> int:
+        """Scale a number of operations down for quick runs."""
+        return max(1, number // 10) if self.quick else number
+
+
+Benchmark = Callable[[BenchOptions], Iterable[Result]]
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    """Register a benchmark under `name`."""
+
+    def register(func: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = func
+        return func
+
+    return register
+
+
+def best_of(func: Callable[[], Any], repeat: int = 3, number: int = 1) -> float:
+    """Return the fastest of `repeat` timed runs of `number` calls of `func`, in \
+        seconds per call."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings)
+
+
+def result(name: str, seconds: float, **params: Any) -> Result:
+    """Build the result of one benchmark case."""
+    return {
+        "name": name,
+        "seconds": seconds,
+        "ops_per_second": 1 / seconds if seconds else float("inf"),
+        "params": params,
+    }
+
+
+def sample_text(size: int) -> str:
+    """Return `size` characters of lorem ipsum."""
+    return (LOREM * (size // len(LOREM) + 1))[:size]
+
+
+def null_console(**kwargs: Any) -> MaxConsole:
+    """Create a MaxConsole that writes to the null device, bypassing the registry."""
+    null_file = open(  # pylint: disable=consider-using-with
+        os.devnull, "w", encoding="utf-8"
+    )
+    return MaxConsole(file=null_file, register=False, **kwargs)
+
+
+def import_time(statement: str) -> Tuple[float, List[str]]:
+    """Measure `statement` in a fresh interpreter with `-X importtime`.
+
+    Returns:
+        Tuple[float, List[str]]: The cumulative import time of the top level \
+            modules in seconds, and the dev-only modules it imported.
+    """
+    check = "import sys; print(*sorted(sys.modules))"
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{statement}; {check}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    microseconds = 0
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # Nested imports are indented and already counted by their importer.
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            microseconds += int(cumulative)
+    loaded = set(process.stdout.split())
+    return microseconds / 1_000_000, [
+        name for name in DEV_ONLY_MODULES if name in loaded
+    ]
+
+
+def dashboard() -> List[Any]:
+    """Build the renderables of a dashboard frame: a panel of a table, a rule and \
+        a gradient."""
+    table = Table("Worker", "Records", "Seconds", title="Throughput")
+    for worker in range(12):
+        table.add_row(f"worker-{worker}", f"{worker * 1_000:,}", f"{worker / 8:.3f}")
+    return [
+        Panel(table, title="Dashboard"),
+        GradientRule(
+            "Status", palette=Palette(["#ff0000", "#00ff00", "#0000ff", "#ffffff"])
+        ),
+        Gradient(LOREM[:400]),
+    ]
+
+
+def recording_console(lines: int, **kwargs: Any) -> MaxConsole:
+    """Create a recording console that has printed a dashboard and `lines` \
+        gradients."""
+    console = MaxConsole(
+        file=io.StringIO(),
+        width=100,
+        record=True,
+        color_system="truecolor",
+        force_terminal=True,
+        traceback=False,
+        **kwargs,
+    )
+    random.seed(0)
+    for renderable in dashboard():
+        console.print(renderable)
+    console.print("[link=https://example.com]docs[/link] <escaped> & :rocket:")
+    for line in range(lines):
+        console.print(Gradient(f"{line} {LOREM[:80]}", start=line % 10))
+    return console
+
+
+LOG_LINE = "2024-05-01 12:00:00.125|INFO    |max.worker|run|Line  42  |Processed"
+
+
+def highlight_samples() -> List[str]:
+    """Return strings that exercise every pattern of ReprHighlighter, alone and \
+        mixed with words."""
+    rng = random.Random(0)
+    samples = [
+        LOG_LINE,
+        "<Gradient text='hello' start=3 end=None invert=False>",
+        "{'a': [1, 2.5, -3e10, 4j], 'b': (True, False, None, ...)}",
+        "GET https://example.com/path?query=1&b=2 from 192.168.0.1 in 0.125s",
+        "fe80::1ff:fe23:4567:890a 00:1B:44:11:3A:B7 01-23-45-67-89-ab-cd-ef",
+        "550e8400-e29b-41d4-a716-446655440000 /usr/local/lib/python3.11/site.py",
+        "call(foo.bar(1), b'bytes', '''triple''', \"double\", 'esc\\'aped')",
+        '0xdeadbeef 1.5e-3 -42 worker_3=ready state="idle" <a href=x>',
+        "",
+    ]
+    words = LOREM.split()
+    for _ in range(200):
+        pieces = [rng.choice(words) for _ in range(rng.randrange(1, 12))]
+        pieces += [rng.choice(samples) for _ in range(rng.randrange(0, 3))]
+        rng.shuffle(pieces)
+        samples.append(" ".join(pieces))
+    return samples
+
+
+@benchmark("import")
+def bench_import(options: BenchOptions) -> Iterable[Result]:
+    """Import max in a fresh interpreter."""
+    for statement in IMPORT_BUDGETS:
+        seconds = min(import_time(statement)[0] for _ in range(options.repeat))
+        yield result(f"import[{statement}]", seconds)
+
+
+@benchmark("gradient")
+def bench_gradient(options: BenchOptions) -> Iterable[Result]:
+    """Render gradients across text sizes and numbers of color stops. The render \
+        cache is bypassed so every run renders."""
+    sizes = GRADIENT_SIZES[:2] if options.quick else GRADIENT_SIZES
+    for size in sizes:
+        text = sample_text(size)
+        for stops in GRADIENT_STOPS:
+            gradient = Gradient(text, start=1, length=stops)
+            seconds = best_of(gradient.render_text, options.repeat)
+            yield result(f"gradient[{size},{stops}]", seconds, size=size, stops=stops)
+        rainbow = Gradient(text, rainbow=True)
+        seconds = best_of(rainbow.render_text, options.repeat)
+        yield result(f"gradient.rainbow[{size}]", seconds, size=size, stops=10)
+
+
+@benchmark("palette")
+def bench_palette(options: BenchOptions) -> Iterable[Result]:
+    """Look compiled palettes up from their colors and render gradients through \
+        every color of palettes of several sizes."""
+    text = sample_text(options.scale(100_000))
+    for size in PALETTE_SIZES:
+        colors = [
+            (index * 255 // (size - 1), 128, 255 - index * 255 // (size - 1))
+            for index in range(size)
+        ]
+        seconds = best_of(
+            lambda colors=colors: Palette(colors), options.repeat, options.scale(1_000)
+        )
+        yield result(f"palette.lookup[{size}]", seconds, colors=size)
+        gradient = Gradient(text, start=0, length=size, palette=colors)
+        seconds = best_of(gradient.render_text, options.repeat)
+        yield result(f"palette.gradient[{size}]", seconds, colors=size, size=len(text))
+
+
+@benchmark("rule")
+def bench_rule(options: BenchOptions) -> Iterable[Result]:
+    """Render titled gradient rules at several widths."""
+    for width in RULE_WIDTHS:
+        console = null_console(width=width)
+        rule = GradientRule("Benchmark")
+        seconds = best_of(
+            lambda rule=rule, console=console: rule.render(console, console.options),
+            options.repeat,
+            options.scale(100),
+        )
+        yield result(f"rule[{width}]", seconds, width=width)
+
+
+@benchmark("named_color")
+def bench_named_color(options: BenchOptions) -> Iterable[Result]:
+    """Construct NamedColors from a name, a hex code, an RGB tuple and an index, \
+        map colors outside the palette onto it one at a time and in a batch."""
+    inputs = {
+        "name": "light_blue",
+        "hex": "#0088ff",
+        "rgb": (0, 136, 255),
+        "int": 4,
+        "nearest_hex": "#123456",
+        "nearest_rgb": (18, 52, 86),
+        "nearest_rich": "dark_orange",
+    }
+    for kind, color in inputs.items():
+        seconds = best_of(
+            lambda color=color: NamedColor(color),
+            options.repeat,
+            options.scale(10_000),
+        )
+        yield result(f"named_color.{kind}", seconds, color=repr(color))
+    count = options.scale(100_000)
+    colors = [
+        (index % 256, index * 7 % 256, index * 13 % 256) for index in range(count)
+    ]
+    seconds = best_of(lambda: NamedColor.from_colors(colors), options.repeat)
+    yield result(f"named_color.from_colors[{count}]", seconds / count, count=count)
+
+
+@benchmark("convert")
+def bench_convert(options: BenchOptions) -> Iterable[Result]:
+    """Convert colors one at a time and in bulk, per color."""
+    count = options.scale(50_000)
+    colors = [
+        (index % 256, index * 7 % 256, index * 13 % 256) for index in range(count)
+    ]
+    hex_colors = NamedColor.rgb_to_hex_many(colors)
+    cases = {
+        "hex_to_rgb": (
+            lambda: [NamedColor.hex_to_rgb(hex_color) for hex_color in hex_colors],
+            lambda: NamedColor.hex_to_rgb_many(hex_colors),
+        ),
+        "rgb_to_hex": (
+            lambda: [NamedColor.rgb_to_hex(rgb) for rgb in colors],
+            lambda: NamedColor.rgb_to_hex_many(colors),
+        ),
+        "rgb_to_256": (
+            lambda: [NamedColor.rgb_to_256(rgb) for rgb in colors],
+            lambda: NamedColor.rgb_to_256_many(colors),
+        ),
+        "rgb_to_16": (
+            lambda: [NamedColor.rgb_to_16(rgb) for rgb in colors],
+            lambda: NamedColor.rgb_to_16_many(colors),
+        ),
+    }
+    for name, (scalar, bulk) in cases.items():
+        for kind, func in (("scalar", scalar), ("many", bulk)):
+            seconds = best_of(func, options.repeat) / count
+            yield result(f"convert.{name}.{kind}", seconds, count=count)
+
+
+@benchmark("console")
+def bench_console(options: BenchOptions) -> Iterable[Result]:
+    """Print and log a line of markup to the null device."""
+    console = null_console(width=120)
+    line = "Processed [bold]42[/bold] records from worker-3 in 0.125s"
+    for method in ("print", "log"):
+        seconds = best_of(
+            lambda write=getattr(console, method): write(line),
+            options.repeat,
+            options.scale(2_000),
+        )
+        yield result(f"console.{method}", seconds)
+
+
+@benchmark("render_cache")
+def bench_render_cache(options: BenchOptions) -> Iterable[Result]:
+    """Reprint the frame of a dashboard, with and without the render cache."""
+    console = null_console(width=120)
+    frame = dashboard()
+    for cached in (False, True):
+        renderables = [console.cached(item) for item in frame] if cached else frame
+        seconds = best_of(
+            lambda renderables=renderables: console.print(*renderables),
+            options.repeat,
+            options.scale(200),
+        )
+        yield result(f"render_cache.{'cached' if cached else 'uncached'}", seconds)
+
+
+@benchmark("plain")
+def bench_plain(options: BenchOptions) -> Iterable[Result]:
+    """Print lines to a file that is not a terminal, through the plain fast path \
+        and through rich's print, per line."""
+    console = null_console(width=120)
+    lines = {
+        "text": "Processed record 42 from worker-3 in 0.125s",
+        "markup": "Processed [bold]42[/bold] records from worker-3 in 0.125s",
+    }
+    for name, line in lines.items():
+        for mode, print_ in (("plain", MaxConsole.print), ("rich", Console.print)):
+            seconds = best_of(
+                lambda print_=print_, line=line: print_(console, line),
+                options.repeat,
+                options.scale(5_000),
+            )
+            yield result(f"plain.{name}.{mode}", seconds)
+
+
+@benchmark("record")
+def bench_record(options: BenchOptions) -> Iterable[Result]:
+    """Record gradients in memory, in a ring buffer and in a spill file, and export \
+        them as HTML to a file, whole and streamed. The memory the recording \
+        retains is reported with each result."""
+    lines = options.scale(2_000)
+    modes = {
+        "list": {},
+        "ring": {"record_limit": 10_000},
+        "spill": {"record_spill": True},
+    }
+    for mode, kwargs in modes.items():
+        gc.collect()
+        tracemalloc.start()
+        try:
+            console = recording_console(lines, **kwargs)
+            gc.collect()
+            retained = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        with tempfile.TemporaryFile("w+", encoding="utf-8") as file:
+            seconds = best_of(
+                lambda: console.stream_html(file, clear=False), options.repeat
+            )
+            yield result(
+                f"record.{mode}.stream_html", seconds, lines=lines, retained=retained
+            )
+            if mode == "list":
+                seconds = best_of(
+                    lambda: file.write(console.export_html(clear=False)),
+                    options.repeat,
+                )
+                yield result("record.list.export_html", seconds, lines=lines)
+
+
+@benchmark("highlighter")
+def bench_highlighter(options: BenchOptions) -> Iterable[Result]:
+    """Highlight a repeated log line and distinct lines with ReprHighlighter and \
+        the compiled highlighter, per line."""
+    samples = highlight_samples()
+    workloads = {"repeated": [LOG_LINE] * len(samples), "distinct": samples}
+    for name, lines in workloads.items():
+        for mode, highlighter in (
+            ("rich", ReprHighlighter()),
+            ("compiled", CompiledReprHighlighter()),
+        ):
+
+            def highlight(highlighter: Any = highlighter, lines: Any = lines) -> None:
+                if name == "distinct":
+                    HIGHLIGHT_MEMO.clear()
+                for line in lines:
+                    highlighter(line)
+
+            seconds = best_of(highlight, options.repeat) / len(lines)
+            yield result(f"highlighter.{name}.{mode}", seconds, lines=len(lines))
+
+
+@benchmark("downsample")
+def bench_downsample(options: BenchOptions) -> Iterable[Result]:
+    """Render gradients for 256 and 16 color consoles, which emit the terminal's \
+        own colors, and print them to the null device."""
+    text = sample_text(options.scale(100_000))
+    for color_system in DOWNSAMPLED:
+        console = null_console(
+            width=120, color_system=color_system, force_terminal=True
+        )
+        gradient = Gradient(text, start=1, length=5, console=console)
+        rendered = gradient.render_text()
+        seconds = best_of(gradient.render_text, options.repeat)
+        yield result(f"downsample.render[{color_system}]", seconds, size=len(text))
+        seconds = best_of(lambda: console.print(rendered), options.repeat)
+        yield result(f"downsample.print[{color_system}]", seconds, size=len(text))
+
+
+def drain(descriptor: int) -> None:
+    """Read a pipe until it is closed, as a fast consumer would."""
+    while os.read(descriptor, 1 << 16):
+        pass
+
+
+@benchmark("batch")
+def bench_batch(options: BenchOptions) -> Iterable[Result]:
+    """Print short lines to a pipe and to a file, one write per line and in \
+        batch mode, per line."""
+    lines = options.scale(50_000)
+    for target in ("pipe", "file"):
+        for batch in (False, True):
+            if target == "pipe":
+                reader, writer = os.pipe()
+                drainer = threading.Thread(target=drain, args=(reader,), daemon=True)
+                drainer.start()
+                file = os.fdopen(writer, "w", encoding="utf-8")
+            else:
+                file = tempfile.TemporaryFile("w", encoding="utf-8")
+            console = MaxConsole(file=file, width=120, batch=batch, traceback=False)
+
+            def write(console: MaxConsole = console) -> None:
+                for index in range(lines):
+                    console.print(f"Processed record {index} in 0.125s")
+                console.flush()
+
+            seconds = best_of(write, options.repeat) / lines
+            file.close()
+            if target == "pipe":
+                drainer.join()
+                os.close(reader)
+            mode = "batch" if batch else "line"
+            yield result(f"batch.{target}.{mode}", seconds, lines=lines)
+
+
+@benchmark("writer")
+def bench_writer(options: BenchOptions) -> Iterable[Result]:
+    """Print short lines to a pipe through the background writer, from a thread \
+        and from coroutines, per line."""
+    # pylint: disable=import-outside-toplevel
+    import asyncio
+
+    lines = options.scale(50_000)
+    for mode in ("print", "aprint"):
+        reader, writer = os.pipe()
+        drainer = threading.Thread(target=drain, args=(reader,), daemon=True)
+        drainer.start()
+        file = os.fdopen(writer, "w", encoding="utf-8")
+        console = MaxConsole(file=file, width=120, traceback=False)
+        console.start_writer()
+
+        def write(console: MaxConsole = console) -> None:
+            for index in range(lines):
+                console.print(f"Processed record {index} in 0.125s")
+            console.flush()
+
+        async def awrite(console: MaxConsole = console) -> None:
+            for index in range(lines):
+                await console.aprint(f"Processed record {index} in 0.125s")
+            console.flush()
+
+        func = write if mode == "print" else lambda: asyncio.run(awrite())
+        seconds = best_of(func, options.repeat) / lines
+        console.stop_writer()
+        file.close()
+        drainer.join()
+        os.close(reader)
+        yield result(f"writer.{mode}", seconds, lines=lines)
+
+
+@benchmark("progress")
+def bench_progress(options: BenchOptions) -> Iterable[Result]:
+    """Advance a task of a MaxProgress that is not refreshed automatically."""
+    progress = MaxProgress(console=null_console(width=120), auto_refresh=False)
+    task = progress.add_task("Benchmark", total=None)
+    seconds = best_of(
+        lambda: progress.update(task, advance=1),
+        options.repeat,
+        options.scale(20_000),
+    )
+    yield result("progress.update", seconds)
+
+
+def run(
+    names: Optional[Sequence[str]] = None, options: Optional[BenchOptions] = None
+) -> List[Result]:
+    """Run the benchmarks called `names`, or all of them, and return their results."""
+    options = options or BenchOptions()
+    results: List[Result] = []
+    for name in names or BENCHMARKS:
+        results.extend(BENCHMARKS[name](options))
+    return results
+
+
+def compare(
+    results: List[Result],
+    baseline: List[Result],
+    threshold: float = DEFAULT_THRESHOLD,
+    limits: Optional[Dict[str, float]] = None,
+) -> List[Result]:
+    """Find the results that got slower than their baseline by more than allowed.
+
+    Args:
+        results (List[Result]): The results of this run.
+        baseline (List[Result]): The results of a previous run. Cases missing from \
+            it are not compared.
+        threshold (float, optional): The allowed slowdown as a fraction. Defaults to \
+            0.10.
+        limits (Optional[Dict[str, float]], optional): The allowed slowdown of \
+            individual cases by name, overriding `threshold`. Defaults to None.
+
+    Returns:
+        List[Result]: The regressed results, each with its `baseline` seconds and \
+            `slowdown`.
+    """
+    limits = limits or {}
+    previous = {entry["name"]: entry["seconds"] for entry in baseline}
+    regressions = []
+    for entry in results:
+        baseline_seconds = previous.get(entry["name"])
+        if not baseline_seconds:
+            continue
+        slowdown = entry["seconds"] / baseline_seconds - 1
+        if slowdown > limits.get(entry["name"], threshold):
+            regressions.append(
+                {**entry, "baseline": baseline_seconds, "slowdown": slowdown}
+            )
+    return regressions
+
+
+def results_table(results: List[Result]) -> Table:
+    """Generate a table to display benchmark results."""
+    table = Table(
+        "Benchmark",
+        "µs / op",
+        "Ops / second",
+        title="Benchmarks",
+        border_style="bold #ffffff",
+    )
+    for entry in results:
+        table.add_row(
+            escape(entry["name"]),
+            f"{entry['seconds'] * 1_000_000:,.2f}",
+            f"{entry['ops_per_second']:,.1f}",
+        )
+    return table
+
+
+def regressions_table(regressions: List[Result]) -> Table:
+    """Generate a table to display the regressions found by `compare`."""
+    table = Table(
+        "Benchmark",
+        "Baseline µs / op",
+        "µs / op",
+        "Slowdown",
+        title="Regressions",
+        border_style="bold #ff0000",
+    )
+    for entry in regressions:
+        table.add_row(
+            escape(entry["name"]),
+            f"{entry['baseline'] * 1_000_000:,.2f}",
+            f"{entry['seconds'] * 1_000_000:,.2f}",
+            f"{entry['slowdown']:+.1%}",
+        )
+    return table
+
+
+def parse_limit(limit: str) -> Tuple[str, float]:
+    """Parse a `NAME=FRACTION` threshold of a single benchmark case."""
+    name, separator, fraction = limit.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"expected NAME=FRACTION, not {limit!r}")
+    return name, float(fraction)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmarks, print and save their results and check for regressions."""
+    parser = argparse.ArgumentParser(
+        prog="python -m max.bench", description="Benchmarks of max's hot paths."
+    )
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        metavar="BENCHMARK",
+        help=f"Benchmarks to run, from: {', '.join(BENCHMARKS)}. Defaults to all.",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case.")
+    parser.add_argument(
+        "--quick", action="store_true", help="Use smaller inputs and fewer operations."
+    )
+    parser.add_argument("--json", type=Path, help="Write the results to this file.")
+    parser.add_argument(
+        "--baseline", type=Path, help="Compare against the results in this file."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown against the baseline as a fraction. Defaults to 0.10.",
+    )
+    parser.add_argument(
+        "--limit",
+        type=parse_limit,
+        action="append",
+        default=[],
+        metavar="NAME=FRACTION",
+        help="Allowed slowdown of a single case, overriding --threshold. Repeatable.",
+    )
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    results = run(args.benchmarks, BenchOptions(args.repeat, args.quick))
+    console = MaxConsole()
+    console.print(results_table(results))
+    if args.json:
+        report = {"python": sys.version.split()[0], "results": results}
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(
+            results, baseline["results"], args.threshold, dict(args.limit)
+        )
+        if regressions:
+            console.print(regressions_table(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -1,152 +1,163 @@
 """This module creates a sequence of increasing or decreasing integers \
     from which to generate a gradient."""
 # pylint: disable=unused-import,redefined-outer-name,syntax-error
+import operator
+import threading
 from collections.abc import Sequence
 from itertools import cycle
-from random import choice, randint
-from typing import List, Optional
+from random import randint
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple
 
-# from snoop import snoop
-from cheap_repr import normal_repr, register_repr
-from loguru import logger as log
-from rich import inspect
 from rich.panel import Panel
 from rich.text import Text
-from snoop import snoop
 
-from max.console import MaxConsole
-from max.log import debug, log
-from max.named_color import NamedColor
-from max.progress import MaxProgress
+from max.console import get_console
+
+if TYPE_CHECKING:  # pragma: no cover
+    from max.palette import Palette
 
-console = MaxConsole()
 ASCENDING = cycle(list(range(10)))
 DESCENDING = cycle(list(range(9, -1, -1)))
+MODULUS: int = 10
+INDEX_COLORS: Tuple[str, ...] = (
+    "#ff00ff",
+    "#af00ff",
+    "#6f00ff",
+    "#0000ff",
+    "#0088ff",
+    "#00ffff",
+    "#00ff00",
+    "#ffff00",
+    "#ff8800",
+    "#ff0000",
+)
+
+Key = Tuple[int, int, int, int]
+_interned: Dict[Key, "ColorIndex"] = {}
+_interned_lock = threading.Lock()
+
+
+class ColorIndex(Sequence):
+    """An immutable sequence of indexes from which to generate a gradient.
 
+    The indexes step through the colors from `start`, one color at a time, and \
+        wrap around at the end of the palette. A ColorIndex stores only its start, \
+        step, length and modulus, so indexing, slicing and iterating it are O(1) \
+        per item and keep no state on the object. Equal ColorIndexes are interned, \
+        so repeated gradients share them.
 
-class ColorIndex(List):
-    """A list of indexes from which to generate a gradient."""
+    Args:
+        start (Optional[int]): The integer from which to start the index. Random when \
+            neither `start` nor `end` is given.
+        end (Optional[int]): The integer to end the index. When given with `start`, \
+            the length is the number of steps between them.
+        invert (Optional[bool]): Whether to descend the index. Defaults to False.
+        length (Optional[int]): The number of integers in the index. This value is \
+            only used when `start`, `end`, or both are not provided. Defaults to 3.
+        title (Optional[str | Text]): Accepted for compatibility and ignored, as \
+            ColorIndexes are interned. Pass a title to `panel` instead.
+        modulus (int, optional): The number of colors to wrap around. Defaults to 10.
+        palette (Optional[Palette]): The palette the indexes are into, which sets \
+            the modulus to its number of colors. Defaults to None.
+    """
 
-    indexes: list = []
-    _iter_index: int = 0
+    __slots__ = ("start", "step", "length", "modulus", "__weakref__")
+    start: int
+    step: int
+    length: int
+    modulus: int
 
-    def __init__(
-        self,
+    def __new__(
+        cls,
         start: Optional[int] = None,
         end: Optional[int] = None,
         invert: Optional[bool] = False,
         length: Optional[int] = 3,
-        title: Optional[str | Text] = "ColorIndex",
-    ) -> None:
-        """Generate a list of integers from which to construct a gradient.
-
-		Args:
-			start (Optional[int]): The integer from which to start the index.
-			end (Optional[int]): The integer to end the index.
-			invert (Optional[bool]): Whether to descend the index. Defaults to False.
-			length (Optional[int]): The number of integers in the index. This value is \
-only used when `start`, `end`, or both are not provided. Defaults to 3.
-"""
-        super().__init__([])
-        self.start = start
-        self.end = end
-        self.invert = invert
-        self.length = length
-        self.title = title
-
-        if self.start is None and self.end is None:
-            self.generate_start_end()
-        elif self.start is None and self.end:
-            self.generate_start()
-        elif self.start and self.end is None:
-            self.generate_end()
-        else:
-            self.generate_index()
+        title: Optional[str | Text] = None,  # pylint: disable=unused-argument
+        *,
+        modulus: int = MODULUS,
+        palette: Optional["Palette"] = None,
+    ) -> "ColorIndex":
+        if palette is not None:
+            modulus = len(palette)
+        step = -1 if invert else 1
+        if start is None and end is None:
+            start = randint(0, modulus - 1)
+        elif start is None:
+            start = end - step * (length - 1)
+        elif end is not None:
+            # A gradient from a color to itself goes all the way around.
+            length = ((end - start) * step % modulus or modulus) + 1
+        return cls.from_step(start, step, length, modulus)
 
-    def generate_start_end(self):
-        """Generate the start and end when only `length` is provided."""
-        self.start = randint(0, 9)
-        self.indexes = []
-        for index in range(self.length):
-            if not self.invert:
-                next_index = self.start + index
-            else:
-                next_index = self.start - index
-            if next_index < 0:
-                next_index += 10
-            if next_index > 9:
-                next_index -= 10
-            self.indexes.append(next_index)
-        self.end = self.indexes[-1]
-
-    def generate_start(self):
-        """ "Generate the start when only `end` is provided."""
-        for index in range(self.length):
-            if not self.invert:
-                next_index = self.end - index
-            else:
-                next_index = self.end + index
-            if index < 0:
-                next_index += 10
-            if index > 9:
-                next_index -= 10
-            self.indexes.append(next_index)
-
-    def generate_end(self):
-        """Generate the end when only `start` is provided."""
-        self.indexes = []
-        for index in range(self.length):
-            if not self.invert:
-                next_index = self.start + index
-            else:
-                next_index = self.start - index
-            if next_index < 0:
-                next_index += 10
-            if next_index > 9:
-                next_index -= 10
-            self.indexes.append(next_index)
-        self.end = self.indexes[-1]
-
-    def generate_index(self):
-        """Generate the index when both `start` and `end` are provided."""
-        self.indexes = []
-        if not self.invert:
-            if self.start < self.end:
-                self.length = (self.end + 1) - self.start
-            else:
-                self.length = (10 - self.start) + self.end + 1
-        else:
-            if self.start > self.end:
-                self.length = (self.start + 1) - self.end
-            else:
-                self.length = (10 - self.end) + self.start + 1
-        for index in range(self.length):
-            if not self.invert:
-                next_index = self.start + index
-            else:
-                next_index = self.start - index
-            if next_index < 0:
-                next_index += 10
-            if next_index > 9:
-                next_index -= 10
-            self.indexes.append(next_index)
-        assert next_index == self.end, f"{next_index} != {self.end}"
-
-    def __getitem__(self, index):
-        if index >= len(self.indexes):
+    @classmethod
+    def from_step(
+        cls, start: int, step: int, length: int, modulus: int = MODULUS
+    ) -> "ColorIndex":
+        """Return the interned ColorIndex of `length` integers counting from `start` \
+            in steps of `step` modulo `modulus`."""
+        if length < 0:
+            raise ValueError(f"length must not be negative, not {length}")
+        key = (start % modulus, step, length, modulus)
+        color_index = _interned.get(key)
+        if color_index is None:
+            with _interned_lock:
+                color_index = _interned.get(key)
+                if color_index is None:
+                    color_index = object.__new__(cls)
+                    for name, value in zip(cls.__slots__, key):
+                        object.__setattr__(color_index, name, value)
+                    _interned[key] = color_index
+        return color_index
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self) -> Tuple[Any, Key]:
+        return (
+            ColorIndex.from_step,
+            (self.start, self.step, self.length, self.modulus),
+        )
+
+    @property
+    def end(self) -> Optional[int]:
+        """The last integer of the index, or None when it is empty."""
+        return self[-1] if self.length else None
+
+    @property
+    def invert(self) -> bool:
+        """Whether the index descends."""
+        return self.step < 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            positions = range(self.length)[index]
+            return self.from_step(
+                self.start + self.step * positions.start,
+                self.step * positions.step,
+                len(positions),
+                self.modulus,
+            )
+        index = operator.index(index)
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
             raise IndexError("ColorIndex index out of range")
-        return self.indexes[index]
+        return (self.start + self.step * index) % self.modulus
 
-    def __iter__(self):
-        self._iter_index = 0
-        return self
+    def __iter__(self) -> Iterator[int]:
+        start, step, modulus = self.start, self.step, self.modulus
+        for index in range(self.length):
+            yield (start + step * index) % modulus
 
-    def __next__(self):
-        if self._iter_index >= len(self.indexes):
-            raise StopIteration
-        value = self.indexes[self._iter_index]
-        self._iter_index += 1
-        return value
+    def __repr__(self) -> str:
+        return (
+            f"ColorIndex(start={self.start}, end={self.end}, "
+            f"invert={self.invert}, length={self.length})"
+        )
 
     def colorful_class(self, on_white=False) -> Text:
         """Prints `ColorIndex' in a colorful way, manually.
@@ -182,39 +193,39 @@ only used when `start`, `end`, or both are not provided. Defaults to 3.
         )
         return colored_index
 
-    def __len__(self) -> int:
-        return len(self.indexes)
-
     def __rich__(self) -> Panel:
-        colors = [
-            "#ff00ff",
-            "#af00ff",
-            "#6f00ff",
-            "#0000ff",
-            "#0088ff",
-            "#00ffff",
-            "#00ff00",
-            "#ffff00",
-            "#ff8800",
-            "#ff0000",
-        ]
-        if "ColorIndex" in self.title:
-            self.title = self.colorful_class()
-        else:
-            self.title = self.title
+        return self.panel()
+
+    def panel(
+        self, title: Optional[str | Text] = None, palette: Optional["Palette"] = None
+    ) -> Panel:
+        """Display the indexes in their colors in a panel.
+
+        Args:
+            title (Optional[str | Text]): The title of the panel. Defaults to the \
+                colorful name of the class.
+            palette (Optional[Palette]): The palette to color the indexes with. \
+                Defaults to the ten NamedColors.
+        """
+        hex_colors = INDEX_COLORS if palette is None else palette.hex
         index_list = []
-        for i in self.indexes:
-            hex_color = colors[i]
+        for i in self:
+            hex_color = hex_colors[i % len(hex_colors)]
             index = f"[bold {hex_color}]{i}[/]"
             index_list.append(index)
         indexes = "[bold #ffffff],[/] ".join(index_list)
         index_text = f"[bold #ffffff]< [/]{indexes} [bold #ffffff]>[/]"
 
-        return Panel(index_text, title=self.title, border_style="bold #ffffff")
+        return Panel(
+            index_text,
+            title=self.colorful_class() if title is None else title,
+            border_style="bold #ffffff",
+        )
 
     @staticmethod
     def demo():
         """Generate a demonstration of the ColorIndex Class."""
+        console = get_console()
         console.clear()
         console.line(2)
         color_index = ColorIndex().colorful_class()
@@ -233,10 +244,13 @@ a random {color_index}, no arguments are required.[/bold #ffffff]\n\n\n{color_in
 [bold #ff00ff] 1[/][bold #ffffff] is an example of one such random {color_index}:\n"
         console.print(text_block1, justify="center", width=115)
 
-        color_index1 = ColorIndex(title=f"{color_index} [bold #ff00ff]1[/]")
+        color_index1 = ColorIndex()
         color_index = color_index1.colorful_class()
-        # console.print(color_index)
-        console.print(color_index1, justify="center", width=115)
+        console.print(
+            color_index1.panel(f"{color_index} [bold #ff00ff]1[/]"),
+            justify="center",
+            width=115,
+        )
         console.line(2)
 
         text_block2 = f"{color_index} [bold #ff00ff]2[/bold #ff00ff]\
@@ -247,10 +261,12 @@ a random {color_index}, no arguments are required.[/bold #ffffff]\n\n\n{color_in
 [bold #ffffff], which spans \nthe entire range of possible indexes \
 using {color_index}.\n[/bold #ffffff]"
         console.print(text_block2, justify="center", width=115)
-        color_index2 = ColorIndex(
-            start=0, end=9, title=f"{color_index} [bold #ff00ff]2[/]"
+        color_index2 = ColorIndex(start=0, end=9)
+        console.print(
+            color_index2.panel(f"{color_index} [bold #ff00ff]2[/]"),
+            justify="center",
+            width=115,
         )
-        console.print(color_index2, justify="center", width=115)
         console.line(2)
 
         text_block3 = f"{color_index} [bold #ff00ff]3[/bold #ff00ff]\
@@ -259,18 +275,23 @@ as well as how an index that goes outside of \nthe integers [/bold #ffffff]\
 [bold italic #00ffff]0[/] - [bold italic #00fffff]9[/][bold #fffff], will \
 return from the opposite end of the spectrum.[/bold #fffff]\n"
         console.print(text_block3, justify="center", width=115)
-        color_index3 = ColorIndex(2, 8, True, title=f"{color_index} [bold #ff00ff]3[/]")
-        console.print(color_index3, justify="center", width=115)
+        color_index3 = ColorIndex(2, 8, True)
+        console.print(
+            color_index3.panel(f"{color_index} [bold #ff00ff]3[/]"),
+            justify="center",
+            width=115,
+        )
 
-        text_block4 = f"\n[bold #ffffff]There is one final argument that has yet to be mentioned \
-though it has been demonstrated \nextensively. That is the [/][bold italic #af00ff]title[/]\
-[bold #ffffff] which is the name of the {color_index} displayed in the repr \
-and rich \ndunder methods.[/]\n\n\n"
+        text_block4 = f"\n[bold #ffffff]There is one final method that has yet to be mentioned \
+though it has been demonstrated \nextensively. That is [/][bold italic #af00ff]panel[/]\
+[bold #ffffff] which displays a {color_index} under a title of your choosing \
+rather \nthan its name.[/]\n\n\n"
 
         console.print(text_block4, justify="center", width=115)
 
 
-register_repr(ColorIndex)(normal_repr)
-
 if __name__ == "__main__":  # pragma: no cover
+    from cheap_repr import normal_repr, register_repr
+
+    register_repr(ColorIndex)(normal_repr)
     ColorIndex.demo()
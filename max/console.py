@@ -1,36 +1,172 @@
 """MaxConsole is a custom themed class inheriting from rich.console.Console."""
 # pylint: disable=invalid-name
+import atexit
 import os
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import IO, Callable, Literal, Mapping, Optional, Union
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Union,
+)
+from weakref import WeakValueDictionary, ref
 
+from rich._emoji_replace import _emoji_replace
 from rich._log_render import FormatTimeCallable
-from rich.console import Console, ConsoleRenderable, RichCast
+from rich.cells import cell_len
+from rich.console import (
+    CONSOLE_HTML_FORMAT,
+    COLOR_SYSTEMS,
+    WINDOWS,
+    Console,
+    ConsoleRenderable,
+    RichCast,
+)
 from rich.emoji import EmojiVariant
-from rich.highlighter import ReprHighlighter
-from rich.panel import Panel
+from rich.markup import render as render_markup
+from rich.segment import Segment
 from rich.style import StyleType
+from rich.terminal_theme import TerminalTheme
 from rich.text import Text
 from rich.theme import Theme
-from rich.traceback import install as install_traceback
 
+from max._cache import CacheInfo, cache_stats
+from max._highlighter import REPR_HIGHLIGHTER
+from max._record import RingRecord, SpillRecord, write_html, write_text
+from max._render_cache import (
+    SEGMENT_CACHE_BYTES,
+    Cached,
+    configure_segment_cache,
+)
+from max._sink import ConsoleSink
 from max._theme import MaxTheme
+from max._writer import (
+    QUEUE_SIZE,
+    BackgroundWriter,
+    BatchFlusher,
+    Policy,
+    WriterStats,
+)
 
 RenderableType = ConsoleRenderable | RichCast | str
 HighlighterType = Callable[[Union[str, "Text"]], "Text"]
 JustifyMethod = Literal["default", "left", "center", "right", "full"]
 OverflowMethod = Literal["fold", "crop", "ellipsis", "ignore"]
+BATCH_SIZE: int = 64 * 1024
+BATCH_INTERVAL: float = 0.1
+# Rich writes at most this many characters at once on Windows, where larger writes
+# can fail (https://bugs.python.org/issue37871), and deferred output does the same.
+MAX_WRITE: int = 32 * 1024 // 4
+# The arguments of `print` that plain lines are not printed with.
+PLAIN_UNSUPPORTED = ("style", "justify", "overflow", "no_wrap", "width", "height")
+# The Events of pieces an `aprint` or `alog` queued without waiting for room.
+_ADMISSIONS: ContextVar[Optional[List[threading.Event]]] = ContextVar(
+    "admissions", default=None
+)
+
+
+# The arguments that select a shared console of the registry.
+REGISTRY_KEYS = frozenset(("file", "stderr", "width", "color_system", "record"))
+_consoles: Dict[Tuple[Any, ...], "MaxConsole"] = {}
+# Consoles of a given file are shared only while something else holds them, so
+# neither they nor their files are kept alive by the registry.
+_file_consoles: "WeakValueDictionary[Tuple[Any, ...], MaxConsole]" = (
+    WeakValueDictionary()
+)
+_consoles_lock = threading.Lock()
 
 
 class Singleton(type):
-    """A metaclass to create a single global MaxConsole instance."""
+    """A metaclass that returns the shared console of the registry for the \
+        arguments of `get_console`, and a new console for any other arguments \
+        or when called with `register=False`."""
+
+    def __call__(cls, *args, register: bool = True, **kwargs):
+        if not register or args or not REGISTRY_KEYS.issuperset(kwargs):
+            return super(Singleton, cls).__call__(*args, **kwargs)
+        return _registered(cls, **kwargs)
 
-    _instances = {}
 
-    def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
-        return cls._instances[cls]
+def _registered(
+    cls: type,
+    file: Optional[IO[str]] = None,
+    stderr: bool = False,
+    width: Optional[int] = None,
+    color_system: Optional[str] = "auto",
+    record: bool = False,
+) -> "MaxConsole":
+    arguments = {
+        "file": file,
+        "stderr": stderr,
+        "width": width,
+        "color_system": color_system,
+        "record": record,
+    }
+    options = (cls, stderr, width, color_system, record)
+    registry: MutableMapping[Tuple[Any, ...], MaxConsole] = _consoles
+    if file is not None:
+        # A console holds its file, so the id is not reused while it is shared.
+        registry, options = _file_consoles, (id(file), *options)
+    console = registry.get(options)
+    if console is None:
+        with _consoles_lock:
+            console = registry.get(options)
+            if console is None:
+                console = registry[options] = type.__call__(cls, **arguments)
+    return console
+
+
+def get_console(
+    file: Optional[IO[str]] = None,
+    *,
+    stderr: bool = False,
+    width: Optional[int] = None,
+    color_system: Optional[str] = "auto",
+    record: bool = False,
+) -> "MaxConsole":
+    """Return the shared MaxConsole for a file, width, color system and recording.
+
+    Consoles are created the first time they are asked for, once per process, \
+        so importing max never creates one. `MaxConsole()` with the same \
+        arguments returns the same console, and `MaxConsole(register=False)` a \
+        console of its own. Consoles of the standard streams live as long as the \
+        process, while the console of a given file is only shared while it is \
+        in use elsewhere.
+
+    Args:
+        file (Optional[IO[str]], optional): The file to write to. Defaults to \
+            stdout or stderr.
+        stderr (bool, optional): Write to stderr rather than stdout. Defaults to \
+            False.
+        width (Optional[int], optional): The width of the console, or None to \
+            detect it. Defaults to None.
+        color_system (Optional[str], optional): The color system of the console. \
+            Defaults to "auto".
+        record (bool, optional): Whether the console records its output. Defaults \
+            to False.
+    """
+    return _registered(
+        MaxConsole,
+        file=file,
+        stderr=stderr,
+        width=width,
+        color_system=color_system,
+        record=record,
+    )
 
 
 class MaxConsole(Console, metaclass=Singleton):
@@ -95,9 +231,24 @@ class MaxConsole(Console, metaclass=Singleton):
             or None for datetime.now.
         get_time (Callable[[], time], optional): Callable that \
             gets the current time in seconds, default uses time.monotonic.
+        batch (bool, optional): Collect rendered output and write it in large \
+            batches instead of once per call. Defaults to False.
+        batch_size (int, optional): The number of characters of output that \
+            triggers a write in batch mode. Defaults to 64 KiB.
+        batch_interval (Optional[float], optional): The longest time in seconds \
+            output waits in batch mode before it is written, or None to wait for \
+            the size threshold or an explicit `flush`. Defaults to 0.1.
+        record_limit (Optional[int], optional): Record only the latest \
+            `record_limit` segments of output. Defaults to None.
+        record_spill (Optional[bool | str | Path], optional): Record output to a \
+            temporary file, or to the file at a path, rather than memory. Defaults \
+            to None.
+        register (bool, optional): Return the shared console of the registry when \
+            only the arguments of `get_console` are given, or a console of its \
+            own when False. Defaults to True.
     """
 
-    theme: Theme = MaxTheme()
+    theme: Theme
     _environ: Mapping[str, str] = os.environ
 
     def __init__(
@@ -110,7 +261,7 @@ class MaxConsole(Console, metaclass=Singleton):
         force_jupyter: Optional[bool] = None,
         force_interactive: Optional[bool] = None,
         soft_wrap: bool = False,
-        theme: Optional[Theme] = MaxTheme(),
+        theme: Optional[Theme] = None,
         stderr: bool = False,
         file: Optional[IO[str]] = None,
         quiet: bool = False,
@@ -127,21 +278,27 @@ class MaxConsole(Console, metaclass=Singleton):
         log_time: bool = True,
         log_path: bool = True,
         log_time_format: Union[str, FormatTimeCallable] = "[%X]",
-        highlighter: Optional[HighlighterType] = ReprHighlighter(),
+        highlighter: Optional[HighlighterType] = REPR_HIGHLIGHTER,
         legacy_windows: Optional[bool] = None,
         safe_box: bool = True,
         get_datetime: Optional[Callable[[], datetime]] = None,
         get_time: Optional[Callable[[], float]] = None,
         traceback: bool = True,
+        batch: bool = False,
+        batch_size: int = BATCH_SIZE,
+        batch_interval: Optional[float] = BATCH_INTERVAL,
+        record_limit: Optional[int] = None,
+        record_spill: Optional[bool | str | Path] = None,
         _environ: Optional[Mapping[str, str]] = None,
     ):
+        self.theme = MaxTheme() if theme is None else theme
         super().__init__(
             color_system=color_system,
             force_terminal=force_terminal,
             force_jupyter=force_jupyter,
             force_interactive=force_interactive,
             soft_wrap=soft_wrap,
-            theme=theme,
+            theme=self.theme,
             stderr=stderr,
             file=file,
             quiet=quiet,
@@ -166,11 +323,524 @@ class MaxConsole(Console, metaclass=Singleton):
             _environ=_environ,
         )
         if traceback:
+            # Rich's traceback pulls in pygments, so it is only imported when used.
+            from rich.traceback import (  # pylint: disable=import-outside-toplevel
+                install as install_traceback,
+            )
+
             install_traceback(console=self)
+        self._batch: Optional[List[str]] = None
+        self._batch_length = 0
+        self._batch_deadline = False
+        self._bypass = 0
+        self._writer: Optional[BackgroundWriter] = None
+        self._sink: Optional[Any] = None
+        self._registered_at_exit = False
+        self.set_batching(batch, batch_size, batch_interval)
+        if record_limit is not None or record_spill:
+            self.set_recording(record_limit, record_spill)
 
     def __repr__(self) -> str:
         return f"<MaxConsole width={self.width} {self._color_system!s}>"
 
+    def set_batching(
+        self,
+        enabled: bool = True,
+        size: int = BATCH_SIZE,
+        interval: Optional[float] = BATCH_INTERVAL,
+    ) -> None:
+        """Turn batch mode on or off.
+
+        In batch mode rendered output is collected in memory and written with a \
+            single call, or in chunks of whole lines on Windows as rich writes, once \
+            `size` characters are pending, `interval` seconds after the oldest \
+            pending output, on `flush`, when the console is collected or when the \
+            interpreter exits. Batches that reach `interval` are written by a single \
+            thread shared by every console. While a live display such as MaxProgress \
+            is active, output is written immediately, after anything pending, so it \
+            never interleaves with it.
+
+        Args:
+            enabled (bool, optional): Whether to batch output. Defaults to True.
+            size (int, optional): The number of pending characters that triggers a \
+                write. Defaults to 64 KiB.
+            interval (Optional[float], optional): The longest time in seconds output \
+                is held, or None for no limit. Defaults to 0.1.
+        """
+        with self._lock:
+            self.flush()
+            self.batch_size = size
+            self.batch_interval = interval
+            self._batch = [] if enabled else None
+            if enabled:
+                self._register_at_exit()
+
+    @property
+    def batching(self) -> bool:
+        """Whether output is currently collected rather than written at once."""
+        return self._batch is not None and self._deferred
+
+    @property
+    def _deferred(self) -> bool:
+        """Whether output is batched or handed to the background writer, rather \
+            than written by rich as it is rendered."""
+        return (
+            (
+                self._batch is not None
+                or self._writer is not None
+                or self._sink is not None
+            )
+            and not self._bypass
+            and not self._live_stack
+            and not self.is_jupyter
+            and not (WINDOWS and self.legacy_windows)
+        )
+
+    def start_writer(self, maxsize: int = QUEUE_SIZE, policy: Policy = "block") -> None:
+        """Write output on a background thread, so printing never waits on a slow \
+            terminal or pipe.
+
+        Output is rendered by the caller and queued in order. When `maxsize` \
+            pieces are waiting, `policy` decides whether the caller waits for room \
+            ("block"), the oldest piece is dropped ("drop-oldest") or the new one is \
+            ("drop-newest"). Everything queued is written when the writer is \
+            stopped, on `flush` and at exit.
+
+        Args:
+            maxsize (int, optional): The capacity of the queue. Defaults to 1024.
+            policy (Policy, optional): What to do when the queue is full. Defaults \
+                to "block".
+        """
+        with self._lock:
+            self.stop_writer()
+            self._writer = BackgroundWriter(self._write_text, maxsize, policy)
+            self._register_at_exit()
+
+    def stop_writer(self, timeout: Optional[float] = None) -> None:
+        """Write everything queued for the background writer and stop its thread."""
+        with self._lock:
+            self._flush_batch()
+            writer, self._writer = self._writer, None
+            if writer is not None:
+                writer.stop(timeout)
+
+    def writer_stats(self) -> Optional[WriterStats]:
+        """Return the queue depth and the written and dropped counts of the \
+            background writer, or None when it is not running."""
+        writer = self._writer
+        return None if writer is None else writer.stats()
+
+    async def aprint(self, *objects: Any, **kwargs: Any) -> None:
+        """Print to the console without waiting on its file.
+
+        The objects are rendered and queued for the background writer, which is \
+            started with its defaults if it is not running. With the "block" policy \
+            and a full queue, the coroutine waits for room without blocking the \
+            event loop. Takes the arguments of `print`.
+        """
+        with self._async_puts() as admissions:
+            self.print(*objects, **kwargs)
+        await self._admitted(admissions)
+
+    async def alog(self, *objects: Any, _stack_offset: int = 1, **kwargs: Any) -> None:
+        """Log to the console without waiting on its file, as `aprint` prints. \
+            Takes the arguments of `log`."""
+        with self._async_puts() as admissions:
+            self.log(*objects, _stack_offset=_stack_offset + 1, **kwargs)
+        await self._admitted(admissions)
+
+    @contextmanager
+    def _async_puts(self) -> Iterator[List[threading.Event]]:
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self.start_writer()
+        admissions: List[threading.Event] = []
+        token = _ADMISSIONS.set(admissions)
+        try:
+            yield admissions
+        finally:
+            _ADMISSIONS.reset(token)
+
+    @staticmethod
+    async def _admitted(admissions: List[threading.Event]) -> None:
+        # pylint: disable=import-outside-toplevel
+        import asyncio
+
+        for admitted in admissions:
+            if not admitted.is_set():
+                await asyncio.to_thread(admitted.wait)
+
+    def sink(self, context: Optional[Any] = None) -> ConsoleSink:
+        """Return a ConsoleSink that prints the output of worker processes to \
+            this console.
+
+        Args:
+            context (Optional[Any], optional): The multiprocessing context of the \
+                workers. Defaults to the default context.
+        """
+        return ConsoleSink(self, context)
+
+    def attach_sink(
+        self,
+        queue: Any,
+        width: int,
+        color_system: Optional[str],
+        force_terminal: bool,
+    ) -> None:
+        """Render output for the console of another process and put each record \
+            on `queue` rather than writing it. Called in worker processes by \
+            `ConsoleSink.initializer`.
+
+        Args:
+            queue (Any): The queue of the ConsoleSink.
+            width (int): The width of the console of the sink.
+            color_system (Optional[str]): The color system of the console of the \
+                sink.
+            force_terminal (bool): Whether the console of the sink is a terminal.
+        """
+        with self._lock:
+            # Output pending in a forked parent belongs to the parent.
+            self._writer = None
+            self._batch = None
+            self._batch_deadline = False
+            self._batch_length = 0
+            self._sink = queue
+            self.width = width
+            self._color_system = COLOR_SYSTEMS[color_system] if color_system else None
+            self._force_terminal = force_terminal
+            self.legacy_windows = False
+
+    def detach_sink(self) -> None:
+        """Write output to the console's own file again."""
+        with self._lock:
+            self._sink = None
+
+    def flush(self) -> None:
+        """Write the output pending in batch mode or queued for the background \
+            writer to the console's file."""
+        with self._lock:
+            self._flush_batch()
+            writer = self._writer
+            if writer is not None:
+                writer.join()
+
+    def _flush_batch(self) -> None:
+        with self._lock:
+            if self._batch_deadline:
+                _FLUSHER.cancel(self)
+                self._batch_deadline = False
+            if not self._batch:
+                return
+            text = "".join(self._batch)
+            del self._batch[:]
+            self._batch_length = 0
+            self._emit(text)
+
+    def _emit(self, text: str) -> None:
+        """Hand rendered output to a sink or the background writer, or write it."""
+        if self._sink is not None:
+            self._sink.put(text)
+            return
+        if self._writer is None:
+            self._write_text(text)
+            return
+        admissions = _ADMISSIONS.get()
+        admitted = self._writer.put(text, block=admissions is None)
+        if admitted is not None:
+            admissions.append(admitted)
+
+    def _write_text(self, text: str) -> None:
+        try:
+            if WINDOWS and len(text) > MAX_WRITE:
+                for chunk in _line_chunks(text, MAX_WRITE):
+                    self.file.write(chunk)
+            else:
+                self.file.write(text)
+            self.file.flush()
+        except BrokenPipeError:
+            self.on_broken_pipe()
+
+    def _register_at_exit(self) -> None:
+        if not self._registered_at_exit:
+            atexit.register(_flush_at_exit, ref(self))
+            self._registered_at_exit = True
+
+    def __del__(self) -> None:
+        # Output a collected console still holds in batch mode is written, as it
+        # would be at exit.
+        if getattr(self, "_batch", None):
+            try:
+                self._flush_batch()
+            except ValueError:  # The file was closed first.
+                pass
+
+    def _check_buffer(self) -> None:
+        if not self._deferred:
+            with self._lock:
+                self.flush()
+                super()._check_buffer()
+            return
+        if self.quiet:
+            del self._buffer[:]
+            return
+        with self._lock:
+            if self._buffer_index:
+                return
+            if self.record:
+                with self._record_buffer_lock:
+                    self._record_buffer.extend(self._buffer[:])
+            text = self._render_buffer(self._buffer[:])
+            del self._buffer[:]
+            if self._batch is None:
+                self._emit(text)
+                return
+            self._batch.append(text)
+            self._batch_length += len(text)
+            if self._batch_length >= self.batch_size:
+                self._flush_batch()
+            elif not self._batch_deadline and self.batch_interval is not None:
+                _FLUSHER.schedule(self, self.batch_interval)
+                self._batch_deadline = True
+
+    def set_live(self, live: Any) -> bool:
+        with self._lock:
+            self.flush()
+            return super().set_live(live)
+
+    def input(self, *args: Any, **kwargs: Any) -> str:  # pylint: disable=W0221
+        """Display a prompt, written at once even when output is deferred, and \
+            read a line."""
+        with self._lock:
+            self.flush()
+            self._bypass += 1
+        try:
+            return super().input(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._bypass -= 1
+
+    def set_recording(
+        self, limit: Optional[int] = None, spill: Optional[bool | str | Path] = None
+    ) -> None:
+        """Record output, keeping what is already recorded, in memory, in a ring \
+            buffer or in a file.
+
+        Args:
+            limit (Optional[int], optional): Keep only the latest `limit` segments \
+                of output, or None to keep all of them. Defaults to None.
+            spill (Optional[bool | str | Path], optional): Keep the recording in a \
+                temporary file when True, or in the file at a path, with only its \
+                latest chunk in memory. Defaults to None.
+
+        Raises:
+            ValueError: Both a limit and a spill file were given.
+        """
+        if limit is not None and spill:
+            raise ValueError("A recording is either limited or spilled, not both.")
+        with self._record_buffer_lock:
+            recorded = self._record_buffer
+            if limit is not None:
+                buffer: Any = RingRecord(recorded, maxlen=limit)
+            elif spill:
+                buffer = SpillRecord(None if spill is True else spill)
+                buffer.extend(recorded)
+            else:
+                buffer = list(recorded)
+            if isinstance(recorded, SpillRecord):
+                recorded.close()
+            self._record_buffer = buffer
+            self.record = True
+
+    def stream_text(
+        self, file: IO[str], *, clear: bool = True, styles: bool = False
+    ) -> None:
+        """Write the recorded output to a file as text, a chunk at a time, as \
+            `export_text` would return it.
+
+        Args:
+            file (IO[str]): The file to write to.
+            clear (bool, optional): Clear the recording afterwards. Defaults to True.
+            styles (bool, optional): Include the ANSI codes of styles. Defaults to \
+                False.
+        """
+        assert self.record, "To export console contents set record=True"
+        with self._record_buffer_lock:
+            write_text(self._record_buffer, file, styles)
+            if clear:
+                del self._record_buffer[:]
+
+    def stream_html(
+        self,
+        file: IO[str],
+        *,
+        theme: Optional[TerminalTheme] = None,
+        clear: bool = True,
+        code_format: Optional[str] = None,
+        inline_styles: bool = False,
+    ) -> None:
+        """Write the recorded output to a file as HTML, a chunk at a time, as \
+            `export_html` would return it. Styles with the same CSS share a class.
+
+        SVG is not streamed: `export_svg` and `save_svg` are rich's, which build \
+            the whole document in memory.
+
+        Args:
+            file (IO[str]): The file to write to.
+            theme (Optional[TerminalTheme], optional): The theme of the colors. \
+                Defaults to rich's default terminal theme.
+            clear (bool, optional): Clear the recording afterwards. Defaults to True.
+            code_format (Optional[str], optional): The format of the HTML, as taken \
+                by `export_html`. Defaults to rich's format.
+            inline_styles (bool, optional): Inline the CSS of each span rather than \
+                using classes. Defaults to False.
+        """
+        assert self.record, "To export console contents set record=True"
+        with self._record_buffer_lock:
+            write_html(
+                self._record_buffer,
+                file,
+                CONSOLE_HTML_FORMAT if code_format is None else code_format,
+                theme,
+                inline_styles,
+            )
+            if clear:
+                del self._record_buffer[:]
+
+    def save_text(self, path: str, *, clear: bool = True, styles: bool = False) -> None:
+        """Write the recorded output to a text file, streamed with `stream_text`."""
+        with open(path, "wt", encoding="utf-8") as file:
+            self.stream_text(file, clear=clear, styles=styles)
+
+    def save_html(
+        self,
+        path: str,
+        *,
+        theme: Optional[TerminalTheme] = None,
+        clear: bool = True,
+        code_format: str = CONSOLE_HTML_FORMAT,
+        inline_styles: bool = False,
+    ) -> None:
+        """Write the recorded output to an HTML file, streamed with `stream_html`."""
+        with open(path, "wt", encoding="utf-8") as file:
+            self.stream_html(
+                file,
+                theme=theme,
+                clear=clear,
+                code_format=code_format,
+                inline_styles=inline_styles,
+            )
+
+    @property
+    def plain_output(self) -> bool:
+        """Whether output is written without styles and control codes, as when the \
+            console is not a terminal, so printing text only needs its characters."""
+        return (
+            self._color_system is None
+            and not self.record
+            and not self._render_hooks
+            and not self.is_jupyter
+        )
+
+    def print(  # pylint: disable=arguments-differ
+        self, *objects: Any, sep: str = " ", end: str = "\n", **kwargs: Any
+    ) -> None:
+        """Print to the console. Takes the arguments of `rich.console.Console.print`.
+
+        When output is plain, a line of strings and numbers that needs no wrapping, \
+            alignment or styles is written without building Text: only its markup \
+            tags and emoji codes are processed. Everything else is printed by rich.
+        """
+        if objects and end in ("\n", "") and self.plain_output:
+            text = self._plain_line(objects, sep, kwargs)
+            if text is not None:
+                with self:
+                    self._buffer.append(Segment(text + end))
+                return
+        super().print(*objects, sep=sep, end=end, **kwargs)
+
+    def _collect_renderables(  # pylint: disable=arguments-differ
+        self, objects: Iterable[Any], *args: Any, **kwargs: Any
+    ) -> List[ConsoleRenderable]:
+        # Rich joins Text before rendering it, so gradients are colored for this
+        # console here rather than for any console.
+        objects = [
+            obj.cached_text(self)
+            if isinstance(obj, Text) and hasattr(obj, "cached_text")
+            else obj
+            for obj in objects
+        ]
+        return super()._collect_renderables(objects, *args, **kwargs)
+
+    def _plain_line(
+        self, objects: Tuple[Any, ...], sep: str, kwargs: Dict[str, Any]
+    ) -> Optional[str]:
+        """Return the characters rich would print for `objects` on a single line, or \
+            None when they need the full pipeline."""
+        if kwargs.get("new_line_start") or any(
+            kwargs.get(name) is not None for name in PLAIN_UNSUPPORTED
+        ):
+            return None
+        markup = kwargs.get("markup")
+        markup = self._markup if markup is None else markup
+        emoji = kwargs.get("emoji")
+        emoji = self._emoji if emoji is None else emoji
+        parts = []
+        for obj in objects:
+            kind = type(obj)
+            if kind is str:
+                if markup and "[" in obj:
+                    obj = render_markup(
+                        obj, emoji=emoji, emoji_variant=self._emoji_variant
+                    ).plain
+                elif emoji and ":" in obj:
+                    obj = _emoji_replace(obj, default_variant=self._emoji_variant)
+            elif kind is int or kind is float:
+                obj = str(obj)
+            else:
+                return None
+            parts.append(obj)
+        text = sep.join(parts)
+        # Rules out newlines, tabs and control codes, which change the layout.
+        if not text.isprintable():
+            return None
+        soft_wrap = kwargs.get("soft_wrap")
+        if self.soft_wrap if soft_wrap is None else soft_wrap:
+            return text
+        size = len(text) if text.isascii() else cell_len(text)
+        return text if size <= self.width else None
+
+    @staticmethod
+    def cached(renderable: RenderableType, version: Hashable = None) -> Cached:
+        """Wrap a renderable so the Segments it renders to are cached and replayed \
+            while the console's width and color system stay the same.
+
+        Renderables with a `cache_key` method, such as Gradient, are cached by \
+            their key. Any other renderable is cached by its identity and \
+            `version`; pass a new version after changing it in place.
+
+        Args:
+            renderable (RenderableType): The renderable to cache.
+            version (Hashable, optional): The version of the renderable. Defaults \
+                to None.
+        """
+        return Cached(renderable, version)
+
+    @staticmethod
+    def configure_render_cache(
+        maxbytes: Optional[int] = SEGMENT_CACHE_BYTES, maxsize: int = 1024
+    ) -> None:
+        """Change the bounds of the cache of `cached` renderables. Its statistics \
+            are reported by `cache_stats` as "segments"."""
+        configure_segment_cache(maxbytes, maxsize)
+
+    @staticmethod
+    def cache_stats() -> Dict[str, CacheInfo]:
+        """Return the hit, miss, eviction and memory statistics of max's caches, \
+            such as the rendered gradient, segment and interned style caches, by \
+            name."""
+        return cache_stats()
+
     @staticmethod
     def max_console() -> Text:
         """Print out `MaxConsole` in a manual gradient"""
@@ -203,7 +873,40 @@ used as a drop in replacement for [bold #00ffff]rich.console.Console[/].\n\n"
         return combine_explanation
 
 
+_FLUSHER = BatchFlusher(MaxConsole._flush_batch)  # pylint: disable=protected-access
+
+
+def _flush_at_exit(console_ref: "ref[MaxConsole]") -> None:
+    """Write the output a console that is still alive has pending, at exit."""
+    console = console_ref()
+    if console is None:
+        return
+    try:
+        console.stop_writer()
+        console.flush()
+    except ValueError:  # The file was closed before the interpreter exited.
+        pass
+
+
+def _line_chunks(text: str, size: int) -> Iterator[str]:
+    """Split `text` into runs of whole lines of at most `size` characters, as \
+        rich does, except where a single line is longer."""
+    chunk: List[str] = []
+    length = 0
+    for line in text.splitlines(True):
+        if length + len(line) > size and chunk:
+            yield "".join(chunk)
+            chunk.clear()
+            length = 0
+        chunk.append(line)
+        length += len(line)
+    if chunk:
+        yield "".join(chunk)
+
+
 if __name__ == "__main__":
+    from rich.panel import Panel
+
     console = MaxConsole()
     explanation = console.gen_explanation()
     title = console.max_console()
@@ -1,33 +1,195 @@
 """This module contains the gradient class to automate the creation of gradient colored text."""
 # pylint: disable=redefined-outer-name, too-many-arguments
-from random import randint
-from typing import Optional
-
-from cheap_repr import normal_repr, register_repr
-from lorem_text import lorem
-from rich.console import ConsoleOptions, JustifyMethod, OverflowMethod, RenderResult
+import sys
+import warnings
+from bisect import bisect_right
+from types import ModuleType
+from typing import IO, Any, Hashable, Iterable, Iterator, List, Optional, Sequence
+
+from rich._pick import pick_bool
+from rich._wrap import divide_line
+from rich.cells import cell_len
+from rich.console import (
+    Console,
+    ConsoleOptions,
+    JustifyMethod,
+    OverflowMethod,
+    RenderResult,
+)
 from rich.containers import Lines
 from rich.control import strip_control_codes
-from rich.layout import Layout
-from rich.live import Live
-from rich.pretty import Pretty
+from rich.segment import Segment
 from rich.style import StyleType
-from rich.table import Column, Table
-from rich.text import Text
+from rich.text import Span, Text
 
+from max._cache import LRUCache, register_cache
+from max._engine import lookup, spans
 from max.color_index import ColorIndex
-from max.console import MaxConsole
+from max.console import MaxConsole, get_console
 from max.named_color import NamedColor
+from max.palette import Palette, get_palette
 
 DEFAULT_JUSTIFY: "JustifyMethod" = "default"
 DEFAULT_OVERFLOW: "OverflowMethod" = "fold"
+RENDER_CACHE_BYTES: int = 16 * 1024 * 1024
+SPAN_BYTES: int = 64
+
+
+def text_size(text: Text) -> int:
+    """Estimate the memory held by a rendered gradient in bytes."""
+    return sys.getsizeof(text.plain) + SPAN_BYTES * len(text.spans)
+
+
+CHUNK_SIZE: int = 64 * 1024
+StreamSource = str | IO[str] | Iterable[str]
+
+
+def read_chunks(source: StreamSource, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Yield the text of a stream in chunks, stripped of control codes.
+
+    Args:
+        source (str | IO[str] | Iterable[str]): The text, a file to read it from or \
+            an iterable of its pieces.
+        chunk_size (int, optional): The number of characters read at a time from \
+            strings and files. Defaults to 64 KiB.
+    """
+    if isinstance(source, str):
+        for start in range(0, len(source), chunk_size):
+            yield strip_control_codes(source[start : start + chunk_size])
+    elif hasattr(source, "read"):
+        while chunk := source.read(chunk_size):
+            yield strip_control_codes(chunk)
+    else:
+        for chunk in source:
+            yield strip_control_codes(chunk)
+
+
+def measure(source: StreamSource, chunk_size: int = CHUNK_SIZE) -> int:
+    """Count the characters of a string or seekable file without loading it whole.
+
+    Raises:
+        ValueError: The source is neither a string nor a seekable file.
+    """
+    if isinstance(source, str):
+        return sum(len(chunk) for chunk in read_chunks(source, chunk_size))
+    if hasattr(source, "seekable") and source.seekable():
+        position = source.tell()
+        size = sum(len(chunk) for chunk in read_chunks(source, chunk_size))
+        source.seek(position)
+        return size
+    raise ValueError("The size of a stream that cannot be rewound must be given.")
+
+
+RENDER_CACHE: LRUCache = register_cache(
+    "gradient",
+    LRUCache(maxsize=256, maxbytes=RENDER_CACHE_BYTES, sizeof=text_size),
+)
+
+
+class GradientText(Text):
+    """The rendered Text of a gradient, which renders itself straight to Segments.
+
+    Gradient spans are sorted, disjoint runs of interned styles, so wrapping and \
+        justification are computed once against the plain text and every line is \
+        cut from the runs directly, without dividing, copying and re-rendering a \
+        Text per line. Text that needs rich's general machinery - spans added by \
+        the caller, full justification, ellipsis or no-wrap overflow, tabs and wide \
+        characters - is rendered by `Text` as before.
+
+    Rich asks a gradient for its Text without saying which console it renders \
+        for, so that Text keeps every color. Rendered on a console that displays \
+        fewer, it renders the Text its gradient colors for that console instead.
+    """
+
+    direct: bool = True
+    source: Optional["Gradient"] = None
+
+    def can_render_directly(self, justify: str, overflow: str, no_wrap: bool) -> bool:
+        """Whether the direct renderer produces the same output as `Text`."""
+        plain = self.plain
+        return (
+            self.direct
+            and not self.style
+            and not no_wrap
+            and justify != "full"
+            and overflow in ("fold", "crop")
+            and "\t" not in plain
+            and cell_len(plain) == len(plain)
+        )
+
+    def __rich_console__(
+        self, console: MaxConsole, options: ConsoleOptions
+    ) -> RenderResult:
+        if self.source is not None:
+            text = self.source.cached_text(console)
+            if text is not self:
+                yield from text.__rich_console__(console, options)
+                return
+        justify = self.justify or options.justify or DEFAULT_JUSTIFY
+        overflow = self.overflow or options.overflow or DEFAULT_OVERFLOW
+        no_wrap = pick_bool(self.no_wrap, options.no_wrap, False)
+        if not self.can_render_directly(justify, overflow, no_wrap):
+            yield from super().__rich_console__(console, options)
+            return
+
+        width = options.max_width
+        plain = self.plain
+        runs = self._spans
+        run_starts = [span.start for span in runs]
+        newline = Segment("\n")
+        first_line = True
+        paragraph_start = 0
+        for paragraph in plain.split("\n"):
+            paragraph_end = paragraph_start + len(paragraph)
+            breaks = [
+                paragraph_start + offset
+                for offset in divide_line(paragraph, width, fold=overflow == "fold")
+            ]
+            for start, end in zip([paragraph_start, *breaks], [*breaks, paragraph_end]):
+                if end - start > width:
+                    trailing = len(plain[start:end]) - len(plain[start:end].rstrip())
+                    end -= min(trailing, end - start - width)
+                left = right = 0
+                if justify in ("center", "right"):
+                    end = start + len(plain[start:end].rstrip())
+                end = min(end, start + width)
+                if justify == "left":
+                    right = width - (end - start)
+                elif justify == "center":
+                    left = (width - (end - start)) // 2
+                    right = width - (end - start) - left
+                elif justify == "right":
+                    left = width - (end - start)
+
+                if not first_line:
+                    yield newline
+                first_line = False
+                if left > 0:
+                    yield Segment(" " * left)
+                cursor = start
+                index = max(0, bisect_right(run_starts, start) - 1)
+                while index < len(runs) and runs[index].start < end:
+                    run_start, run_end, style = runs[index]
+                    index += 1
+                    if run_end <= cursor:
+                        continue
+                    run_start = max(run_start, cursor)
+                    if run_start > cursor:
+                        yield Segment(plain[cursor:run_start])
+                    cursor = min(run_end, end)
+                    yield Segment(plain[run_start:cursor], style)
+                if cursor < end or right > 0:
+                    yield Segment(plain[cursor:end] + " " * max(right, 0))
+            paragraph_start = paragraph_end + 1
+        if self.end:
+            yield Segment(self.end)
 
 
 class Gradient(Text):
     """Print gradient colored text to the console.
         Args:
             console(`MaxConsole`): The rich console to print \
-                gradient text to. Defaults to MaxConsole().
+                gradient text to. Defaults to the shared console of `get_console`.
             text(`text): The text to print. Defaults to empty string. P
             start(`NamedColor | str | int`): The color to start the gradient.
             end(`NamedColor|str|int`): The color to end the gradient.
@@ -39,11 +201,10 @@ class Gradient(Text):
     """
 
     indexes: ColorIndex
+    palette: Palette
     colors: list[NamedColor]
-    console: MaxConsole
     invert: Optional[bool]
     title: Optional[str | Text]
-    _iter_index: int = 0
 
     def __init__(
         self,
@@ -54,7 +215,7 @@ class Gradient(Text):
         overflow: OverflowMethod = DEFAULT_OVERFLOW,
         invert: bool = False,
         length: int = 3,
-        console: MaxConsole = MaxConsole(),
+        console: Optional[MaxConsole] = None,
         title: str = "Gradient",
         style: StyleType = None,
         bold: bool = False,
@@ -65,12 +226,15 @@ class Gradient(Text):
         color_box: bool = False,
         *,
         verbose: bool = False,
+        palette: Optional[Palette | Sequence[Any]] = None,
     ) -> None:
         """Print gradient colored text to the console.
         Args:
             text(`text): The text to print. Defaults to empty string.
-            start(`Optional[NamedColor|str|int]`): The color to start the gradient.
-            end(`Optional[NamedColor|str|int]`): The color to end the gradient.
+            start(`Optional[NamedColor|str|int]`): The color to start the gradient. \
+                Colors outside the palette start from the nearest color of the palette.
+            end(`Optional[NamedColor|str|int]`): The color to end the gradient. \
+                Colors outside the palette end at the nearest color of the palette.
             justify(`JustifyMethod`): How to align the gradient text locally. Defaults \
                 to `default`.
             overflow(`OverflowMethod`): How to handle text that overflows the width of \
@@ -78,7 +242,7 @@ class Gradient(Text):
             invert(`bool): Reverse the color gradient. Defaults to False.
             length(`int`): The number of colors in the gradient. Defaults to `3`.
             console(`MaxConsole`): The rich console to print \
-                gradient text to. Defaults to MaxConsole().
+                gradient text to. Defaults to the shared console of `get_console`.
             title(`str|Text'): The optional title of the Gradient. Defaults to 'Gradient'
             style(`StyleType`) The style of the gradient text. Defaults to None.
             bold(`bool`): Whether to bold the gradient text. Defaults to False.
@@ -92,6 +256,8 @@ class Gradient(Text):
                 This makes the gradient's text invisible, but it useful for printing gradient \
                 samples. Defaults to False.
             verbose(`bool`): Whether to print verbose output. Defaults to False.
+            palette(`Optional[Palette|Sequence]`): The palette, or the colors of the \
+                palette, to build the gradient from. Defaults to the ten NamedColors.
         """
         if isinstance(text, Text):
             text = str(text)
@@ -103,8 +269,6 @@ class Gradient(Text):
         self.invert = bool(invert)
         self.length = length
         self.justify = justify
-        self.indexes = []
-        self.colors = []
         self.end = string_end
         self.title = title
         self.style = style
@@ -124,235 +288,331 @@ class Gradient(Text):
             if "italic" in style:
                 self.italic = True
 
-        if self.start_color in NamedColor.colors:
-            self.start_color = NamedColor.colors.index(self.start_color)
-        elif self.start_color in NamedColor.hex_colors:
-            self.start_color = NamedColor.hex_colors.index(self.start_color)
-        elif isinstance(self.start_color, NamedColor):
-            self.start_color = NamedColor(self.start_color).as_index()
-        elif isinstance(self.start_color, int):
-            if self.start_color not in list(range(0, 9)):
+        self.palette = get_palette(palette)
+        size = len(self.palette)
+        if isinstance(self.start_color, int):
+            if not 0 <= self.start_color < size:
                 raise ValueError(
-                    f"Invalid start index: {self.start_color}. Must be between 0 and 9."
+                    f"Invalid start index: {self.start_color}. "
+                    f"Must be between 0 and {size - 1}."
                 )
-        elif self.start_color is None:
-            pass
-        else:
-            raise TypeError(f"Invalid start type: {type(self.start_color)}")
+        elif self.start_color is not None:
+            self.start_color = self.palette.index_of(self.start_color)
 
         if not rainbow:
-            if self.end_color in NamedColor.colors:
-                self.end_color = NamedColor.colors.index(self.end_color)
-            elif self.end_color in NamedColor.hex_colors:
-                self.end_color = NamedColor.hex_colors.index(self.end_color)
-            elif isinstance(self.end_color, NamedColor):
-                self.end_color = NamedColor(self.end_color).as_index()
-            elif isinstance(self.end_color, int):
-                if self.end_color not in list(range(0, 9)):
+            if isinstance(self.end_color, int):
+                if not 0 <= self.end_color < size:
                     raise ValueError(
-                        f"Invalid end index: {self.end_color}. Must be between 0 and 9."
+                        f"Invalid end index: {self.end_color}. "
+                        f"Must be between 0 and {size - 1}."
                     )
-            elif self.end_color is None:
-                pass
-            else:
-                raise TypeError(f"Invalid end type: {type(self.end_color)}")
+            elif self.end_color is not None:
+                self.end_color = self.palette.index_of(self.end_color)
         else:
             if self.start_color is None:
                 self.start_color = 0
             if not invert:
-                self.end_color = self.start_color - 1
-                if self.end_color < 0:
-                    self.end_color += 10
+                self.end_color = (self.start_color - 1) % size
             else:
-                self.end_color = self.start_color + 1
-                if self.end_color > 9:
-                    self.end_color -= 10
-
-        if self.start_color is None and self.end_color is None:
-            self.generate_start_end()
-        elif self.start_color is None and self.end_color:
-            self.generate_start()
-        elif self.start_color and self.end_color is None:
-            self.generate_end()
-        else:
-            self.generate_index()
-
-        for index in self.indexes:
-            self.colors.append(NamedColor.colors[index])
-
-    def generate_start_end(self):
-        """Generate the start and end when only `length` is provided."""
-        self.start_color = randint(0, 9)
-        self.indexes = []
-        for index in range(self.length):
-            if not self.invert:
-                next_index = self.start_color + index
-            else:
-                next_index = self.start_color - index
-            if next_index < 0:
-                next_index += 10
-            if next_index > 9:
-                next_index -= 10
-            self.indexes.append(next_index)
-        self.end_color = self.indexes[-1]
-
-    def generate_start(self):
-        """Generate the start when only `end` is provided."""
-        for index in range(self.length):
-            if not self.invert:
-                next_index = self.end_color - index
-            else:
-                next_index = self.end_color + index
-            if index < 0:
-                next_index += 10
-            if index > 9:
-                next_index -= 10
-            self.indexes.append(next_index)
-
-    def generate_end(self):
-        """Generate the end when only `start` is provided."""
-        self.indexes = []
-        for index in range(self.length):
-            if not self.invert:
-                next_index = self.start_color + index
-            else:
-                next_index = self.start_color - index
-            if next_index < 0:
-                next_index += 10
-            if next_index > 9:
-                next_index -= 10
-            self.indexes.append(next_index)
-        self.end_color = self.indexes[-1]
-
-    def generate_index(self):
-        """Generate the index when both `start` and `end` are provided."""
-        if self.start_color is None and self.end_color is None:
-            self.generate_start_end()
-        elif self.start_color is None and self.end_color:
-            self.generate_start()
-        elif self.start_color and self.end_color is None:
-            self.generate_end()
-        else:
-            self.indexes = []
-            if not self.invert:
-                if self.start_color < self.end_color:
-                    self.length = (self.end_color + 1) - self.start_color
-                else:
-                    self.length = (10 - self.start_color) + self.end_color + 1
-            else:
-                if self.start_color > self.end_color:
-                    self.length = (self.start_color + 1) - self.end_color
-                else:
-                    self.length = (10 - self.end_color) + self.start_color + 1
-            for index in range(self.length):
-                if not self.invert:
-                    next_index = self.start_color + index
-                else:
-                    next_index = self.start_color - index
-                if next_index < 0:
-                    next_index += 10
-                if next_index > 9:
-                    next_index -= 10
-                self.indexes.append(next_index)
-            assert next_index == self.end_color, f"{next_index} != {self.end_color}"
+                self.end_color = (self.start_color + 1) % size
+
+        self.indexes = ColorIndex(
+            self.start_color, self.end_color, invert, length, palette=self.palette
+        )
+        self.start_color = self.indexes.start
+        self.end_color = self.indexes.end
+        self.length = len(self.indexes)
+        self.colors = [self.palette.names[index] for index in self.indexes]
 
     def __getitem__(self, index):
-        if index >= len(self.indexes):
-            raise IndexError("ColorIndex index out of range")
         return self.indexes[index]
 
     def __iter__(self):
-        self._iter_index = 0
-        return self
-
-    def __next__(self):
-        if self._iter_index >= len(self.indexes):
-            raise StopIteration
-        value = self.indexes[self._iter_index]
-        self._iter_index += 1
-        return value
+        return iter(self.indexes)
 
     def __str__(self):
         return self.text
 
     def __repr__(self) -> str:
         # return f"Gradient<{', '.join([str(color) for color in self.colors])}>, Text<{self.text}>"
+        from rich.pretty import Pretty  # pylint: disable=import-outside-toplevel
+
         return f"Gradient<{Pretty(self)}>"
 
     def __len__(self) -> int:
         return len(self.text)
 
-    def as_text(self) -> Text:
-        """Return the gradient as a Text object."""
+    @classmethod
+    def configure_cache(
+        cls, maxbytes: Optional[int] = RENDER_CACHE_BYTES, maxsize: int = 256
+    ) -> None:
+        """Change the bounds of the cache of rendered gradients.
+
+        Args:
+            maxbytes (Optional[int], optional): The approximate memory budget of the \
+                cache in bytes, or None for no budget. Defaults to 16 MiB.
+            maxsize (int, optional): The maximum number of cached gradients. \
+                Defaults to 256.
+        """
+        RENDER_CACHE.resize(maxsize, maxbytes)
+
+    @property
+    def console(self) -> MaxConsole:
+        """The console the gradient is printed to. The shared console of \
+            `get_console` is created the first time it is needed."""
+        if self._console is None:
+            self._console = get_console()
+        return self._console
+
+    @console.setter
+    def console(self, console: Optional[MaxConsole]) -> None:
+        self._console = console
+
+    def cache_key(self, console: Optional[Console] = None) -> Hashable:
+        """The key of the gradient in the render cache. It holds every attribute \
+            the rendered Text depends on, so changing any of them renders afresh.
+
+        Args:
+            console (Optional[Console], optional): The console the gradient is \
+                rendered for. Defaults to the gradient's console.
+        """
+        return self._cache_key(self.coalesce_color_system(console))
+
+    def _cache_key(self, color_system: Optional[str]) -> Hashable:
+        return (
+            self.text,
+            self.palette,
+            self.indexes,
+            self.length,
+            self.invert,
+            self.bold,
+            self.italic,
+            self.underline,
+            self.color_box,
+            self.justify,
+            self.overflow,
+            self.end,
+            self.style,
+            tuple(self.spans),
+            color_system,
+        )
+
+    def cached_text(self, console: Optional[Console] = None) -> Text:
+        """Return the memoized Text of the gradient, rendering it on a cache miss.
+
+        The returned Text is shared with the cache and must not be modified.
+
+        Args:
+            console (Optional[Console], optional): The console the gradient is \
+                rendered for. Defaults to the gradient's console.
+        """
+        return self._cached_text(self.coalesce_color_system(console))
+
+    def _cached_text(self, color_system: Optional[str]) -> Text:
+        key = self._cache_key(color_system)
+        text = RENDER_CACHE.get(key)
+        if text is None:
+            text = self._render_text(color_system)
+            RENDER_CACHE.set(key, text)
+        return text
+
+    def as_text(self, console: Optional[Console] = None) -> Text:
+        """Return the gradient as a Text object, colored for `console`, which \
+            defaults to the gradient's console."""
+        return self.cached_text(console).copy()
+
+    def render_text(self, console: Optional[Console] = None) -> Text:
+        """Render the gradient as a Text object for `console`, which defaults to \
+            the gradient's console, bypassing the render cache."""
+        return self._render_text(self.coalesce_color_system(console))
+
+    def _render_text(self, color_system: Optional[str]) -> Text:
         size = len(self.text)
-        number_of_gradients = int(self.length - 1)
+        number_of_gradients = self.blends(size)
         gradient_size = int(size // number_of_gradients)
-        gradient_text = Text()
+        parts: List[str] = []
+        gradient_spans: List[Span] = []
 
         for index in range(number_of_gradients):
             next_index = index + 1
             begin = index * gradient_size
             end = begin + gradient_size
             if index == number_of_gradients - 1:
-                substring = Text(self.text[begin:])
+                substring = self.text[begin:]
             else:
-                substring = Text(self.text[begin:end])
-
-            if index < (self.length - 1):
-                color1 = self.colors[index]
-                red1, green1, blue1 = tuple(NamedColor(color1).as_rgb())
-                color2 = self.colors[next_index]
-                red2, green2, blue2 = tuple(NamedColor(color2).as_rgb())
-                delta_red = red2 - red1
-                delta_green = green2 - green1
-                delta_blue = blue2 - blue1
-
-            for char_index in range(len(substring)):
-                blend = char_index / gradient_size
-                color = f"#{int(red1 + delta_red * blend):02X}\
-{int(green1 + delta_green * blend):02X}{int(blue1 + delta_blue * blend):02X}"
-                if self.color_box:
-                    new_style = f"{color} on {color}"
-                else:
-                    if self.bold:
-                        bold = "bold "
-                    else:
-                        bold = ""
-                    if self.underline:
-                        underline = "underline "
-                    else:
-                        underline = ""
-                    if self.italic:
-                        italic = "italic "
-                    else:
-                        italic = ""
-                    new_style = f"{bold}{underline}{italic} {color}"
-                    if "  " in new_style:
-                        new_style = new_style.replace("  ", " ")
-                    new_style = new_style.strip()
-                substring.stylize(new_style, char_index, char_index + 1)
+                substring = self.text[begin:end]
+
+            table = self.palette.table(self.indexes[index], self.indexes[next_index])
+            channels = lookup(table, len(substring), gradient_size)
+            substring_spans = spans(
+                channels,
+                begin,
+                bold=self.bold,
+                underline=self.underline,
+                italic=self.italic,
+                color_box=self.color_box,
+                color_system=color_system,
+            )
 
             if self.verbose:
-                console.log(f"Gradient {index}:", substring)
-
-            gradient_text = Text.assemble(
-                gradient_text,
-                substring,
-                justify=self.justify,
-                overflow=self.overflow,
-                end=self.end_color,
-            )
+                self.console.log(
+                    f"Gradient {index}:",
+                    Text(
+                        substring, spans=[span.move(-begin) for span in substring_spans]
+                    ),
+                )
+
+            parts.append(substring)
+            gradient_spans.extend(substring_spans)
+        gradient_text = GradientText(
+            "".join(parts),
+            justify=self.justify,
+            overflow=self.overflow,
+            end=self.end,
+            tab_size=8,
+            spans=gradient_spans + self.spans,
+        )
+        gradient_text.direct = not self.spans
+        gradient_text.source = self
         return gradient_text
 
-    def __rich__(self) -> RenderResult:
-        """Rich representation of a gradient object."""
-        return self.as_text()
+    def blends(self, size: int) -> int:
+        """The number of blends from one color to the next across `size` characters.
+
+        Text shorter than the gradient blends through its first colors only, so \
+            every blend spans at least one character.
+        """
+        return max(1, min(self.length - 1, size))
+
+    def coalesce_color_system(self, console: Optional[Console] = None) -> Optional[str]:
+        """The color system used to coalesce neighbouring characters whose colors \
+            are displayed identically by the console the gradient is rendered for.
+
+        Recording consoles keep every distinct color for export, as do consoles \
+            that print no color, since the gradient may still be printed elsewhere.
+
+        Args:
+            console (Optional[Console], optional): The console the gradient is \
+                rendered for. Defaults to the gradient's console.
+        """
+        console = self.console if console is None else console
+        if console.record or console.color_system is None:
+            return "truecolor"
+        return console.color_system
+
+    def iter_segments(
+        self,
+        source: StreamSource,
+        size: Optional[int] = None,
+        chunk_size: int = CHUNK_SIZE,
+        console: Optional[Console] = None,
+    ) -> Iterable[Segment]:
+        """Render a stream of text with the gradient, one chunk at a time.
+
+        The color of each character is computed from its offset in the whole \
+            stream, so the result matches rendering the text in one go while only \
+            one chunk is held in memory.
+
+        Args:
+            source (str | IO[str] | Iterable[str]): The text, a file to read it from \
+                or an iterable of its pieces.
+            size (Optional[int], optional): The number of characters in the stream. \
+                May be omitted for strings and seekable files, which are measured \
+                with an extra pass. Defaults to None.
+            chunk_size (int, optional): The number of characters read at a time. \
+                Defaults to 64 KiB.
+            console (Optional[Console], optional): The console the segments are \
+                printed to. Defaults to the gradient's console.
+
+        Yields:
+            Segment: The styled pieces of the text.
+        """
+        if size is None:
+            size = measure(source, chunk_size)
+        number_of_gradients = self.blends(size)
+        # A stream longer than its declared size still has a color per character.
+        gradient_size = max(1, size // number_of_gradients)
+        last = number_of_gradients - 1
+        color_system = self.coalesce_color_system(console)
+        offset = 0
+        for chunk in read_chunks(source, chunk_size):
+            position = 0
+            while position < len(chunk):
+                index = min((offset + position) // gradient_size, last)
+                first = offset + position - index * gradient_size
+                count = len(chunk) - position
+                if index < last:
+                    count = min(count, gradient_size - first)
+                piece = chunk[position : position + count]
+                table = self.palette.table(self.indexes[index], self.indexes[index + 1])
+                channels = lookup(table, count, gradient_size, first)
+                cursor = 0
+                for span in spans(
+                    channels,
+                    bold=self.bold,
+                    underline=self.underline,
+                    italic=self.italic,
+                    color_box=self.color_box,
+                    color_system=color_system,
+                ):
+                    if span.start > cursor:
+                        yield Segment(piece[cursor : span.start])
+                    yield Segment(piece[span.start : span.end], span.style)
+                    cursor = span.end
+                if cursor < count:
+                    yield Segment(piece[cursor:])
+                position += count
+            offset += len(chunk)
+
+    def stream(
+        self,
+        source: StreamSource,
+        file: Optional[IO[str]] = None,
+        size: Optional[int] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> int:
+        """Write a stream of text colored by the gradient to a file with constant \
+            memory, such as piping a multi-GB dump through the colorizer.
+
+        Args:
+            source (str | IO[str] | Iterable[str]): The text, a file to read it from \
+                or an iterable of its pieces.
+            file (Optional[IO[str]], optional): The file to write to. Defaults to \
+                the file of the gradient's console.
+            size (Optional[int], optional): The number of characters in the stream. \
+                May be omitted for strings and seekable files. Defaults to None.
+            chunk_size (int, optional): The number of characters read at a time. \
+                Defaults to 64 KiB.
+
+        Returns:
+            int: The number of characters of text written.
+        """
+        file = self.console.file if file is None else file
+        color_system = self.console._color_system  # pylint: disable=protected-access
+        written = 0
+        for text, style, _ in self.iter_segments(source, size, chunk_size):
+            written += len(text)
+            if style is not None:
+                text = style.render(text, color_system=color_system)
+            file.write(text)
+        file.flush()
+        return written
+
+    def __rich__(self) -> Text:
+        """Rich representation of a gradient object.
+
+        Rich asks for it without saying which console it renders for, so every \
+            distinct color is kept and the console downgrades them as it prints. \
+            MaxConsole colors gradients for itself before this is asked for.
+        """
+        return self._cached_text("truecolor")
 
     def __rich_console__(
-        self, console: MaxConsole, options: ConsoleOptions
+        self, console: Console, options: ConsoleOptions
     ) -> RenderResult:
-        """Rich representation of a gradient object."""
-        yield self.as_text()
+        """Rich representation of a gradient object, colored for the console it is \
+            rendered to."""
+        yield self.cached_text(console)
 
     def __call__(self) -> Text:
         """Return the gradient as a Text object."""
@@ -363,9 +623,11 @@ class Gradient(Text):
         width: int,
         justify: JustifyMethod = DEFAULT_JUSTIFY,
         overflow: OverflowMethod = DEFAULT_OVERFLOW,
-        console: MaxConsole = MaxConsole(),
+        console: Optional[MaxConsole] = None,
     ) -> Lines:
         """Wrap the gradient to a given width."""
+        if console is None:
+            console = get_console()
         if width > console.options.max_width:
             msg = f"Entered width ({width}) is greater than the console width"
             msg = f"{msg} ({console.options.max_width})."
@@ -376,7 +638,29 @@ class Gradient(Text):
             )
 
 
+class GradientModule(ModuleType):
+    """The `max.gradient` module, which takes the place of the deprecated \
+        `max.gradient` helper once imported and so is callable as it."""
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Text:
+        warnings.warn(
+            "max.gradient() is deprecated, use max.make_gradient() instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        # pylint: disable=import-outside-toplevel
+        from max import make_gradient
+
+        return make_gradient(*args, **kwargs)
+
+
+sys.modules[__name__].__class__ = GradientModule
+
 if __name__ == "__main__":  # pragma: no cover
+    from cheap_repr import normal_repr, register_repr
+    from lorem_text import lorem
+    from rich.table import Table
+
     console = MaxConsole()
     lorem_ipsum: str = lorem.paragraphs(3)
     register_repr(Gradient)(normal_repr)
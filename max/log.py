@@ -5,7 +5,7 @@ from pathlib import Path
 
 from loguru import logger as log
 
-from max.console import MaxConsole
+from max.console import get_console
 
 CWD = Path.cwd()
 LOGS = CWD / "logs"
@@ -20,12 +20,10 @@ RICH_ERROR_LOG_FORMAT = "[bold #0088ff]{time:YYYY-MM-DD HH:mm:ss.SSS}[/]|\
 [bold #ff8800] Line {line:^5}[/]|[bold #ff8800] {message}[/]"
 SNOOP_LOGGING = "True"
 
-console = MaxConsole()
-
 log.remove()
 log.add(sink=LOG, level="DEBUG", format=FORMAT, diagnose=True, backtrace=True)
 log.add(
-    sink=lambda msg: console.log(
+    sink=lambda msg: get_console().log(
         msg, justify="left", style="logging.level.info", highlight=True
     ),
     level="INFO",
@@ -34,7 +32,7 @@ log.add(
     backtrace=True,
 )
 log.add(
-    sink=lambda msg: console.log(
+    sink=lambda msg: get_console().log(
         msg, justify="left", style="logging.level.error", highlight=True
     ),
     level="ERROR",
@@ -43,11 +41,16 @@ log.add(
     backtrace=True,
     catch=True,
 )
-console.clear()
-console.line(2)
 log.debug("Initialized logging")
 
 
+def setup_console() -> None:
+    """Clear the shared console and leave two blank lines above the log output."""
+    console = get_console()
+    console.clear()
+    console.line(2)
+
+
 def debug(*, entry=True, exit=True, level="DEBUG"):
     """Log the entry and exit of a function."""
 
@@ -69,3 +72,8 @@ def debug(*, entry=True, exit=True, level="DEBUG"):
         return wrapped
 
     return wrapper
+
+
+if __name__ == "__main__":  # pragma: no cover
+    setup_console()
+    log.info("Logging to the console and {}", LOG)
@@ -1,25 +1,30 @@
 """Description: A class to represent a named color."""
 # pylint: disable=W0611:unused-import
 import re
-import sys
-from functools import lru_cache
 from pathlib import Path
-from random import choice, randint
-from time import sleep
-from typing import Any, Optional, Tuple
-
-from cheap_repr import normal_repr, register_repr
-from rich import inspect
-from rich.box import ROUNDED
-from rich.columns import Columns
-from rich.console import NewLine
-from rich.table import Table
+from random import randint
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from rich.color import Color, ColorParseError
+from rich.style import Style
 from rich.text import Text
-from snoop import snoop
 
-from max.console import MaxConsole
+from max._color_system import (
+    SYSTEMS,
+    RGBSequence,
+    cell,
+    downgrade,
+    downgrade_many,
+    hex_to_rgb_many,
+    nearest_many,
+    nearest_table,
+    rgb_to_hex_many,
+)
+from max._engine import get_style
+from max.console import MaxConsole, get_console
 
-# from snoop import snoop
+if TYPE_CHECKING:  # pragma: no cover
+    from rich.table import Table
 
 
 class ColorParsingError(ValueError):
@@ -40,8 +45,6 @@ VERBOSE = CWD / "logs" / "verbose.log"
 HEX_RE_STR = r"^\#([0-9a-fA-F]{6})$|^ ([0-9a-fA-F]{6})$"
 HEX_PATTERN = re.compile(HEX_RE_STR, re.MULTILINE)
 
-console = MaxConsole()
-
 
 def colorful_class(on_white: bool = False) -> Text:
     """Print the word "NamedColor" in a rainbow of colors.
@@ -100,14 +103,25 @@ def format_rgb(rgb: Tuple[int, int, int]) -> Text:
 # ============================================================================ #
 
 
-# lru_cache(maxsize=10)
+class NamedColor:
+    """Ten colors that span the spectrum to create gradients from.
 
+    NamedColor is a flyweight: there is exactly one instance of each color, \
+        created with the class and returned by every construction that resolves \
+        to it, so constructing one in a render loop is a dictionary lookup.
 
-class NamedColor:
-    """Ten colors that span the spectrum to create gradients from."""
+    Any other hex code, RGB tuple, rich color name or rich Color is mapped to the \
+        nearest of the ten colors through a precomputed table.
+
+    Args:
+        color_input (Any): The name, hex code, RGB tuple or index of a color, \
+            any color rich can parse, another NamedColor, or None for a random \
+            color.
+    """
 
-    value: Optional[str] = "magenta"
-    _original: Any
+    __slots__ = ("value", "index", "__weakref__")
+    value: str
+    index: int
     indexes: Tuple[int, ...] = (0, 1, 2, 3, 4, 5, 6, 7, 8, 9)
     colors: tuple[str] = (
         "magenta",
@@ -145,55 +159,99 @@ class NamedColor:
         (255, 136, 0),  # orange
         (255, 0, 0),  # red
     )
+    _instances: Tuple["NamedColor", ...] = ()
+    _lookup: Dict[Any, "NamedColor"] = {}
+    _nearest_table: bytes = b""
+
+    def __new__(cls, color_input: Any = None) -> "NamedColor":
+        try:
+            instance = cls._lookup.get(color_input)
+        except TypeError:
+            instance = None
+        if instance is None:
+            return cls._parse(color_input)
+        return instance
 
-    # @snoop(watch_explode=("self", "color_input"))
-    def __init__(self, color_input: Any) -> None:
-        self.value = color_input
-        self._original = color_input
-        # Parse NamedColor from inputs
+    @classmethod
+    def _parse(cls, color_input: Any) -> "NamedColor":
+        """Resolve the inputs that are not keys of the lookup table, or raise the \
+            error describing why they are not a named color."""
+        if isinstance(color_input, tuple) and not isinstance(color_input, Color):
+            if len(color_input) == 3:
+                red, green, blue = color_input
+                # pylint: disable=unidiomatic-typecheck
+                if type(red) is int and type(green) is int and type(blue) is int:
+                    if 0 <= red <= 255 and 0 <= green <= 255 and 0 <= blue <= 255:
+                        return cls.nearest(color_input)
+            raise InvalidRGBColor(f"{color_input} is not an RGB color.")
+        if isinstance(color_input, NamedColor):
+            return color_input
+        if color_input is None:
+            return cls._instances[randint(0, 9)]
         if isinstance(color_input, str):
-            if color_input in self.colors:
-                self.value = color_input
-                self._original = color_input
-
-            # HEX Colors
-            elif HEX_PATTERN.match(color_input):
-                try:
-                    index = self.hex_colors.index(color_input)
-                    self.value = self.colors[index]
-                    self._original = color_input
-                except InvalidHexColor as ihc:
-                    raise InvalidHexColor("Unable to parse hex color", ihc) from ihc
-        # RGB Tuple
-        elif isinstance(color_input, tuple):
+            if HEX_PATTERN.match(color_input):
+                return cls.nearest(cls.hex_to_rgb(color_input.strip()))
             try:
-                index = self.rgb_tuples.index(color_input)
-                self.value = self.colors[index]
-                self._original = color_input
-            except InvalidRGBColor as irc:
-                raise InvalidRGBColor("Unable to parse RGB color", irc) from irc
-
-        # Index
-        elif isinstance(color_input, int):
-            if color_input in list(range(0, 10)):
-                self.value = self.colors[color_input]
-                self._original = color_input
-            else:
-                raise ValueError(
-                    f"Color Index must be between zero and nine. Input: {color_input}"
+                color_input = Color.parse(color_input)
+            except ColorParseError as error:
+                raise ColorParsingError(
+                    "invalid_named_color", f"{color_input} is not a color."
+                ) from error
+        if isinstance(color_input, Color):
+            if color_input.is_default:
+                raise ColorParsingError(
+                    "invalid_named_color", "The default color is not a named color."
                 )
+            return cls.nearest(color_input.get_truecolor())
+        if isinstance(color_input, int):
+            raise ValueError(
+                f"Color Index must be between zero and nine. Input: {color_input}"
+            )
+        raise ColorParsingError(
+            "invalid_named_color", f"{color_input} is not a named color."
+        )
 
-        # NamedColor
-        elif isinstance(color_input, NamedColor):
-            self.value = color_input.value
-            self._original = color_input._original
+    @classmethod
+    def _intern(cls) -> None:
+        """Create the instance of every color and the table that maps each name, \
+            hex code, RGB tuple and index to it."""
+        instances = []
+        for index, name in enumerate(cls.colors):
+            instance = object.__new__(cls)
+            instance.value = name
+            instance.index = index
+            instances.append(instance)
+            for key in (name, cls.hex_colors[index], cls.rgb_tuples[index], index):
+                cls._lookup[key] = instance
+        cls._instances = tuple(instances)
 
-        elif color_input is None:
-            return None
-        else:
-            raise ColorParsingError(
-                "invalid_named_color", f"{color_input} is not a named color."
-            )
+    @classmethod
+    def nearest(cls, rgb: Tuple[int, int, int]) -> "NamedColor":
+        """Return the NamedColor nearest to an RGB color, as found for the center \
+            of its cell of a 32×32×32 quantized RGB cube."""
+        if not cls._nearest_table:
+            cls._nearest_table = nearest_table(cls.rgb_tuples)
+        return cls._instances[cls._nearest_table[cell(rgb)]]
+
+    @classmethod
+    def from_colors(cls, colors: Iterable[Any]) -> List["NamedColor"]:
+        """Map a sequence of colors onto NamedColors at once.
+
+        Args:
+            colors (Iterable[Any]): Any inputs accepted by NamedColor, or a numpy \
+                array of RGB colors with shape (n, 3), which is mapped without a \
+                Python loop over its colors.
+
+        Returns:
+            List[NamedColor]: The NamedColor of each color.
+        """
+        instances = cls._instances
+        if hasattr(colors, "ndim") and colors.ndim == 2:
+            return [instances[index] for index in nearest_many(colors, cls.rgb_tuples)]
+        return [cls(color) for color in colors]
+
+    def __reduce__(self) -> Tuple[type, Tuple[str]]:
+        return (NamedColor, (self.value,))
 
     @classmethod
     def get_all_colors(cls) -> set[dict[str, int | str | tuple]]:
@@ -205,8 +263,10 @@ class NamedColor:
         )"""
         return list(zip((cls.colors, cls.indexes, cls.hex_colors, cls.rgb_tuples)))
 
-    def named_color_table(self) -> Table:
+    def named_color_table(self) -> "Table":
         """Generate a table to display the named colors."""
+        from rich.table import Table  # pylint: disable=import-outside-toplevel
+
         table = Table(
             f"{'Color':<12}",
             f"{'Index':^7}",
@@ -238,85 +298,17 @@ class NamedColor:
                     style=f"bold #000000 on {color['hex']}",
                 )
 
-    @lru_cache(maxsize=10)
-    # @snoop
     def as_index(self) -> int:
-        """Retrieve the index of a color given its name."""
-        match self.value:
-            case "magenta":
-                return 0
-            case "light_purple":
-                return 1
-            case "purple":
-                return 2
-            case "blue":
-                return 3
-            case "light_blue":
-                return 4
-            case "cyan":
-                return 5
-            case "green":
-                return 6
-            case "yellow":
-                return 7
-            case "orange":
-                return 8
-            case "red":
-                return 9
-            case None:
-                return randint(0, 9)
-            case _:
-                raise ValueError(f"Unable to convert NamedColor({self}) to an integer")
-
-    @lru_cache(maxsize=10)
+        """Retrieve the index of the NamedColor."""
+        return self.index
+
     def as_hex(self) -> str:
         """Returns the Hex string of the NamedColor."""
-        match self.value:
-            case "magenta":
-                return "#ff00ff"
-            case "light_purple":
-                return "#af00ff"
-            case "purple":
-                return "#5f00ff"
-            case "blue":
-                return "#0000ff"
-            case "light_blue":
-                return "#0088ff"
-            case "cyan":
-                return "#00ffff"
-            case "green":
-                return "#00ff00"
-            case "yellow":
-                return "#ffff00"
-            case "orange":
-                return "#ff8800"
-            case "red":
-                return "#ff0000"
-
-    @lru_cache(maxsize=10)
+        return self.hex_colors[self.index]
+
     def as_rgb(self) -> Tuple[int, int, int]:
         """Returns the RGB Tuple of the Named Color."""
-        match self.value:
-            case "magenta":
-                return (255, 0, 255)
-            case "light_purple":
-                return (175, 0, 255)
-            case "purple":
-                return (95, 0, 255)
-            case "blue":
-                return (0, 0, 255)
-            case "light_blue":
-                return (0, 136, 255)
-            case "cyan":
-                return (0, 255, 255)
-            case "green":
-                return (0, 255, 0)
-            case "yellow":
-                return (255, 255, 0)
-            case "orange":
-                return (255, 128, 0)
-            case "red":
-                return (255, 0, 0)
+        return self.rgb_tuples[self.index]
 
     def as_formatted_rgb(self) -> Text:
         """Return a formatted colorized string to represent the tuple."""
@@ -335,10 +327,13 @@ class NamedColor:
         return self.value
 
     def __rich__(self):
-        """Return whatever input was given to instantiate the\
-            NamedColor object via rich's console protocol."""
+        """Display the name, index, hex code and RGB tuple of the NamedColor via \
+            rich's console protocol."""
+        # pylint: disable=import-outside-toplevel
+        from rich.box import ROUNDED
+        from rich.table import Table
+
         index = self.as_index()
-        original_input = str(self._original)
 
         table = Table(
             title=f"{colorful_class()}[bold {self.as_hex()}]: {str(self.value).capitalize()}[/]",
@@ -349,32 +344,38 @@ class NamedColor:
             collapse_padding=True,
         )
 
-        table.add_column(f"[{self.as_style()}]Original Color[/]", justify="center")
+        table.add_column(f"[{self.as_style()}]Name[/]", justify="center")
         table.add_column(f"[{self.as_style()}] Index[/]", justify="center")
         table.add_column(f"[{self.as_style()}]HEX[/]", justify="center")
         table.add_column(f"[{self.as_style()}]RGB[/]", justify="center")
         if index in [1, 2, 3, 4, 9]:
             table.add_row(
-                f"[bold {self.as_hex()}]{str(original_input).capitalize()}[/]",
+                f"[bold {self.as_hex()}]{self.value.capitalize()}[/]",
                 f"[bold #ffffff]{index:^7}[/]",
                 f"[bold #ffffff on {self.as_hex()}]{self.as_hex()}[/]",
                 self.as_formatted_rgb(),
             )
         else:
             table.add_row(
-                f"[bold {self.as_hex()}]{str(original_input).capitalize()}[/]",
+                f"[bold {self.as_hex()}]{self.value.capitalize()}[/]",
                 f"[bold #ffffff]{index:^7}[/]",
                 f"[bold #000000 on {self.as_hex()}]{self.as_hex():^7}[/]",
                 self.as_formatted_rgb(),
             )
         return table
 
-    def as_style(self) -> str:
-        """Returns the Style string of the NamedColor"""
+    def as_style(self, bold: bool = True) -> Style:
+        """Returns the interned Style of the NamedColor: white or black text on the \
+            color.
+
+        Args:
+            bold (bool, optional): Whether the text is bold. Defaults to True.
+        """
         if self.as_index() in [1, 2, 3, 4, 9]:
-            return f"bold #ffffff on {self.as_hex()}"
-        elif self.as_index() in [0, 5, 6, 7, 8]:
-            return f"bold #000000 on {self.as_hex()}"
+            foreground = (255, 255, 255)
+        else:
+            foreground = (0, 0, 0)
+        return get_style(foreground, bold=bold, bgcolor=self.hex_to_rgb(self.as_hex()))
 
     @classmethod
     def hex_to_rgb(cls, hex_value: str) -> Tuple:
@@ -400,7 +401,49 @@ class NamedColor:
         """Convert an rgb color to hex."""
         r_value, g_value, b_value = rgb
 
-        return f"{r_value:X}{g_value:X}{b_value:X}"
+        return f"{r_value:02X}{g_value:02X}{b_value:02X}"
+
+    @classmethod
+    def rgb_to_256(cls, rgb: Tuple[int, int, int]) -> int:
+        """Convert an rgb color to the number of the 256-color terminal color it is \
+            displayed as."""
+        return downgrade(tuple(rgb), SYSTEMS["256"])
+
+    @classmethod
+    def rgb_to_16(cls, rgb: Tuple[int, int, int]) -> int:
+        """Convert an rgb color to the number of the 16-color terminal color it is \
+            displayed as."""
+        return downgrade(tuple(rgb), SYSTEMS["standard"])
+
+    @classmethod
+    def hex_to_rgb_many(cls, hex_values: Iterable[str]) -> List[Tuple[int, int, int]]:
+        """Convert many hex colors to rgb at once, as `hex_to_rgb` would."""
+        return hex_to_rgb_many(hex_values)
+
+    @classmethod
+    def rgb_to_hex_many(cls, colors: RGBSequence) -> List[str]:
+        """Convert many rgb colors to hex at once, as `rgb_to_hex` would.
+
+        Args:
+            colors (RGBSequence): A sequence of RGB tuples, packed `bytes` or \
+                `array('B')` with three bytes per color, or a numpy array of \
+                shape (n, 3).
+        """
+        return rgb_to_hex_many(colors)
+
+    @classmethod
+    def rgb_to_256_many(cls, colors: RGBSequence) -> bytes:
+        """Convert many rgb colors, in any form `rgb_to_hex_many` accepts, to \
+            256-color numbers at once, as `rgb_to_256` would. Returns one byte per \
+            color."""
+        return downgrade_many(colors, "256")
+
+    @classmethod
+    def rgb_to_16_many(cls, colors: RGBSequence) -> bytes:
+        """Convert many rgb colors, in any form `rgb_to_hex_many` accepts, to \
+            16-color numbers at once, as `rgb_to_16` would. Returns one byte per \
+            color."""
+        return downgrade_many(colors, "standard")
 
     @staticmethod
     def colorful_class(on_white: bool = False) -> Text:
@@ -442,15 +485,24 @@ class NamedColor:
         return named_color
 
 
+NamedColor._intern()  # pylint: disable=protected-access
+
+
 def print_color_tables(
-    as_columns: bool = False, example_console: MaxConsole = console
+    as_columns: bool = False, example_console: Optional[MaxConsole] = None
 ) -> None:
     """A demo of the NamedColor class.
 
     Args:
         as_columns (bool, optional): Whether to print the colors as columns. Defaults to False.
-        example_console (MaxConsole, optional): The console to print to. Defaults to console.
+        example_console (MaxConsole, optional): The console to print to. Defaults to \
+            the shared console of `get_console`.
     """
+    # pylint: disable=import-outside-toplevel
+    from cheap_repr import normal_repr, register_repr
+    from rich.columns import Columns
+    from rich.console import NewLine
+
     explanation = Text("NamedColor is a class that allows you to use named ")
     explanation_parts = [
         "colors in your code. The following colors are the NamedColors that ",
@@ -459,7 +511,8 @@ def print_color_tables(
     ]
     for part in explanation_parts:
         explanation = Text.assemble(explanation, part)
-    explanation = explanation.wrap(console=example_console, width=100, justify="left")
+    console = get_console() if example_console is None else example_console
+    explanation = explanation.wrap(console=console, width=100, justify="left")
     console.clear()
     console.line(2)
     console.rule(title=f"{colorful_class(on_white=False)}", style="bold #ff00ff")
@@ -0,0 +1,281 @@
+"""User-defined palettes of colors to build gradients from."""
+import threading
+from random import randint
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+from rich.color import Color, ColorParseError
+from rich.style import Style
+from rich.text import Text
+
+from max._color_system import RGB, nearest, pack_rgb
+from max._engine import GradientTable, get_style, interpolation_table
+from max.named_color import (
+    HEX_PATTERN,
+    ColorParsingError,
+    InvalidRGBColor,
+    NamedColor,
+)
+
+MIN_COLORS: int = 4
+MAX_COLORS: int = 64
+BLACK: RGB = (0, 0, 0)
+WHITE: RGB = (255, 255, 255)
+
+Key = Tuple[Tuple[RGB, ...], Tuple[str, ...], Tuple[RGB, ...]]
+_palettes: Dict[Key, "Palette"] = {}
+_aliases: Dict[Any, "Palette"] = {}
+_palettes_lock = threading.Lock()
+
+
+def to_rgb(color: Any) -> RGB:
+    """Return the exact RGB color of a NamedColor, hex code, RGB tuple, rich color \
+        name or rich Color.
+
+    Raises:
+        InvalidRGBColor: A tuple is not three integers from 0 to 255.
+        ColorParsingError: The color could not be parsed.
+    """
+    if isinstance(color, (tuple, list)) and not isinstance(color, Color):
+        color = tuple(color)
+        if len(color) == 3 and all(
+            type(channel) is int and 0 <= channel <= 255  # pylint: disable=C0123
+            for channel in color
+        ):
+            return color
+        raise InvalidRGBColor(f"{color} is not an RGB color.")
+    if isinstance(color, NamedColor):
+        return color.as_rgb()
+    if isinstance(color, str):
+        if color in NamedColor.colors:
+            return NamedColor(color).as_rgb()
+        if HEX_PATTERN.match(color):
+            return NamedColor.hex_to_rgb(color.strip())
+        try:
+            color = Color.parse(color)
+        except ColorParseError as error:
+            raise ColorParsingError(
+                "invalid_palette_color", f"{color} is not a color."
+            ) from error
+    if isinstance(color, Color) and not color.is_default:
+        return tuple(color.get_truecolor())
+    raise ColorParsingError("invalid_palette_color", f"{color} is not a color.")
+
+
+def contrast(rgb: RGB) -> RGB:
+    """Return black or white, whichever is more legible on `rgb`."""
+
+    def linear(channel: int) -> float:
+        value = channel / 255
+        return value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+
+    red, green, blue = (linear(channel) for channel in rgb)
+    luminance = 0.2126 * red + 0.7152 * green + 0.0722 * blue
+    return BLACK if (luminance + 0.05) ** 2 > 0.0525 else WHITE
+
+
+class Palette(Sequence):
+    """An immutable palette of 4 to 64 colors to build gradients from.
+
+    A palette is compiled once per process: its colors are parsed and packed into \
+        bytes, their Styles interned and the tables of each blend built the first \
+        time a gradient uses it. Constructing an equal palette again returns the \
+        compiled one, so gradients may be given their colors in a render loop.
+
+    Args:
+        colors (Sequence[Any]): The colors of the palette, in gradient order. Each \
+            may be a NamedColor, hex code, RGB tuple, rich color name or rich Color.
+        names (Optional[Sequence[str]]): The name of each color. Defaults to their \
+            hex codes.
+        foregrounds (Optional[Sequence[Tuple[int, int, int]]]): The color of text \
+            printed on each color. Defaults to black or white, whichever contrasts \
+            more.
+    """
+
+    __slots__ = ("rgb", "names", "foregrounds", "packed", "hex", "styles", "_index")
+    rgb: Tuple[RGB, ...]
+    names: Tuple[str, ...]
+    foregrounds: Tuple[RGB, ...]
+    packed: bytes
+    hex: Tuple[str, ...]
+    styles: Tuple[Style, ...]
+    _index: Dict[Any, int]
+
+    def __new__(
+        cls,
+        colors: Sequence[Any],
+        names: Optional[Sequence[str]] = None,
+        foregrounds: Optional[Sequence[RGB]] = None,
+    ) -> "Palette":
+        if isinstance(colors, Palette) and names is None and foregrounds is None:
+            return colors
+        colors = tuple(colors)
+        names = None if names is None else tuple(names)
+        foregrounds = None if foregrounds is None else tuple(map(tuple, foregrounds))
+        alias = (colors, names, foregrounds)
+        try:
+            palette = _aliases.get(alias)
+        except TypeError:
+            alias = palette = None
+        if palette is None:
+            palette = cls._intern(colors, names, foregrounds)
+            if alias is not None:
+                _aliases[alias] = palette
+        return palette
+
+    @classmethod
+    def _intern(
+        cls,
+        colors: Tuple[Any, ...],
+        names: Optional[Tuple[str, ...]],
+        foregrounds: Optional[Tuple[RGB, ...]],
+    ) -> "Palette":
+        """Parse the colors of a palette and return its compiled palette."""
+        rgb = tuple(to_rgb(color) for color in colors)
+        if not MIN_COLORS <= len(rgb) <= MAX_COLORS:
+            raise ValueError(
+                f"A palette must have {MIN_COLORS} to {MAX_COLORS} colors, "
+                f"not {len(rgb)}."
+            )
+        hex_colors = tuple(
+            f"#{code.lower()}" for code in NamedColor.rgb_to_hex_many(rgb)
+        )
+        names = hex_colors if names is None else names
+        foregrounds = (
+            tuple(contrast(color) for color in rgb)
+            if foregrounds is None
+            else tuple(to_rgb(color) for color in foregrounds)
+        )
+        key = (rgb, names, foregrounds)
+        if not len(names) == len(foregrounds) == len(rgb):
+            raise ValueError("A palette needs one name and foreground per color.")
+        palette = _palettes.get(key)
+        if palette is None:
+            with _palettes_lock:
+                palette = _palettes.get(key)
+                if palette is None:
+                    palette = _palettes[key] = cls._compile(key, hex_colors)
+        return palette
+
+    @classmethod
+    def _compile(cls, key: Key, hex_colors: Tuple[str, ...]) -> "Palette":
+        rgb, names, foregrounds = key
+        palette = object.__new__(cls)
+        compiled = {
+            "rgb": rgb,
+            "names": names,
+            "foregrounds": foregrounds,
+            "packed": pack_rgb(rgb),
+            "hex": hex_colors,
+            "styles": tuple(get_style(color) for color in rgb),
+            "_index": {
+                alias: index
+                for index, aliases in reversed(list(enumerate(zip(names, rgb))))
+                for alias in aliases
+            },
+        }
+        for name, value in compiled.items():
+            object.__setattr__(palette, name, value)
+        return palette
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self) -> Tuple[Any, Key]:
+        return (Palette, (self.rgb, self.names, self.foregrounds))
+
+    def __len__(self) -> int:
+        return len(self.rgb)
+
+    def __getitem__(self, index: Any) -> Any:
+        return self.rgb[index]
+
+    def __iter__(self) -> Iterator[RGB]:
+        return iter(self.rgb)
+
+    def __repr__(self) -> str:
+        return f"Palette({list(self.names)!r})"
+
+    def index_of(self, color: Any) -> int:
+        """Return the index of a color in the palette.
+
+        Args:
+            color (Any): An index, the name of a color of the palette, or any \
+                color, which is mapped to the nearest color of the palette.
+
+        Raises:
+            ValueError: An index is outside the palette.
+        """
+        if isinstance(color, int):
+            if not 0 <= color < len(self.rgb):
+                raise ValueError(
+                    f"Invalid index: {color}. Must be between 0 and {len(self.rgb) - 1}."
+                )
+            return color
+        if isinstance(color, (str, tuple)) and color in self._index:
+            return self._index[color]
+        rgb = to_rgb(color)
+        index = self._index.get(rgb)
+        return nearest(rgb, self.rgb) if index is None else index
+
+    def random_index(self) -> int:
+        """Return the index of a random color of the palette."""
+        return randint(0, len(self.rgb) - 1)
+
+    def table(
+        self, start: int, end: int, resolution: Optional[int] = None
+    ) -> GradientTable:
+        """Return the interpolation table of the blend between two colors.
+
+        Args:
+            start (int): The index of the color the blend starts from.
+            end (int): The index of the color the blend ends at.
+            resolution (Optional[int], optional): The number of steps in the \
+                table. Defaults to the resolution of the engine.
+        """
+        return interpolation_table(self.rgb[start], self.rgb[end], resolution)
+
+    def style(  # pylint: disable=too-many-arguments
+        self,
+        index: int,
+        bold: bool = False,
+        italic: bool = False,
+        underline: bool = False,
+        color_box: bool = False,
+    ) -> Style:
+        """Return the interned Style of text in a color of the palette."""
+        return get_style(self.rgb[index], bold, italic, underline, color_box)
+
+    def label_style(self, index: int, bold: bool = True) -> Style:
+        """Return the interned Style of text printed on a color of the palette."""
+        return get_style(self.foregrounds[index], bold=bold, bgcolor=self.rgb[index])
+
+    def __rich__(self) -> Text:
+        return Text(" ").join(
+            Text(f" {name} ", style=self.label_style(index))
+            for index, name in enumerate(self.names)
+        )
+
+
+DEFAULT_PALETTE = Palette(
+    NamedColor.rgb_tuples,
+    NamedColor.colors,
+    tuple(
+        tuple(NamedColor(name).as_style().color.triplet) for name in NamedColor.colors
+    ),
+)
+
+
+def get_palette(palette: Optional[Palette | Sequence[Any]] = None) -> Palette:
+    """Return the compiled palette of a sequence of colors, or the palette of the \
+        ten NamedColors when `palette` is None."""
+    if palette is None:
+        return DEFAULT_PALETTE
+    return Palette(palette)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    from max.console import MaxConsole
+
+    console = MaxConsole()
+    console.print(DEFAULT_PALETTE)
+    console.print(Palette(["#1d3557", "#457b9d", "#a8dadc", "#f1faee", "#e63946"]))
@@ -1,12 +1,7 @@
 """This module defines a custom progress bar for the max console."""
 import threading
-import time
-from random import randint
 from typing import Dict, Optional, Sequence, Tuple
 
-from rich.panel import Panel
-
-# from rich import inspect
 from rich.progress import (
     BarColumn,
     MofNCompleteColumn,
@@ -18,15 +13,11 @@ from rich.progress import (
     TimeElapsedColumn,
     TimeRemainingColumn,
 )
-from rich.rule import Rule
 from rich.style import Style
-from rich.syntax import Syntax
-from rich.table import Column, Table
+from rich.table import Column
 from rich.text import Text
 
-from max.console import MaxConsole, RenderableType
-
-console = MaxConsole()
+from max.console import MaxConsole, RenderableType, get_console
 
 
 class MaxProgressColumn(ProgressColumn):
@@ -83,12 +74,12 @@ class MaxProgress(Progress):
     """
 
     columns: Sequence[MaxProgressColumn]
-    progress_console: MaxConsole = MaxConsole()
+    progress_console: Optional[MaxConsole] = None
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        if not self.progress_console:
-            self.progress_console = MaxConsole()
+        if self.progress_console is None:
+            self.progress_console = get_console()
         if not self.columns:
             self.columns = self.get_default_columns()
         if self.expand is None:
@@ -146,6 +137,15 @@ class MaxProgress(Progress):
 
 
 if __name__ == "__main__":  # pragma: no coverage
+    import time
+    from random import randint
+
+    from rich.panel import Panel
+    from rich.rule import Rule
+    from rich.syntax import Syntax
+    from rich.table import Table
+
+    console = get_console()
     console.clear()
     syntax = Syntax(
         '''def loop_last(values: Iterable[T]) -> Iterable[Tuple[bool, T]]:
@@ -1,18 +1,17 @@
 """A gradient rule line for MaxConsole"""
 
-from random import randint
-from typing import Optional
+from typing import Any, Optional, Sequence
 
 from rich.align import AlignMethod
 from rich.cells import cell_len, set_cell_size
-from rich.console import RenderResult, console
+from rich.console import Console, ConsoleOptions, RenderResult
 from rich.errors import MissingStyle
 from rich.style import Style
 from rich.text import Text
 
 from max.console import MaxConsole
 from max.gradient import Gradient
-from max.named_color import NamedColor
+from max.palette import Palette, get_palette
 
 
 class GradientRule:  # pylint: disable=too-few-public-methods
@@ -25,6 +24,8 @@ class GradientRule:  # pylint: disable=too-few-public-methods
         align (str, optional): How to align the title, one of "left", "center", \
 or "right". Defaults to "center".
         thick (bool, optional): Draw a rule that is as think as possible. Defaults to False.
+        palette (Optional[Palette | Sequence]): The palette, or the colors of the \
+palette, to draw the rule from. Defaults to the ten NamedColors.
     """
 
     def __init__(
@@ -37,6 +38,7 @@ or "right". Defaults to "center".
         end: str = "\n",
         align: AlignMethod = "center",
         thick: bool = False,
+        palette: Optional[Palette | Sequence[Any]] = None,
     ) -> None:
         if cell_len(characters) < 1:
             raise ValueError(
@@ -53,22 +55,29 @@ or "right". Defaults to "center".
         self.end = end
         self.align = align
         self.thick = thick
+        self.palette = get_palette(palette)
 
     def __repr__(self) -> str:
         return f"GradientRule({self.title!r}, {self.characters!r})"
 
-    def __rich__(self) -> RenderResult:
-        width = console.options.max_width
+    def __rich_console__(
+        self, console: Console, options: ConsoleOptions
+    ) -> RenderResult:
+        yield self.render(console, options)
+
+    def render(self, console: Console, options: ConsoleOptions) -> Text:
+        """Render the rule as a Text object as wide as `options.max_width`."""
+        width = options.max_width
 
         characters = (
             "-"
-            if (console.options.ascii_only and not self.characters.isascii())
+            if (options.ascii_only and not self.characters.isascii())
             else self.characters
         )
 
         chars_len = cell_len(characters)
         if not self.title:
-            return self._rule_line(chars_len, width)
+            return self._rule_line(console, chars_len, width)
 
         if isinstance(self.title, Text):
             title_text = self.title
@@ -78,7 +87,7 @@ or "right". Defaults to "center".
                 title_text = Text(self.title, style=self.style)
         else:
             if self.gradient_title:
-                title_text = Gradient(self.title, bold=True).as_text()
+                title_text = self.gradient(console, self.title, bold=True)
             else:
                 title_text = Text(self.title, style=self.style)
 
@@ -88,46 +97,48 @@ or "right". Defaults to "center".
         required_space = 4 if self.align == "center" else 2
         truncate_width = max(0, width - required_space)
         if not truncate_width:
-            return self._rule_line(chars_len, width)
+            return self._rule_line(console, chars_len, width)
 
         rule_text = Text(end=self.end)
         if self.align == "center":
             title_text.truncate(truncate_width, overflow="ellipsis")
             side_width = (width - cell_len(title_text.plain)) // 2
 
-            center_index = randint(0, 9)
-            center_color = NamedColor(center_index)
-            left_index = center_index - 2
-            if left_index < 0:
-                left_index += 10
-            left_color = NamedColor(left_index)
-            right_index = center_index + 2
-            if right_index > 9:
-                right_index -= 10
-            right_color = NamedColor(right_index)
+            size = len(self.palette)
+            center_color = self.palette.random_index()
+            left_color = (center_color - 2) % size
+            right_color = (center_color + 2) % size
             left_str = characters * (side_width // chars_len + 1)
             if not self.thick:
-                left = Gradient(left_str, left_color, center_color, bold=True).as_text()
+                left = self.gradient(
+                    console, left_str, left_color, center_color, bold=True
+                )
             else:
-                left = Gradient(
-                    left_str, left_color, center_color, color_box=True
-                ).as_text()
+                left = self.gradient(
+                    console, left_str, left_color, center_color, color_box=True
+                )
             left.truncate(side_width - 1)
             right_length = width - cell_len(left.plain) - cell_len(title_text.plain)
             right_str = characters * (side_width // chars_len + 1)
             if not self.thick:
-                right = Gradient(
-                    right_str, center_color, right_color, bold=True
-                ).as_text()
+                right = self.gradient(
+                    console, right_str, center_color, right_color, bold=True
+                )
             else:
-                right = Gradient(
-                    right_str, center_color, right_color, color_box=True, bold=True
-                ).as_text()
+                right = self.gradient(
+                    console,
+                    right_str,
+                    center_color,
+                    right_color,
+                    color_box=True,
+                    bold=True,
+                )
             right.truncate(right_length)
             rule_text.append_text(left)
             if self.thick:
-                space = Text(" ", style=f"style.{center_color}")
-                title_text.stylize(f"style.{center_color}")
+                center_style = self.palette.label_style(center_color, bold=False)
+                space = Text(" ", style=center_style)
+                title_text.stylize(center_style)
                 rule_text.append_text(space)
                 rule_text.append_text(title_text)
                 rule_text.append_text(space)
@@ -138,50 +149,52 @@ or "right". Defaults to "center".
             rule_text.append_text(right)
             rule_text.truncate(width)
         elif self.align == "left":
-            _start_index = randint(0, 9)
-            _start_color = NamedColor(_start_index)
+            _start_color = self.palette.random_index()
+            _start_style = self.palette.label_style(_start_color, bold=False)
             title_text.truncate(truncate_width, overflow="ellipsis")
             rule_str = characters * ((width - rule_text.cell_len) + 2)
             if self.thick:
-                title_text.stylize(f"style.{_start_color}")
+                title_text.stylize(_start_style)
                 rule_text.append(title_text)
-                rule_text.append(Text(" ", style=f"style.{_start_color}"))
-                rule = Gradient(
-                    rule_str, start=_start_color, color_box=True, bold=True
-                ).as_text()
+                rule_text.append(Text(" ", style=_start_style))
+                rule = self.gradient(
+                    console, rule_str, start=_start_color, color_box=True, bold=True
+                )
                 rule_text.append(rule)
                 rule_text.truncate(width)
             else:
                 rule_text.append(title_text)
                 rule_text.append(" ")
-                rule = Gradient(rule_str, bold=True).as_text()
+                rule = self.gradient(console, rule_str, bold=True)
                 rule_text.append(rule)
                 rule_text.truncate(width)
         elif self.align == "right":
-            _start_index = randint(0, 9)
-            _start_color = NamedColor(_start_index)
-            _end_index = _start_index + 2
-            if _end_index > 9:
-                _end_index -= 10
-            _end_color = NamedColor(_end_index)
+            _start_color = self.palette.random_index()
+            _end_color = (_start_color + 2) % len(self.palette)
+            _end_style = self.palette.label_style(_end_color, bold=False)
             title_text.truncate(truncate_width, overflow="ellipsis")
-            rule_str = characters * (width - title_text.cell_len - 1)
+            rule_width = max(0, width - title_text.cell_len - 1)
+            rule_str = characters * (rule_width // chars_len)
+            # Cells that wide characters cannot fill widen the gap before the
+            # title, so it stays flush right.
+            gap = " " * (1 + rule_width - cell_len(rule_str))
             if self.thick:
-                title_text.stylize(f"style.{_end_color}")
-                space = Text(" ", style=f"style.{_end_color}")
-                rule = Gradient(
+                title_text.stylize(_end_style)
+                space = Text(gap, style=_end_style)
+                rule = self.gradient(
+                    console,
                     rule_str,
                     start=_start_color,
                     end=_end_color,
                     color_box=True,
                     bold=True,
-                ).as_text()
+                )
                 rule_text.append(rule)
                 rule_text.append(space)
                 rule_text.append(title_text)
             else:
-                space = Text(" ")
-                rule = Gradient(rule_str, bold=True).as_text()
+                space = Text(gap)
+                rule = self.gradient(console, rule_str, bold=True)
                 rule_text.append(rule)
                 rule_text.append(space)
                 rule_text.append(title_text)
@@ -189,12 +202,17 @@ or "right". Defaults to "center".
         rule_text.plain = set_cell_size(rule_text.plain, width)
         return rule_text
 
-    def _rule_line(self, chars_len: int, width: int) -> Text:
+    def gradient(self, console: Console, text: str, *args: Any, **kwargs: Any) -> Text:
+        """Return `text` as a Text colored for `console` by a gradient of the \
+            rule's palette."""
+        return Gradient(text, *args, palette=self.palette, **kwargs).as_text(console)
+
+    def _rule_line(self, console: Console, chars_len: int, width: int) -> Text:
         rule_str = self.characters * ((width // chars_len) + 3)
         if not self.thick:
-            rule_text = Gradient(rule_str, bold=True).as_text()
+            rule_text = self.gradient(console, rule_str, bold=True)
         else:
-            rule_text = Gradient(rule_str, color_box=True).as_text()
+            rule_text = self.gradient(console, rule_str, color_box=True)
         rule_text.truncate(width)
         rule_text.plain = set_cell_size(rule_text.plain, width)
         return rule_text
@@ -0,0 +1,99 @@
+"""Tests of max._cache."""
+import io
+
+import pytest
+
+import max.console
+import max.gradient
+from max._cache import CACHES, LRUCache, cache_stats, register_cache
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    cache = LRUCache(maxsize=3)
+    for key in "abc":
+        cache.set(key, key.upper())
+    assert cache.get("a") == "A"
+    cache.set("d", "D")
+    assert "b" not in cache
+    assert [key for key in "acd" if key in cache] == ["a", "c", "d"]
+    cache.set("c", "C2")
+    cache.set("e", "E")
+    assert "a" not in cache and cache.get("c") == "C2"
+
+
+def test_counters():
+    cache = LRUCache(maxsize=2)
+    assert cache.get("a") is None
+    assert cache.get_or_create("a", lambda: 1) == 1
+    assert cache.get_or_create("a", lambda: 2) == 1
+    cache.set("b", 2)
+    cache.set("c", 3)
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions) == (1, 2, 1)
+    assert (info.maxsize, info.currsize) == (2, 2)
+    assert info.hit_rate == pytest.approx(1 / 3)
+    cache.clear()
+    assert cache.info()[:3] == (0, 0, 0) and not len(cache)
+
+
+def test_resize_evicts_to_fit():
+    cache = LRUCache(maxsize=4)
+    for key in range(4):
+        cache.set(key, key)
+    cache.resize(2)
+    assert len(cache) == 2 and 2 in cache and 3 in cache
+    assert cache.info().evictions == 2
+    with pytest.raises(ValueError):
+        cache.resize(0)
+    with pytest.raises(ValueError):
+        cache.resize(2, maxbytes=100)
+
+
+def test_discard_where_is_not_an_eviction():
+    cache = LRUCache(maxsize=8)
+    for key in range(6):
+        cache.set(key, key)
+    assert cache.discard_where(lambda key: key % 2) == 3
+    assert sorted(key for key in range(6) if key in cache) == [0, 2, 4]
+    assert cache.info().evictions == 0
+
+
+def test_registered_caches_are_reported():
+    cache = register_cache("test", LRUCache())
+    try:
+        cache.get("missing")
+        assert cache_stats()["test"].misses == 1
+        assert {"style", "gradient", "segments", "highlight"} <= set(cache_stats())
+    finally:
+        del CACHES["test"]
+
+
+def test_byte_budget():
+    cache = LRUCache(maxsize=100, maxbytes=10, sizeof=len)
+    cache.set("a", "xxxx")
+    cache.set("b", "xxxx")
+    assert cache.info().currbytes == 8
+    cache.set("c", "xxxx")
+    assert "a" not in cache and cache.info().currbytes == 8
+    cache.set("b", "x")
+    assert cache.info().currbytes == 5
+    # A value larger than the whole budget is not cached at all.
+    cache.set("d", "x" * 11)
+    assert "d" not in cache and len(cache) == 2
+    cache.resize(100, maxbytes=4)
+    assert [key for key in "bc" if key in cache] == ["b"]
+    assert cache.info().evictions == 2
+    with pytest.raises(ValueError):
+        LRUCache(maxbytes=10)
+
+
+def test_rendered_gradients_are_memoized():
+    console = max.console.MaxConsole(
+        file=io.StringIO(), color_system="truecolor", register=False
+    )
+    gradient = max.gradient.Gradient("memoized", "red", "blue")
+    text = gradient.cached_text(console)
+    assert max.gradient.Gradient("memoized", "red", "blue").cached_text(console) is text
+    assert gradient.as_text(console) is not text
+    assert gradient.as_text(console).spans == text.spans
+    assert max.gradient.RENDER_CACHE.info().currbytes >= len(text)
@@ -0,0 +1,53 @@
+"""Tests of max.color_index."""
+import pickle
+
+import pytest
+
+from max.color_index import ColorIndex
+
+
+def test_equal_indexes_are_interned():
+    assert ColorIndex(2, 6) is ColorIndex(2, 6)
+    assert ColorIndex(12, 16) is ColorIndex(2, 6)
+    assert ColorIndex(2, 6) is not ColorIndex(2, 6, True)
+    assert ColorIndex(2, length=4, modulus=16) is not ColorIndex(2, length=4)
+    assert pickle.loads(pickle.dumps(ColorIndex(2, 6))) is ColorIndex(2, 6)
+    with pytest.raises(AttributeError):
+        ColorIndex(2, 6).start = 3
+
+
+def test_iteration_and_indexing():
+    index = ColorIndex(2, 6)
+    assert list(index) == [2, 3, 4, 5, 6]
+    assert len(index) == 5
+    assert (index[0], index[-1], index.end) == (2, 6, 6)
+    with pytest.raises(IndexError):
+        index[5]  # pylint: disable=pointless-statement
+    assert list(ColorIndex(5, 2, True)) == [5, 4, 3, 2]
+
+
+def test_wrap_around():
+    assert list(ColorIndex(8, 1)) == [8, 9, 0, 1]
+    assert list(ColorIndex(1, 8, True)) == [1, 0, 9, 8]
+    assert list(ColorIndex(3, 3)) == [3, 4, 5, 6, 7, 8, 9, 0, 1, 2, 3]
+    assert list(ColorIndex(14, 2, modulus=16)) == [14, 15, 0, 1, 2]
+
+
+def test_slicing():
+    index = ColorIndex(8, 3)
+    assert index[1:4] is ColorIndex(9, 1)
+    assert list(index[::2]) == list(index)[::2]
+    assert list(index[::-1]) == list(index)[::-1]
+    assert list(index[10:]) == []
+
+
+def test_start_or_end_only():
+    assert list(ColorIndex(end=1, length=4)) == [8, 9, 0, 1]
+    assert list(ColorIndex(end=8, invert=True, length=3)) == [0, 9, 8]
+    assert list(ColorIndex(7, length=4)) == [7, 8, 9, 0]
+    random = ColorIndex(length=6)
+    assert len(random) == 6 and 0 <= random.start < 10
+
+
+def test_title_is_still_accepted_in_its_place():
+    assert ColorIndex(0, 5, False, 3, "Title") is ColorIndex(0, 5)
@@ -0,0 +1,90 @@
+"""Tests of max._color_system."""
+import random
+from array import array
+
+import pytest
+
+from rich.color import Color, ColorSystem
+
+from max import _color_system
+from max._color_system import (
+    DOWNSAMPLED,
+    SYSTEMS,
+    DownsampleTable,
+    downgrade,
+    downgrade_many,
+    downsample,
+    pack_rgb,
+)
+from max.named_color import NamedColor
+
+
+def test_downsample_tables_match_rich():
+    rng = random.Random(0)
+    colors = [tuple(rng.randrange(256) for _ in range(3)) for _ in range(20_000)]
+    for color_system in DOWNSAMPLED:
+        system = SYSTEMS[color_system]
+        for rgb in colors:
+            expected = Color.from_rgb(*rgb).downgrade(system).number
+            assert downsample(rgb, color_system) == expected, (rgb, color_system)
+
+
+def test_downsample_table_without_numpy_holds_only_built_pages(monkeypatch):
+    monkeypatch.setattr(_color_system, "np", None)
+    table = DownsampleTable("256")
+    assert table.table is None
+    assert not any(table.pages)
+    assert table[(12, 200, 99)] == downgrade((12, 200, 99), ColorSystem.EIGHT_BIT)
+    table.page(12)
+    assert [len(page) for page in table.pages].count(65536) == 1
+    for rgb in ((12, 0, 0), (12, 255, 255), (12, 128, 7)):
+        assert table[rgb] == downgrade(rgb, ColorSystem.EIGHT_BIT)
+
+
+def sample_colors() -> list:
+    """Return random colors and the corners of the RGB cube."""
+    rng = random.Random(1)
+    colors = [tuple(rng.randrange(256) for _ in range(3)) for _ in range(2_000)]
+    return colors + [(0, 0, 0), (255, 255, 255), (255, 0, 0), (0, 255, 255)]
+
+
+def check_bulk_conversions(colors: list) -> None:
+    """Check every bulk conversion of `colors`, in each accepted form, against \
+        the scalar conversions."""
+    packed = bytes(channel for rgb in colors for channel in rgb)
+    forms = [colors, packed, bytearray(packed), array("B", packed), memoryview(packed)]
+    forms.append(array("H", list(packed)))
+    if _color_system.np is not None:
+        forms.append(_color_system.np.array(colors))
+    hex_colors = [NamedColor.rgb_to_hex(rgb) for rgb in colors]
+    numbers_256 = bytes(NamedColor.rgb_to_256(rgb) for rgb in colors)
+    numbers_16 = bytes(NamedColor.rgb_to_16(rgb) for rgb in colors)
+    for form in forms:
+        assert NamedColor.rgb_to_hex_many(form) == hex_colors
+        assert NamedColor.rgb_to_256_many(form) == numbers_256
+        assert NamedColor.rgb_to_16_many(form) == numbers_16
+        assert downgrade_many(form, "256") == numbers_256
+    assert NamedColor.hex_to_rgb_many(hex_colors) == colors
+    assert NamedColor.hex_to_rgb_many(f"#{code}" for code in hex_colors) == colors
+    assert colors == [NamedColor.hex_to_rgb(code) for code in hex_colors]
+
+
+def test_bulk_conversions_match_the_scalar_ones():
+    check_bulk_conversions(sample_colors())
+
+
+def test_bulk_conversions_without_numpy(monkeypatch):
+    monkeypatch.setattr(_color_system, "np", None)
+    check_bulk_conversions(sample_colors())
+
+
+def test_packing_rejects_channels_out_of_range():
+    with pytest.raises(ValueError):
+        pack_rgb(array("H", [1, 2, 300]))
+    with pytest.raises(ValueError):
+        pack_rgb([(1, 2, 300)])
+    assert pack_rgb(array("H", [1, 2, 3])) == b"\x01\x02\x03"
+    if _color_system.np is not None:
+        for channels in ([[300, 2, 3]], [[-1, 2, 3]]):
+            with pytest.raises(ValueError):
+                pack_rgb(_color_system.np.array(channels))
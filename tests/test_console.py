@@ -0,0 +1,287 @@
+"""Tests of max.console."""
+import asyncio
+import gc
+import io
+import random
+import sys
+import threading
+import time
+import weakref
+
+from rich.console import Console
+from rich.style import Style
+from rich.text import Text
+from rich.theme import Theme
+
+from max import console as console_module
+from max._color_system import SYSTEMS
+from max._theme import MaxTheme
+from max.bench import dashboard
+from max.console import MaxConsole, get_console
+from max.gradient import Gradient
+
+PLAIN_SAMPLES = (
+    (("Processed record 42 in 0.125s",), {}),
+    (("Processed [bold]42[/bold] records",), {}),
+    (("[link=https://example.com]docs[/link] \\[escaped]",), {}),
+    ((":rocket: launched :smile:",), {}),
+    ((":rocket: [red]launched[/]",), {"emoji": False}),
+    (("[bold]literal[/bold]",), {"markup": False}),
+    (("worker", 3, 0.125, True, None), {}),
+    (("worker", 3, 0.125), {"sep": " | ", "end": ""}),
+    (("x" * 79,), {}),
+    (("x" * 81,), {}),
+    (("x" * 200,), {"soft_wrap": True}),
+    (("全角の文字" * 8,), {}),
+    (("tab\tseparated",), {}),
+    (("two\nlines",), {}),
+    (("",), {}),
+    ((), {}),
+    (("centered",), {"justify": "center"}),
+    (("styled",), {"style": "bold red"}),
+    (("trailing   ",), {}),
+)
+
+
+def test_consoles_of_the_standard_streams_are_shared():
+    assert get_console() is MaxConsole() is get_console()
+    assert get_console(stderr=True) is MaxConsole(stderr=True)
+    assert MaxConsole(register=False) is not get_console()
+
+
+def test_each_console_builds_its_own_theme():
+    assert "theme" not in vars(MaxConsole)
+    theme = Theme({"accent": "bold red"})
+    themed = MaxConsole(file=io.StringIO(), theme=theme, register=False)
+    assert themed.theme is theme
+    assert themed.get_style("accent") == Style.parse("bold red")
+    console = MaxConsole(file=io.StringIO(), register=False)
+    assert isinstance(console.theme, MaxTheme)
+    assert console.theme is not MaxConsole(file=io.StringIO(), register=False).theme
+
+
+def test_consoles_of_a_file_are_shared_while_in_use():
+    file = io.StringIO()
+    console = MaxConsole(file=file, width=80)
+    assert MaxConsole(file=file, width=80) is console
+    assert get_console(file, width=80) is console
+    assert MaxConsole(file=file, width=80, register=False) is not console
+    assert MaxConsole(file=io.StringIO(), width=80) is not console
+
+
+def test_registry_does_not_keep_file_consoles_alive():
+    excepthook = sys.excepthook
+    file = io.StringIO()
+    console = weakref.ref(MaxConsole(file=file))
+    released = weakref.ref(file)
+    # The rich traceback hook the console installed is the only other holder.
+    sys.excepthook = excepthook
+    del file
+    gc.collect()
+    assert console() is None
+    assert released() is None
+
+
+def test_writer_policies_keep_output_in_order():
+    count = 2_000
+    for policy in ("block", "drop-oldest", "drop-newest"):
+        file = io.StringIO()
+        console = MaxConsole(
+            file=file, width=80, color_system=None, traceback=False, register=False
+        )
+        console.start_writer(maxsize=8, policy=policy)
+
+        async def produce(console: MaxConsole = console) -> None:
+            await asyncio.gather(*(console.aprint(index) for index in range(count)))
+
+        asyncio.run(produce())
+        console.stop_writer()
+        written = [int(line) for line in file.getvalue().split()]
+        assert written == sorted(set(written)), policy
+        if policy == "block":
+            assert len(written) == count
+        assert console.writer_stats() is None
+
+
+def test_cached_renderables_print_the_same():
+    for color_system in (*SYSTEMS, "truecolor"):
+        outputs = []
+        for cached in (False, True):
+            console = MaxConsole(
+                file=io.StringIO(),
+                width=100,
+                color_system=color_system,
+                force_terminal=True,
+                traceback=False,
+                register=False,
+            )
+            random.seed(0)
+            frame = dashboard()
+            for _ in range(2):
+                random.seed(1)
+                for renderable in frame:
+                    console.print(console.cached(renderable) if cached else renderable)
+            outputs.append(console.file.getvalue())
+        assert outputs[0] == outputs[1], color_system
+
+
+def test_plain_fast_path_prints_like_rich():
+    for objects, kwargs in PLAIN_SAMPLES:
+        outputs = []
+        for print_ in (MaxConsole.print, Console.print):
+            console = MaxConsole(
+                file=io.StringIO(), width=80, traceback=False, register=False
+            )
+            print_(console, *objects, **kwargs)
+            outputs.append(console.file.getvalue())
+        assert outputs[0] == outputs[1], (objects, kwargs)
+
+
+def print_both(objects, kwargs, **options):
+    """Return the output of MaxConsole.print and of rich's Console.print."""
+    outputs = []
+    for print_ in (MaxConsole.print, Console.print):
+        console = MaxConsole(
+            file=io.StringIO(), traceback=False, register=False, **options
+        )
+        print_(console, *objects, **kwargs)
+        outputs.append(console.file.getvalue())
+    return outputs
+
+
+def test_plain_lines_take_the_fast_path_and_print_the_same_bytes():
+    for width in (20, 80):
+        for objects, kwargs in (
+            (("x" * (width - 1),), {}),
+            (("x" * width,), {}),
+            (("x" * (width - 2) + "全",), {}),
+            (("a", "b", 1, 2.5), {"sep": ""}),
+            (("a", "b"), {"sep": ", ", "end": ""}),
+            (("[bold]a[/]", ":smile:"), {"sep": " | "}),
+            (("y" * (width + 5),), {"soft_wrap": True}),
+        ):
+            console = MaxConsole(file=io.StringIO(), width=width, register=False)
+            sep = kwargs.get("sep", " ")
+            options = {k: v for k, v in kwargs.items() if k not in ("sep", "end")}
+            assert console._plain_line(objects, sep, options) is not None, objects
+            expected, actual = print_both(objects, kwargs, width=width)[::-1]
+            assert actual == expected, (width, objects, kwargs)
+
+
+def test_lines_the_fast_path_cannot_lay_out_print_the_same_bytes():
+    for width in (20, 80):
+        for objects, kwargs in (
+            (("x" * (width + 1),), {}),
+            (("x" * (width - 1) + "全",), {}),
+            (("a", "b"), {"sep": "\t"}),
+            (("a",), {"end": "\r\n"}),
+            (("a", "b"), {"sep": "\n", "end": ""}),
+        ):
+            console = MaxConsole(file=io.StringIO(), width=width, register=False)
+            sep = kwargs.get("sep", " ")
+            options = {k: v for k, v in kwargs.items() if k not in ("sep", "end")}
+            if kwargs.get("end", "\n") in ("\n", ""):
+                assert console._plain_line(objects, sep, options) is None, objects
+            expected, actual = print_both(objects, kwargs, width=width)[::-1]
+            assert actual == expected, (width, objects, kwargs)
+
+
+def test_styled_output_never_takes_the_fast_path():
+    console = MaxConsole(file=io.StringIO(), width=80, register=False)
+    assert console.plain_output
+    for objects, kwargs in (
+        ((Text("styled", style="bold"),), {}),
+        ((Gradient("gradient"),), {}),
+        (("styled",), {"style": "bold red"}),
+        (("centered",), {"justify": "center"}),
+    ):
+        assert console._plain_line(objects, " ", kwargs) is None, objects
+    for options in (
+        {"color_system": "truecolor"},
+        {"force_terminal": True},
+        {"record": True},
+    ):
+        console = MaxConsole(file=io.StringIO(), width=80, register=False, **options)
+        assert not console.plain_output, options
+        for objects in (("[bold red]markup[/]",), ("plain", 42)):
+            expected, actual = print_both(objects, {}, width=80, **options)[::-1]
+            assert actual == expected, (options, objects)
+            assert ("\x1b[" in actual) is ("record" not in options), actual
+
+
+def test_batches_are_written_after_their_interval_by_one_thread():
+    files = [io.StringIO() for _ in range(3)]
+    consoles = [
+        MaxConsole(
+            file=file,
+            batch=True,
+            batch_interval=0.05,
+            traceback=False,
+            register=False,
+        )
+        for file in files
+    ]
+    for _ in range(3):
+        for console in consoles:
+            console.print("pending")
+        assert not any(file.getvalue() for file in files)
+        deadline = time.monotonic() + 5
+        while not all(file.getvalue() for file in files):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        for file in files:
+            assert file.getvalue() == "pending\n"
+            file.truncate(0)
+            file.seek(0)
+    threads = [thread.name for thread in threading.enumerate()]
+    assert threads.count("max-console-flusher") == 1
+    timers = [t for t in threading.enumerate() if isinstance(t, threading.Timer)]
+    assert not timers
+
+
+def test_batch_consoles_are_released_with_their_output_written():
+    file = io.StringIO()
+    console = MaxConsole(
+        file=file, batch=True, batch_interval=60, traceback=False, register=False
+    )
+    console.print("pending")
+    assert not file.getvalue()
+    released = weakref.ref(console)
+    del console
+    gc.collect()
+    assert released() is None
+    assert file.getvalue() == "pending\n"
+
+
+class WriteLog(io.StringIO):
+    """A file that records the length of each write."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes: list = []
+
+    def write(self, text: str) -> int:
+        self.writes.append(len(text))
+        return super().write(text)
+
+
+def test_large_batches_are_split_like_rich_on_windows(monkeypatch):
+    monkeypatch.setattr(console_module, "WINDOWS", True)
+    file = WriteLog()
+    console = MaxConsole(
+        file=file,
+        width=200,
+        batch=True,
+        batch_size=1 << 20,
+        traceback=False,
+        register=False,
+    )
+    lines = [f"{index:>5} {'x' * 100}" for index in range(1_000)]
+    for line in lines:
+        console.print(line)
+    console.print("y" * 10_000, soft_wrap=True)
+    console.flush()
+    expected = "".join(f"{line}\n" for line in lines) + "y" * 10_000 + "\n"
+    assert file.getvalue() == expected
+    assert len(file.writes) > 1
+    assert max(file.writes[:-1]) <= console_module.MAX_WRITE
@@ -0,0 +1,79 @@
+"""Tests of max._engine."""
+import io
+
+from rich.color import Color
+
+from max._engine import (
+    TABLE_RESOLUTION,
+    blend,
+    get_style,
+    interpolation_table,
+    lookup,
+    style_cache_info,
+)
+from max.console import MaxConsole
+from max.gradient import Gradient
+
+
+def test_styles_are_interned():
+    style = get_style((1, 2, 3), bold=True)
+    assert get_style((1, 2, 3), bold=True) is style
+    assert get_style((1, 2, 3)) is not style
+    assert style.color == Color.from_rgb(1, 2, 3) and style.bold
+    assert get_style(196) is get_style(196)
+    assert get_style(196).color == Color.from_ansi(196)
+    box = get_style((1, 2, 3), bold=True, color_box=True)
+    assert box is get_style((1, 2, 3), color_box=True)
+    assert box.bgcolor == box.color and not box.bold
+    label = get_style((0, 0, 0), bgcolor=(9, 9, 9))
+    assert label.bgcolor == Color.from_rgb(9, 9, 9)
+
+
+def test_style_cache_counts_lookups():
+    before = style_cache_info()
+    get_style((4, 5, 6), italic=True, underline=True)
+    get_style((4, 5, 6), italic=True, underline=True)
+    after = style_cache_info()
+    assert after.hits == before.hits + 1
+    assert after.misses == before.misses + 1
+
+
+# The colors the per-character renderer the engine replaced gave these gradients.
+EXPECTED = {
+    ("Baseline gradient", "red", "blue"): (
+        "ff0000 ff003f ff007f ff00bf ff00ff eb00ff d700ff c300ff af00ff 9b00ff "
+        "8700ff 7300ff 5f00ff 4700ff 2f00ff 1700ff 0000ff"
+    ),
+    ("From magenta to cyan, by violet", "magenta", "cyan"): (
+        "ff00ff f100ff e400ff d700ff c900ff bc00ff af00ff a100ff 9400ff 8700ff "
+        "7900ff 6c00ff 5f00ff 4f00ff 3f00ff 2f00ff 1f00ff 0f00ff 0000ff 0016ff "
+        "002dff 0044ff 005aff 0071ff 0088ff 009bff 00afff 00c3ff 00d7ff 00ebff "
+        "00ffff"
+    ),
+}
+
+
+def test_gradients_render_the_colors_of_the_original_renderer():
+    console = MaxConsole(
+        file=io.StringIO(), color_system="truecolor", width=80, register=False
+    )
+    for (text, start, end), expected in EXPECTED.items():
+        segments = list(Gradient(text, start, end).as_text(console).render(console))
+        assert "".join(segment.text for segment in segments) == text
+        colors = [segment.style.color.triplet.hex[1:] for segment in segments]
+        assert colors == expected.split()
+
+
+def test_interpolation_tables_stay_within_one_of_the_exact_blend():
+    for start, end in (((255, 0, 0), (0, 0, 255)), ((0, 136, 255), (255, 255, 0))):
+        table = interpolation_table(start, end, TABLE_RESOLUTION)
+        for size in (1, 7, 64, 1_000, 5_000):
+            exact = blend(start, end, size + 1, size)
+            looked_up = lookup(table, size + 1, size)
+            for exact_channel, channel in zip(exact, looked_up):
+                assert len(channel) == size + 1
+                assert all(
+                    abs(int(a) - int(b)) <= 1 for a, b in zip(exact_channel, channel)
+                )
+                assert int(channel[0]) == int(exact_channel[0])
+                assert int(channel[-1]) == int(exact_channel[-1])
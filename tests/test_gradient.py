@@ -0,0 +1,92 @@
+"""Tests of max.gradient."""
+import io
+import re
+
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Span
+
+from max.console import MaxConsole
+from max.gradient import Gradient
+
+TEXT = "The quick brown fox jumps over the lazy dog, twice over."
+
+
+def recording_console(color_system: str = "truecolor") -> Console:
+    """Return a recording rich Console writing to a string."""
+    return Console(
+        file=io.StringIO(),
+        color_system=color_system,
+        record=True,
+        width=80,
+        force_terminal=True,
+    )
+
+
+def colors(console: Console) -> set:
+    """Return the colors of a recording console's HTML export."""
+    return set(re.findall(r"#[0-9a-f]{6}", console.export_html()))
+
+
+def test_colors_follow_the_rendering_console():
+    bound = MaxConsole(
+        file=io.StringIO(), color_system="256", width=80, force_terminal=True
+    )
+    gradient = Gradient(TEXT, "red", "blue", console=bound)
+    truecolor = recording_console()
+    truecolor.print(gradient)
+    expected = recording_console()
+    expected.print(Gradient(TEXT, "red", "blue"))
+    printed = colors(truecolor)
+    assert printed == colors(expected)
+    assert len(printed) > 16
+
+
+def test_max_console_coalesces_for_itself():
+    bound = MaxConsole(
+        file=io.StringIO(), color_system="truecolor", width=80, force_terminal=True
+    )
+    out = io.StringIO()
+    console = MaxConsole(file=out, color_system="256", width=80, force_terminal=True)
+    console.print(Gradient(TEXT, "red", "blue", console=bound))
+    codes = re.findall(r"\x1b\[([0-9;]+)m", out.getvalue())
+    assert codes and all(code == "0" or code.startswith("38;5;") for code in codes)
+    # Neighbouring characters of the same terminal color share one span.
+    assert codes.count("0") < len(TEXT.replace(" ", ""))
+
+
+def test_stylized_gradients_are_cached_apart():
+    plain = Gradient(TEXT, "red", "blue")
+    underlined = Gradient(TEXT, "red", "blue")
+    underlined.stylize("underline", 0, 5)
+    assert plain.cache_key() != underlined.cache_key()
+    assert not any(span.style == "underline" for span in plain.cached_text().spans)
+    assert Span(0, 5, "underline") in underlined.cached_text().spans
+
+
+def test_text_shorter_than_the_gradient():
+    rainbow = Gradient(rainbow=True)
+    for text in ("", "a", "short"):
+        segments = list(rainbow.iter_segments(text))
+        assert "".join(segment.text for segment in segments) == text
+        assert all(segment.style for segment in segments)
+        assert Gradient(text, rainbow=True).as_text().plain == text
+    out = io.StringIO()
+    assert rainbow.stream("short", file=out) == 5
+    assert out.getvalue() == "short"
+
+
+def test_nested_gradients_are_colored_for_the_rendering_console():
+    bound = MaxConsole(
+        file=io.StringIO(), color_system="256", width=80, force_terminal=True
+    )
+    table = Table("Gradient")
+    table.add_row(Gradient(TEXT, "red", "blue", console=bound))
+    truecolor = recording_console()
+    truecolor.print(table)
+    assert len(colors(truecolor)) > 16
+    out = io.StringIO()
+    console = MaxConsole(file=out, color_system="256", width=80, force_terminal=True)
+    console.print(Panel(Gradient(TEXT, "red", "blue")))
+    assert "38;2;" not in out.getvalue()
@@ -0,0 +1,39 @@
+"""Tests of max._highlighter."""
+from rich.highlighter import ReprHighlighter
+from rich.text import Text
+
+from max._highlighter import REPR_HIGHLIGHTER, CompiledReprHighlighter
+from max.bench import highlight_samples
+
+
+class NumberHighlighter(CompiledReprHighlighter):
+    """Highlight numbers only, with a style of its own."""
+
+    base_style = "number."
+    highlights = [r"(?P<value>\d+)"]
+
+
+def spans(highlighter, plain: str) -> list:
+    """Return the spans `highlighter` gives `plain`."""
+    text = Text(plain)
+    highlighter.highlight(text)
+    return text.spans
+
+
+def test_subclasses_do_not_share_memoized_spans():
+    plain = "Processed 42 records from <Worker id=7>"
+    expected = spans(ReprHighlighter(), plain)
+    assert spans(REPR_HIGHLIGHTER, plain) == expected
+    numbers = spans(NumberHighlighter(), plain)
+    assert [span.style for span in numbers] == ["number.value", "number.value"]
+    assert spans(REPR_HIGHLIGHTER, plain) == expected
+
+
+def test_compiled_highlighter_matches_rich():
+    reference = ReprHighlighter()
+    compiled = CompiledReprHighlighter()
+    for sample in highlight_samples():
+        expected = reference(sample).spans
+        # The second call is answered by the memo.
+        for _ in range(2):
+            assert compiled(sample).spans == expected, sample
@@ -0,0 +1,21 @@
+"""Tests of max.log."""
+import subprocess
+import sys
+from pathlib import Path
+
+import max
+
+PACKAGE_ROOT = Path(max.__file__).parent.parent
+
+
+def test_importing_log_leaves_the_console_alone(tmp_path):
+    process = subprocess.run(
+        [sys.executable, "-c", "import max.log"],
+        capture_output=True,
+        check=True,
+        cwd=tmp_path,
+        env={"PYTHONPATH": str(PACKAGE_ROOT), "FORCE_COLOR": "1", "TERM": "xterm"},
+        text=True,
+    )
+    assert process.stdout == ""
+    assert "Initialized logging" in (tmp_path / "logs" / "log.log").read_text()
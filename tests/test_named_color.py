@@ -0,0 +1,145 @@
+"""Tests of max.named_color."""
+import copy
+import gc
+import math
+import pickle
+import random
+import tracemalloc
+
+import pytest
+from rich.color import Color
+
+from max._color_system import NEAREST_BITS, nearest
+from max.named_color import ColorParsingError, InvalidRGBColor, NamedColor
+
+# Channel values on both sides of the edges of the cells of the nearest table.
+EDGES = (0, 7, 8, 15, 16, 127, 128, 247, 248, 255)
+
+
+def test_named_colors_are_flyweights():
+    red = NamedColor("red")
+    assert NamedColor("red") is red
+    assert NamedColor(red) is red
+    assert pickle.loads(pickle.dumps(red)) is red
+    assert copy.deepcopy(red) is red
+    assert len({id(NamedColor(name)) for name in NamedColor.colors}) == 10
+    assert NamedColor() in [NamedColor(name) for name in NamedColor.colors]
+
+
+@pytest.mark.parametrize("index, name", list(enumerate(NamedColor.colors)))
+def test_every_alias_of_a_color_is_the_same_instance(index, name):
+    color = NamedColor(name)
+    assert color.value == name and color.index == index
+    hex_color = NamedColor.hex_colors[index]
+    rgb = NamedColor.rgb_tuples[index]
+    for alias in (index, hex_color, hex_color.upper(), f" {hex_color} ", rgb):
+        assert NamedColor(alias) is color, alias
+    assert color.as_hex() == hex_color
+    assert color.as_rgb() == rgb
+    assert color.as_index() == index
+
+
+def test_other_colors_map_to_the_nearest_named_color():
+    assert NamedColor("#ff0100") is NamedColor("red")
+    assert NamedColor((250, 5, 5)) is NamedColor("red")
+    assert NamedColor("bright_red") is NamedColor("red")
+    assert NamedColor("rgb(0,0,250)") is NamedColor("blue")
+    assert NamedColor(Color.from_rgb(0, 250, 250)) is NamedColor("cyan")
+    assert NamedColor.hex_to_rgb("#0088ff") == (0, 136, 255)
+    assert NamedColor.hex_to_rgb("0088ff") == (0, 136, 255)
+
+
+@pytest.mark.parametrize(
+    "color_input, error",
+    [
+        ("nope", ColorParsingError),
+        ("ff0000", ColorParsingError),
+        ("#f00", ColorParsingError),
+        ("default", ColorParsingError),
+        ([255, 0, 0], ColorParsingError),
+        (object(), ColorParsingError),
+        ((255, 0), InvalidRGBColor),
+        ((255, 0, 256), InvalidRGBColor),
+        (("255", 0, 0), InvalidRGBColor),
+        (10, ValueError),
+        (-1, ValueError),
+    ],
+)
+def test_invalid_colors_raise(color_input, error):
+    with pytest.raises(error):
+        NamedColor(color_input)
+
+
+def render_loop(number: int) -> None:
+    """Construct `number` NamedColors and convert each of them."""
+    for index in range(number):
+        color = NamedColor(index % 10)
+        color.as_rgb(), color.as_hex(), color.as_index()
+
+
+def test_named_colors_retain_no_memory():
+    render_loop(10)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        render_loop(1_000_000)
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    assert retained <= 64 * 1024
+
+
+def redmean(rgb, color) -> float:
+    """Return the "redmean" distance between two colors, as the table uses it."""
+    mean = (rgb[0] + color[0]) / 2
+    return math.sqrt(
+        (2 + mean / 256) * (rgb[0] - color[0]) ** 2
+        + 4 * (rgb[1] - color[1]) ** 2
+        + (2 + (255 - mean) / 256) * (rgb[2] - color[2]) ** 2
+    )
+
+
+def brute_force(rgb) -> int:
+    """Return the index of the NamedColor nearest to `rgb`, by searching them all."""
+    palette = NamedColor.rgb_tuples
+    return min(range(len(palette)), key=lambda index: redmean(rgb, palette[index]))
+
+
+def nearest_samples() -> list:
+    """Return random colors and colors on either side of the edges of cells."""
+    rng = random.Random(0)
+    samples = [tuple(rng.randrange(256) for _ in range(3)) for _ in range(5_000)]
+    return samples + [
+        (red, green, blue) for red in EDGES for green in EDGES for blue in EDGES
+    ]
+
+
+def test_nearest_table_matches_a_brute_force_search():
+    palette = NamedColor.rgb_tuples
+    shift = 8 - NEAREST_BITS
+    half = 1 << shift >> 1
+    # A color is at most this far from the center of its cell.
+    radius = redmean((0, 0, 0), (half, half, half)) + 1
+    for rgb in nearest_samples():
+        center = tuple((channel >> shift << shift) + half for channel in rgb)
+        index = nearest(rgb, palette)
+        # The table holds the exact answer for the center of each cell...
+        assert index == brute_force(center), rgb
+        # ...which is never much further from a color in the cell than its nearest.
+        best = palette[brute_force(rgb)]
+        assert redmean(rgb, palette[index]) <= redmean(rgb, best) + 2 * radius, rgb
+        assert NamedColor.nearest(rgb) is NamedColor(palette[index])
+
+
+def test_from_colors_maps_arrays_like_single_colors():
+    np = pytest.importorskip("numpy")
+    samples = nearest_samples()
+    expected = [NamedColor.nearest(rgb) for rgb in samples]
+    assert NamedColor.from_colors(np.array(samples)) == expected
+    assert NamedColor.from_colors(["red", "#0088ff", 3]) == [
+        NamedColor("red"),
+        NamedColor("#0088ff"),
+        NamedColor(3),
+    ]
@@ -0,0 +1,61 @@
+"""Tests of the max package namespace."""
+import importlib
+import inspect
+import os
+import subprocess
+import sys
+
+import pytest
+
+import max
+from max.bench import DEV_ONLY_MODULES, IMPORT_BUDGETS, import_time
+
+
+def loaded_modules(statement: str) -> set:
+    """Return the modules a fresh interpreter has loaded after `statement`."""
+    check = "import sys; print(*sorted(sys.modules))"
+    process = subprocess.run(
+        [sys.executable, "-c", f"{statement}; {check}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return set(process.stdout.split())
+
+
+def test_submodule_imports_leave_the_helpers_bound():
+    importlib.import_module("max.gradient")
+    importlib.import_module("max.rule")
+    assert inspect.ismodule(max.gradient)
+    assert inspect.isfunction(max.make_gradient)
+    assert inspect.isfunction(max.gradient_rule)
+    assert max.Gradient is importlib.import_module("max.gradient").Gradient
+
+
+def test_gradient_is_a_deprecated_alias_of_make_gradient():
+    importlib.import_module("max.gradient")
+    expected = max.make_gradient(max, "Deprecated", "red", "blue")
+    with pytest.deprecated_call():
+        gradient = max.gradient(max, "Deprecated", "red", "blue")
+    assert gradient.as_text() == expected.as_text()
+
+
+def test_import_max_is_lazy():
+    loaded = loaded_modules("import max")
+    assert not {"rich.console", "max.console", "max.gradient"} & loaded
+    assert "max.gradient" in loaded_modules("from max import Gradient")
+
+
+def test_imports_load_no_dev_only_modules():
+    for statement in IMPORT_BUDGETS:
+        dev_modules = set(DEV_ONLY_MODULES) & loaded_modules(statement)
+        assert not dev_modules, f"{statement!r} imported {', '.join(dev_modules)}"
+
+
+@pytest.mark.skipif(
+    not os.environ.get("MAX_IMPORT_TIMING"), reason="set MAX_IMPORT_TIMING to run"
+)
+def test_imports_stay_within_budget():
+    for statement, budget in IMPORT_BUDGETS.items():
+        seconds = min(import_time(statement)[0] for _ in range(3))
+        assert seconds <= budget, f"{statement!r} took {seconds:.3f}s"
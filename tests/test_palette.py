@@ -0,0 +1,85 @@
+"""Tests of max.palette."""
+import io
+import pickle
+
+import pytest
+from rich.color import Color
+
+from max._engine import get_style
+from max.console import MaxConsole
+from max.gradient import Gradient
+from max.named_color import ColorParsingError, NamedColor
+from max.palette import DEFAULT_PALETTE, Palette, _aliases, get_palette
+
+COLORS = ["#ff0000", (0, 255, 0), "blue", NamedColor("yellow")]
+
+
+def test_palettes_hold_4_to_64_colors():
+    for size in (3, 65):
+        with pytest.raises(ValueError):
+            Palette([(index, 0, 0) for index in range(size)])
+    for size in (4, 64):
+        assert len(Palette([(index, 0, 0) for index in range(size)])) == size
+    with pytest.raises(ValueError):
+        Palette(COLORS, names=["one"])
+    with pytest.raises(ColorParsingError):
+        Palette(["#ff0000", "#00ff00", "#0000ff", "not a color"])
+
+
+def test_equal_palettes_are_compiled_once():
+    palette = Palette(COLORS)
+    # The colors as given are an alias, so they are not parsed again.
+    assert _aliases[(tuple(COLORS), None, None)] is palette
+    assert Palette(COLORS) is palette
+    assert Palette(tuple(COLORS)) is palette
+    # Different spellings of the same colors share the compiled palette.
+    assert Palette(["red", "#00ff00", (0, 0, 255), NamedColor("yellow")]) is palette
+    assert (
+        Palette(["red", "rgb(0,255,0)", Color.from_rgb(0, 0, 255), [255, 255, 0]])
+        is palette
+    )
+    assert Palette(palette) is palette
+    assert get_palette(COLORS) is palette
+    assert get_palette() is DEFAULT_PALETTE
+    assert pickle.loads(pickle.dumps(palette)) is palette
+    assert Palette(COLORS, names=list("abcd")) is not palette
+    with pytest.raises(AttributeError):
+        palette.rgb = ()
+
+
+def test_compiled_colors_and_styles():
+    palette = Palette(COLORS, foregrounds=[(0, 0, 0)] * 4)
+    yellow = NamedColor("yellow").as_rgb()
+    assert palette.rgb == ((255, 0, 0), (0, 255, 0), (0, 0, 255), yellow)
+    assert palette.hex[:3] == ("#ff0000", "#00ff00", "#0000ff")
+    assert palette.packed == bytes(channel for rgb in palette.rgb for channel in rgb)
+    assert palette.styles[1] is get_style((0, 255, 0))
+    assert palette.style(2, bold=True) is get_style((0, 0, 255), bold=True)
+    label = palette.label_style(0)
+    assert label.bgcolor == Color.from_rgb(255, 0, 0)
+    assert label.color == Color.from_rgb(0, 0, 0)
+    table = palette.table(0, 2)
+    assert table is palette.table(0, 2)
+
+
+def test_index_of():
+    palette = Palette(COLORS, names=["red", "green", "blue", "yellow"])
+    assert palette.index_of(2) == 2
+    assert palette.index_of("green") == 1
+    assert palette.index_of((0, 0, 255)) == 2
+    assert palette.index_of("#fe0101") == 0
+    with pytest.raises(ValueError):
+        palette.index_of(4)
+
+
+def test_gradients_render_the_colors_of_a_palette():
+    palette = Palette(COLORS)
+    console = MaxConsole(
+        file=io.StringIO(), color_system="truecolor", width=80, register=False
+    )
+    text = Gradient("x" * 40, start=0, end=3, palette=palette).as_text(console)
+    colors = [span.style.color.get_truecolor() for span in text.spans]
+    assert tuple(colors[0]) == palette.rgb[0]
+    assert tuple(colors[-1]) == palette.rgb[3]
+    for rgb in palette.rgb[1:3]:
+        assert rgb in [tuple(color) for color in colors]
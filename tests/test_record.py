@@ -0,0 +1,78 @@
+"""Tests of max._record."""
+import io
+
+from rich.console import CONSOLE_HTML_FORMAT
+
+from max._record import WRITE_CHUNK, SpillRecord, write_html
+from max.bench import recording_console
+
+RECORDINGS = ({}, {"record_limit": 1_000_000}, {"record_spill": True})
+
+
+def test_streamed_exports_match_rich():
+    for kwargs in RECORDINGS:
+        console = recording_console(200, **kwargs)
+        exports = {
+            "html": console.export_html(clear=False),
+            "inline html": console.export_html(clear=False, inline_styles=True),
+            "text": console.export_text(clear=False),
+            "styled text": console.export_text(clear=False, styles=True),
+        }
+        streams = {
+            "html": (console.stream_html, {}),
+            "inline html": (console.stream_html, {"inline_styles": True}),
+            "text": (console.stream_text, {}),
+            "styled text": (console.stream_text, {"styles": True}),
+        }
+        for name, (stream, options) in streams.items():
+            file = io.StringIO()
+            stream(file, clear=False, **options)
+            assert file.getvalue() == exports[name], (name, kwargs)
+
+
+class CountedWrites(io.StringIO):
+    """A file that keeps the size of each write."""
+
+    def __init__(self):
+        super().__init__()
+        self.sizes = []
+
+    def write(self, text):
+        self.sizes.append(len(text))
+        return super().write(text)
+
+
+def test_html_is_written_in_chunks():
+    console = recording_console(200)
+    expected = console.export_html(clear=False)
+    assert len(expected) > 4 * WRITE_CHUNK
+    file = CountedWrites()
+    console.stream_html(file, clear=False)
+    assert file.getvalue() == expected
+    assert len(file.sizes) > 1 and max(file.sizes) < 2 * WRITE_CHUNK
+
+
+class CountedSpill(SpillRecord):
+    """A spilled recording that counts how often it is read."""
+
+    reads = 0
+
+    def __iter__(self):
+        self.reads += 1
+        return super().__iter__()
+
+
+def test_html_is_written_in_one_read():
+    console = recording_console(50)
+    expected = console.export_html(clear=False)
+    recording = list(console._record_buffer)  # pylint: disable=protected-access
+    file = io.StringIO()
+    write_html(iter(recording), file, CONSOLE_HTML_FORMAT)
+    assert file.getvalue() == expected
+    spilled = CountedSpill(chunk_size=64)
+    spilled.extend(recording)
+    file = io.StringIO()
+    write_html(spilled, file, CONSOLE_HTML_FORMAT)
+    assert file.getvalue() == expected
+    assert spilled.reads == 1
+    spilled.close()
@@ -0,0 +1,50 @@
+"""Tests of max._render_cache."""
+import gc
+import io
+import sys
+import weakref
+
+from max._render_cache import SEGMENT_CACHE
+from max.console import MaxConsole
+from max.gradient import Gradient
+
+
+class Keyed:
+    """A Cacheable renderable that remembers the consoles it was keyed for."""
+
+    def __init__(self) -> None:
+        self.consoles: list = []
+
+    def cache_key(self, console=None):
+        self.consoles.append(console)
+        return "keyed"
+
+    def __rich_console__(self, console, options):
+        yield "keyed"
+
+
+def test_cache_does_not_keep_consoles_alive():
+    excepthook = sys.excepthook
+    file = io.StringIO()
+    console = MaxConsole(file=file, width=80)
+    # The rich traceback hook the console installed would hold it too.
+    sys.excepthook = excepthook
+    console.print(console.cached(Gradient("cached", "red", "blue")))
+    identity = id(console)
+    assert any(key[0] == identity for key in list(SEGMENT_CACHE._entries))
+    released = weakref.ref(console)
+    released_file = weakref.ref(file)
+    del console, file
+    gc.collect()
+    assert released() is None
+    assert released_file() is None
+    assert not any(key[0] == identity for key in list(SEGMENT_CACHE._entries))
+
+
+def test_cache_keys_are_made_for_the_rendering_console():
+    console = MaxConsole(file=io.StringIO(), width=80, register=False)
+    keyed = Keyed()
+    console.print(console.cached(keyed))
+    console.print(console.cached(keyed))
+    assert keyed.consoles == [console, console]
+    assert console.file.getvalue() == "keyed\nkeyed\n"
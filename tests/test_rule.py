@@ -0,0 +1,52 @@
+"""Tests of max.rule."""
+import io
+import re
+from importlib import import_module
+
+from rich.cells import cell_len
+from rich.console import Console
+from rich.text import Text
+
+from max.console import MaxConsole
+from max.rule import GradientRule
+
+
+def render(rule: GradientRule, color_system: str, width: int = 80) -> str:
+    """Return the output of a rule printed to a terminal of `color_system`."""
+    out = io.StringIO()
+    console = Console(
+        file=out, color_system=color_system, width=width, force_terminal=True
+    )
+    console.print(rule)
+    return out.getvalue()
+
+
+def test_rule_is_colored_for_the_rendering_console(monkeypatch):
+    shared = MaxConsole(
+        file=io.StringIO(), color_system="standard", width=80, force_terminal=True
+    )
+    monkeypatch.setattr(import_module("max.gradient"), "get_console", lambda: shared)
+    codes = re.findall(r"\x1b\[([0-9;]+)m", render(GradientRule(), "256"))
+    colors = [code for code in codes if "38;" in code]
+    assert colors and all("38;5;" in code for code in colors)
+    truecolor = re.findall(r"38;2;[0-9;]+", render(GradientRule(), "truecolor"))
+    assert len(set(truecolor)) > 16
+
+
+def test_right_aligned_rules_with_wide_titles():
+    for width in (10, 30, 50, 80):
+        for thick in (False, True):
+            for size in (width - 3, width - 2, width, width + 20):
+                title = "x" * size
+                rule = GradientRule(title, align="right", thick=thick)
+                plain = Text.from_ansi(render(rule, "truecolor", width)).plain
+                assert cell_len(plain.rstrip("\n")) == width
+                assert plain.rstrip("\n").endswith("x" if size <= width - 2 else "…")
+
+
+def test_right_aligned_title_stays_with_wide_characters():
+    for characters in ("━━", "🎉"):
+        rule = GradientRule("Title", align="right", characters=characters)
+        plain = Text.from_ansi(render(rule, "truecolor", 30)).plain
+        assert plain == plain.lstrip() and plain.endswith(" Title\n")
+        assert cell_len(plain.rstrip("\n")) == 30
@@ -0,0 +1,57 @@
+"""Tests of max._sink."""
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from max.console import MaxConsole
+
+WORKERS = 4
+LINES = 200
+
+
+def work(worker: int) -> int:
+    """Print numbered lines to the default console of a worker process."""
+    console = MaxConsole()
+    for line in range(LINES):
+        console.print(f"{worker} {line}")
+    return worker
+
+
+def run_workers(method: str) -> str:
+    """Return what the workers of a pool started by `method` printed to a sink."""
+    console = MaxConsole(
+        file=io.StringIO(), width=80, color_system=None, register=False
+    )
+    context = multiprocessing.get_context(method)
+    with console.sink(context) as sink:
+        with ProcessPoolExecutor(
+            max_workers=2,
+            mp_context=context,
+            initializer=sink.initializer,
+            initargs=sink.initargs,
+        ) as pool:
+            assert list(pool.map(work, range(WORKERS))) == list(range(WORKERS))
+    assert sink.stats().records == WORKERS * LINES
+    return console.file.getvalue()
+
+
+def check_output(output: str) -> None:
+    """Check that every line of every worker was printed whole and in order."""
+    printed = {worker: [] for worker in range(WORKERS)}
+    for line in output.splitlines():
+        worker, number = map(int, line.split())
+        printed[worker].append(number)
+    assert all(lines == list(range(LINES)) for lines in printed.values())
+
+
+def test_sink_with_spawned_workers():
+    check_output(run_workers("spawn"))
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork"
+)
+def test_sink_with_forked_workers():
+    check_output(run_workers("fork"))